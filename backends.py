@@ -0,0 +1,56 @@
+"""
+Pokemon Events Scraper - Backends
+Common interface for the ways events can be fetched, and a registry so the
+command line and the benchmarks can pick one by name
+"""
+
+import importlib
+import inspect
+
+DEFAULT_BACKEND = 'selenium-headless'
+
+# name -> (module, class, fixed options). Modules are imported on first use,
+# so the HTTP backend works without Selenium installed.
+BACKENDS = {
+    'selenium-headless': ('selenium_backend', 'SeleniumBackend', {'headless': True}),
+    'selenium-visible': ('selenium_backend', 'SeleniumBackend', {'headless': False}),
+    'http-api': ('http_backend', 'HttpApiBackend', {}),
+}
+
+
+class Backend:
+    """Fetches events for a list of search locations
+
+    ``run(locations, handle)`` calls ``handle(location, events)`` once per
+    location as results come in, with [] when nothing could be read.
+    ``close()`` releases browsers, connections and saved state.
+    """
+
+    name = None
+
+    def run(self, locations, handle):
+        raise NotImplementedError
+
+    def close(self):
+        """Release everything the backend holds"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def create_backend(name, **options):
+    """Backend registered as name, configured with options"""
+    module, cls, fixed = BACKENDS[name]
+    backend = getattr(importlib.import_module(module), cls)(**fixed, **options)
+    backend.name = name
+    return backend
+
+
+def backend_default(name, option):
+    """Default value of a backend's option, or None if it has no such option"""
+    module, cls, _ = BACKENDS[name]
+    parameter = inspect.signature(getattr(importlib.import_module(module), cls)).parameters.get(option)
+    return None if parameter is None or parameter.default is inspect.Parameter.empty else parameter.default
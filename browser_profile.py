@@ -0,0 +1,68 @@
+"""
+Pokemon Events Scraper - Browser Profiles
+Blocks images, fonts, media and third-party trackers on the event locator
+page so each search downloads and renders less. Page scripts, XHR and the
+event data itself are never blocked.
+"""
+
+# URL patterns for Network.setBlockedURLs ('*' is a wildcard)
+IMAGE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico']
+FONT_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+MEDIA_PATTERNS = ['*.mp4', '*.webm', '*.mp3', '*.m3u8']
+STYLESHEET_PATTERNS = ['*.css']
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*nr-data.net*',
+    '*newrelic.com*',
+    '*optimizely.com*',
+    '*bing.com/bat*',
+    '*tiktok.com*',
+]
+
+PROFILES = {
+    # Everything loads, like a normal browser
+    'full': [],
+    # Skip what the scraper never looks at
+    'lean': IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS,
+    # Also skip stylesheets; fastest, but the page renders unstyled
+    'strict': IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS + STYLESHEET_PATTERNS,
+}
+DEFAULT_PROFILE = 'lean'
+
+# Chrome content settings (2 = block) applied outside the full profile
+BLOCKED_CONTENT_SETTINGS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+    'profile.default_content_setting_values.media_stream': 2,
+}
+
+
+def blocked_patterns(profile=DEFAULT_PROFILE, extra=None):
+    """URL patterns blocked by a profile, plus any extra patterns"""
+    return PROFILES[profile] + list(extra or [])
+
+
+def configure_options(chrome_options, profile=DEFAULT_PROFILE):
+    """Add the content settings and flags of a profile to Chrome options"""
+    if profile == 'full':
+        return
+    chrome_options.add_experimental_option('prefs', dict(BLOCKED_CONTENT_SETTINGS))
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--mute-audio')
+
+
+def apply_profile(driver, profile=DEFAULT_PROFILE, extra=None):
+    """Block a profile's URL patterns in a running browser; returns the patterns"""
+    patterns = blocked_patterns(profile, extra)
+    if patterns:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    return patterns
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Extraction Templates
+Learns where the event cards are on the event locator page and which
+line of a card holds which field, from recorded fixtures or from a live
+page, and keeps one template per site version so later runs go straight
+to the right selector
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from html.parser import HTMLParser
+
+from event_model import parse_event_date
+from event_sink import write_json_atomic
+from page_ready import NO_EVENTS_MARKERS
+
+DEFAULT_TEMPLATES_FILE = 'extraction_templates.json'
+TEMPLATES_VERSION = 1
+
+# Fewest repeated siblings that count as a list of cards
+MIN_CARDS = 2
+
+# Share of cards whose date and title lines must be where the template says
+VALID_SHARE = 0.8
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+SKIP_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'svg'}
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tr', 'ul',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Class names usable in a CSS selector without escaping
+_PLAIN_CLASS = re.compile(r'^[A-Za-z_-][\w-]*$')
+
+# A street address line: "123 Main St" or "..., TX 75001", but not a title like "2026 Regionals"
+_ADDRESS = re.compile(r'^(?!(?:19|20)\d{2}\b)\d+[a-z]?\s+\w|,\s*[A-Z]{2}\s+\d{5}\b')
+
+# Fingerprinted script and stylesheet paths change whenever the site is redeployed
+_ASSET = re.compile(r'''(?:src|href)\s*=\s*["']([^"'?#]+\.(?:js|css))''', re.I)
+
+
+class _Node:
+    """An element of a parsed page"""
+
+    __slots__ = ('tag', 'classes', 'parent', 'children')
+
+    def __init__(self, tag, classes=(), parent=None):
+        self.tag = tag
+        self.classes = tuple(classes)
+        self.parent = parent
+        self.children = []
+
+    def elements(self):
+        """This element and every element below it, in document order"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed([child for child in node.children if isinstance(child, _Node)]))
+
+
+class _TreeBuilder(HTMLParser):
+    """Forgiving HTML to _Node tree; unclosed elements close with their parent"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get('class') or '').split()
+        node = _Node(tag, classes, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(page_source):
+    """Root _Node of a page"""
+    builder = _TreeBuilder()
+    builder.feed(page_source)
+    builder.close()
+    return builder.root
+
+
+def _text(node, parts):
+    if node.tag in SKIP_TAGS:
+        return
+    if node.tag in BLOCK_TAGS or node.tag == 'br':
+        parts.append('\n')
+    for child in node.children:
+        if isinstance(child, _Node):
+            _text(child, parts)
+        else:
+            # Source whitespace renders as one space, as in innerText
+            parts.append(_WHITESPACE.sub(' ', child))
+    if node.tag in BLOCK_TAGS:
+        parts.append('\n')
+
+
+def card_lines(text):
+    """Non-empty, stripped lines of a card's text"""
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def node_lines(node):
+    """Lines of an element's text, split the way a browser's innerText is"""
+    parts = []
+    _text(node, parts)
+    return card_lines(''.join(parts))
+
+
+def signature(node, classes=None):
+    """CSS selector for an element's tag and plain class names (or just the given ones)"""
+    names = node.classes if classes is None else classes
+    return node.tag + ''.join(f'.{name}' for name in sorted(set(names)) if _PLAIN_CLASS.match(name))
+
+
+def _matches(node, sig):
+    tag, *classes = sig.split('.')
+    return node.tag == tag and set(classes) <= set(node.classes)
+
+
+def select(root, selector):
+    """Elements matching a selector of the form 'sig' or 'sig > sig'"""
+    *parent, sig = [part.strip() for part in selector.split('>')]
+    return [node for node in root.elements()
+            if _matches(node, sig) and (not parent or (node.parent and _matches(node.parent, parent[0])))]
+
+
+def line_kind(line):
+    """'date', 'address' or 'text'"""
+    if parse_event_date(line)[0] is not None:
+        return 'date'
+    if _ADDRESS.search(line):
+        return 'address'
+    return 'text'
+
+
+def find_card_groups(root):
+    """[(selector, cards)] of repeated sibling elements that look like event cards, best first
+
+    Siblings with the same tag form a group, selected by the classes they
+    all share (so modifiers like "is-featured" don't split a list), and
+    groups with the same parent and card signature (e.g. one list per
+    day) are pooled. A group is scored by how many of its members hold a date and
+    at least one other line, so a broad wrapper that holds every event
+    (one element, not a repeated one) never wins.
+    """
+    groups = {}
+    for parent in root.elements():
+        siblings = {}
+        for child in parent.children:
+            if isinstance(child, _Node) and child.tag not in SKIP_TAGS:
+                siblings.setdefault(child.tag, []).append(child)
+        for members in siblings.values():
+            if len(members) >= MIN_CARDS:
+                shared = set.intersection(*(set(member.classes) for member in members))
+                groups.setdefault((signature(parent), signature(members[0], shared)), []).extend(members)
+
+    scored = []
+    for (parent_sig, sig), members in groups.items():
+        cards = [node_lines(member) for member in members]
+        dated = sum(1 for lines in cards if len(lines) >= 2 and 'date' in map(line_kind, lines))
+        if dated < MIN_CARDS or dated < len(members) / 2:
+            continue
+        # The bare card signature is enough unless it also matches elsewhere
+        selector = sig if len(select(root, sig)) == len(members) else f"{parent_sig} > {sig}"
+        depth = 0
+        node = members[0]
+        while node.parent:
+            depth, node = depth + 1, node.parent
+        scored.append((dated, dated / len(members), depth, selector, cards))
+    # Most dated cards first; on a tie, the group where more members are
+    # dated, so the rows inside a card never beat the cards themselves
+    scored.sort(key=lambda group: (-group[0], -group[1], -group[2]))
+    return [(selector, cards) for _, _, _, selector, cards in scored]
+
+
+def learn_fields(cards):
+    """{field: line index} voted across cards (lists of lines), or None
+
+    The first date line is the date, the first plain line the title, the
+    next plain line before the address the venue, and whatever follows
+    the last mapped line the description.
+    """
+    votes = {field: Counter() for field in ('title', 'date', 'location', 'address')}
+    for lines in cards:
+        kinds = [line_kind(line) for line in lines]
+        positions = {}
+        if 'date' in kinds:
+            positions['date'] = kinds.index('date')
+        if 'address' in kinds:
+            positions['address'] = kinds.index('address')
+        plain = [i for i, kind in enumerate(kinds) if kind == 'text']
+        if plain:
+            positions['title'] = plain[0]
+            venue = [i for i in plain[1:] if i < positions.get('address', len(lines))]
+            if venue:
+                positions['location'] = venue[0]
+        for field, index in positions.items():
+            votes[field][index] += 1
+
+    fields = {}
+    for field, counter in votes.items():
+        if counter:
+            index, count = counter.most_common(1)[0]
+            if count >= len(cards) / 2:
+                fields[field] = index
+    if 'title' not in fields or 'date' not in fields:
+        return None
+    fields['description'] = max(fields.values()) + 1
+    return fields
+
+
+def fields_from_lines(lines, fields, city):
+    """Event fields from a card's lines using a template's field mapping"""
+    def line(field):
+        index = fields.get(field)
+        return lines[index] if index is not None and index < len(lines) else ''
+
+    return {
+        'title': line('title') or ' '.join(lines)[:100],
+        'date': line('date') or "Date TBA",
+        'location': line('location') or city,
+        'address': line('address'),
+        'description': '\n'.join(lines[fields['description']:]),
+        'event_type': "",
+    }
+
+
+def validate_template(template, cards):
+    """True if the cards a template's selector found read the way it expects
+
+    cards are as returned by collect_event_cards; an empty list fails, so
+    the caller decides whether the page simply has no events.
+    """
+    if not cards:
+        return False
+    fields = template['fields']
+    good = 0
+    for card in cards:
+        lines = card_lines(card.get('text', ''))
+        if (fields['date'] < len(lines) and line_kind(lines[fields['date']]) == 'date'
+                and fields['title'] < len(lines) and lines[fields['title']]):
+            good += 1
+    return good >= VALID_SHARE * len(cards)
+
+
+def site_version(page_source):
+    """Short hash of the page's script and stylesheet paths
+
+    Those are fingerprinted per deploy, so a new hash means the site may
+    have changed its markup.
+    """
+    assets = sorted(set(_ASSET.findall(page_source)))
+    if not assets:
+        return 'unversioned'
+    return hashlib.md5('\n'.join(assets).encode()).hexdigest()[:12]
+
+
+def discover_template(page_source, root=None):
+    """Template for the best card group on a page, or None if none looks like events"""
+    root = root or parse_html(page_source)
+    for selector, cards in find_card_groups(root):
+        fields = learn_fields(cards)
+        if fields:
+            return {'selector': selector, 'fields': fields, 'learned_at': datetime.now().isoformat(),
+                    'samples': len(cards)}
+    return None
+
+
+class TemplateStore:
+    """Learned templates by site version, kept in a JSON file between runs
+
+    Shared by every browser thread of a run, so changes take a lock.
+    """
+
+    def __init__(self, path=DEFAULT_TEMPLATES_FILE):
+        self.path = path
+        self.templates = {}
+        self.changed = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == TEMPLATES_VERSION:
+                self.templates = data.get('templates', {})
+
+    def get(self, version):
+        return self.templates.get(version)
+
+    def newest(self):
+        """Templates, most recently learned first"""
+        with self._lock:
+            return sorted(self.templates.values(), key=lambda template: template['learned_at'], reverse=True)
+
+    def latest(self):
+        """Most recently learned template, for a site version not seen yet"""
+        newest = self.newest()
+        return newest[0] if newest else None
+
+    def put(self, version, template):
+        with self._lock:
+            self.templates[version] = template
+            self.changed = True
+
+    def ready_selectors(self):
+        """Card selector a loaded page is waited for: the newest learned one
+
+        Empty until something is learned. The fixed selectors are left out
+        on purpose - a broad one such as div[class*='event'] matches a
+        wrapper before the cards themselves have rendered.
+        """
+        latest = self.latest()
+        return [latest['selector']] if latest else []
+
+    def save(self):
+        """Write the templates if anything was learned"""
+        with self._lock:
+            if self.path and self.changed:
+                write_json_atomic(self.path, {'version': TEMPLATES_VERSION, 'templates': self.templates},
+                                  indent=2, sort_keys=True)
+                self.changed = False
+
+
+def learn_from_fixtures(fixtures):
+    """{site version: template} learned from recorded fixture pages
+
+    Pages of one site version vote for a selector by how many dated cards
+    it finds across them; the field mapping is then learned from every
+    card that selector finds.
+    """
+    by_version = {}
+    for fixture in fixtures:
+        by_version.setdefault(site_version(fixture['page']), []).append(parse_html(fixture['page']))
+
+    templates = {}
+    for version, roots in by_version.items():
+        votes = Counter()
+        for root in roots:
+            for selector, cards in find_card_groups(root):
+                votes[selector] += len(cards)
+        for selector, _ in votes.most_common():
+            cards = [node_lines(node) for root in roots for node in select(root, selector)]
+            fields = learn_fields(cards)
+            if fields:
+                templates[version] = {'selector': selector, 'fields': fields,
+                                      'learned_at': datetime.now().isoformat(), 'samples': len(cards)}
+                break
+    return templates
+
+
+def check_fixtures(store, fixtures):
+    """[(fixture name, site version, cards found, valid)] for the stored templates
+
+    A page with no cards is valid if it says there are no events.
+    """
+    results = []
+    for fixture in fixtures:
+        version = site_version(fixture['page'])
+        template = store.get(version) or store.latest()
+        if not template:
+            results.append((fixture['name'], version, 0, False))
+            continue
+        root = parse_html(fixture['page'])
+        cards = [{'text': '\n'.join(node_lines(node))} for node in select(root, template['selector'])]
+        empty = not cards and any(marker in fixture['page'].lower() for marker in NO_EVENTS_MARKERS)
+        results.append((fixture['name'], version, len(cards), empty or validate_template(template, cards)))
+    return results
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Learn and check event card extraction templates")
+    parser.add_argument('--templates', default=DEFAULT_TEMPLATES_FILE,
+                        help=f"template file (default: {DEFAULT_TEMPLATES_FILE})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('learn', "learn templates from recorded fixtures"),
+                            ('check', "check the stored templates against recorded fixtures")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--fixtures', default='fixtures', help="fixture directory (default: fixtures)")
+    commands.add_parser('show', help="list the stored templates")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Template maintenance command line"""
+    args = parse_args(argv)
+    store = TemplateStore(args.templates)
+
+    if args.command == 'show':
+        if not store.templates:
+            print(f"No templates in {args.templates}")
+        for version, template in sorted(store.templates.items()):
+            fields = ', '.join(f"{field}={index}" for field, index in sorted(template['fields'].items(),
+                                                                            key=lambda item: item[1]))
+            print(f"{version}  {template['selector']}  [{fields}]  learned {template['learned_at'][:19]}")
+        return
+
+    from replay import load_fixtures
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        raise SystemExit(f"✗ No fixtures in {args.fixtures} - record some with: python replay.py record")
+
+    if args.command == 'learn':
+        learned = learn_from_fixtures(fixtures)
+        if not learned:
+            raise SystemExit(f"✗ No repeated event cards found in {len(fixtures)} fixture pages")
+        for version, template in learned.items():
+            store.put(version, template)
+            print(f"✓ {version}: {template['selector']} ({template['samples']} cards) {template['fields']}")
+        store.save()
+        print(f"Templates saved to: {args.templates}")
+        return
+
+    failed = 0
+    for name, version, found, valid in check_fixtures(store, fixtures):
+        failed += not valid
+        print(f"{'✓' if valid else '✗'} {name}: {found} cards (site version {version})")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
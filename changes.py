@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Change Feed
+Semantic diff between two event datasets, ignoring fields that change on
+every run, and a small changes.json delta feed for clients to poll
+"""
+
+import argparse
+import json
+
+from event_sink import write_json_atomic
+
+DEFAULT_FEED_FILE = 'changes.json'
+FEED_VERSION = 1
+
+# How many runs' worth of changes the feed keeps
+DEFAULT_HISTORY = 14
+
+# Fields that record when or by which search an event was seen rather than
+# anything about the event itself
+VOLATILE_FIELDS = frozenset({'last_seen', 'sources', 'search_city', 'search_lat', 'search_lon'})
+
+
+def load_dataset(path):
+    """Dataset dict from an events.json file, or {} if it's missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def stable_fields(event):
+    """Event without its volatile fields"""
+    return {key: value for key, value in event.items() if key not in VOLATILE_FIELDS}
+
+
+def diff_events(old_events, new_events):
+    """{'added': [...], 'removed': [...], 'changed': [...]} between two event lists
+
+    added holds the new events, removed the ids that are gone and changed
+    one {'id', 'fields': {name: [old, new]}, 'event'} per edited event.
+    """
+    old = {event['id']: event for event in old_events}
+    new = {event['id']: event for event in new_events}
+
+    changed = []
+    for event_id in old.keys() & new.keys():
+        before, after = stable_fields(old[event_id]), stable_fields(new[event_id])
+        if before != after:
+            fields = {
+                key: [before.get(key), after.get(key)]
+                for key in sorted(before.keys() | after.keys())
+                if before.get(key) != after.get(key)
+            }
+            changed.append({'id': event_id, 'fields': fields, 'event': new[event_id]})
+
+    return {
+        'added': [new[event_id] for event_id in sorted(new.keys() - old.keys())],
+        'removed': sorted(old.keys() - new.keys()),
+        'changed': sorted(changed, key=lambda change: change['id']),
+    }
+
+
+def has_changes(diff):
+    """True if a diff adds, removes or edits anything"""
+    return bool(diff['added'] or diff['removed'] or diff['changed'])
+
+
+def summary(diff):
+    """One-line description of a diff"""
+    return f"{len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed"
+
+
+def update_feed(feed_path, diff, previous, current, history=DEFAULT_HISTORY):
+    """Prepend one run's changes to the feed at feed_path and return the feed
+
+    Entries run newest first and cover consecutive datasets, so a client
+    holding the dataset from any entry's 'from' can catch up by applying
+    the newer entries. With no previous dataset the entry is a reset that
+    tells clients to reload events.json instead of listing every event.
+    """
+    feed = load_dataset(feed_path)
+    if feed.get('version') != FEED_VERSION:
+        feed = {}
+
+    entry = {'from': previous.get('last_updated'), 'to': current.get('last_updated')}
+    if previous:
+        entry.update(diff)
+    else:
+        entry['reset'] = True
+        entry['total_events'] = len(current.get('events', []))
+
+    feed = {
+        'version': FEED_VERSION,
+        'last_updated': current.get('last_updated'),
+        'entries': ([entry] + feed.get('entries', []))[:history],
+    }
+    write_json_atomic(feed_path, feed, indent=2)
+    return feed
+
+
+def publish_if_changed(sink, path, output, feed_path=DEFAULT_FEED_FILE):
+    """Publish output to path through sink only if its events changed
+
+    A run that finds the same events as the published file leaves it (and
+    the feed) untouched, so refreshed last_seen times alone don't produce
+    a new commit. With no sink the file is written directly. Returns the
+    diff against the previous file.
+    """
+    previous = load_dataset(path)
+    diff = diff_events(previous.get('events', []), output['events'])
+    if previous and not has_changes(diff):
+        if sink:
+            sink.discard()
+        return diff
+    if sink:
+        sink.publish(path, output)
+    else:
+        write_json_atomic(path, output, indent=2)
+    update_feed(feed_path, diff, previous, output)
+    return diff
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Compare two events.json files, ignoring volatile fields")
+    parser.add_argument('old', help="previous events.json")
+    parser.add_argument('new', help="current events.json")
+    parser.add_argument('--json', action='store_true', help="print the full diff as JSON")
+    parser.add_argument('--feed', metavar='PATH', help="also add the diff to the change feed at PATH")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Print the changes between two datasets; exit status 1 if there are any"""
+    args = parse_args(argv)
+    previous, current = load_dataset(args.old), load_dataset(args.new)
+    if not current:
+        raise SystemExit(f"Can't read {args.new}")
+
+    diff = diff_events(previous.get('events', []), current.get('events', []))
+    if args.json:
+        print(json.dumps(diff, indent=2))
+    else:
+        print(summary(diff))
+        for event in diff['added']:
+            print(f"  + {event['id']}  {event.get('title', '')}")
+        for event_id in diff['removed']:
+            print(f"  - {event_id}")
+        for change in diff['changed']:
+            print(f"  ~ {change['id']}  {', '.join(change['fields'])}")
+
+    if args.feed and has_changes(diff):
+        update_feed(args.feed, diff, previous, current)
+        print(f"✓ Change feed updated: {args.feed}")
+    raise SystemExit(1 if has_changes(diff) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Pokemon Events Scraper - Test Configuration
+"""
+
+# test_scraper.py is a manual check that drives a real Chrome against
+# the live site, not a unit test
+collect_ignore = ['test_scraper.py']
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Coverage Planner
+Computes a small set of search centers whose range=100 circles cover a
+region, and reports overlap and gaps for any list of search locations
+"""
+
+import argparse
+import importlib
+import json
+import math
+
+from geo import haversine_miles
+
+MILES_PER_DEGREE_LAT = 69.0
+
+# Coarse outlines as (lat, lon) vertices - good to a few miles, which is
+# plenty at a 100-mile search radius
+REGIONS = {
+    'contiguous': [
+        (48.99, -123.0), (48.4, -124.7), (46.2, -124.0), (42.0, -124.3), (40.4, -124.4),
+        (38.0, -122.9), (34.5, -120.6), (34.0, -118.5), (32.53, -117.1), (32.7, -114.7),
+        (31.33, -111.07), (31.33, -108.2), (31.78, -106.5), (29.2, -103.3), (29.8, -101.4),
+        (27.5, -99.5), (25.9, -97.2), (28.0, -97.0), (29.5, -94.8), (29.7, -93.8),
+        (29.0, -90.0), (30.2, -88.5), (30.4, -86.5), (29.7, -85.0), (30.0, -84.0),
+        (28.9, -82.7), (27.0, -82.2), (25.1, -81.1), (25.2, -80.4), (26.8, -80.0),
+        (30.3, -81.4), (32.0, -80.9), (33.8, -78.6), (34.7, -76.6), (35.2, -75.5),
+        (36.9, -76.0), (38.0, -75.2), (39.5, -74.3), (40.5, -74.0), (41.2, -72.0),
+        (41.5, -71.0), (41.6, -70.0), (42.6, -70.6), (43.7, -70.2), (44.8, -66.9),
+        (47.4, -68.3), (47.3, -69.2), (45.0, -71.5), (45.0, -74.7), (44.1, -76.4),
+        (43.3, -79.1), (42.3, -79.8), (41.7, -82.7), (43.0, -82.4), (46.5, -84.4),
+        (48.0, -89.5), (49.0, -95.2), (49.0, -123.0),
+    ],
+    'hawaii': [
+        (22.4, -160.3), (22.4, -159.2), (21.2, -156.6), (20.3, -154.8),
+        (18.9, -154.8), (18.9, -156.1), (20.5, -157.0), (21.3, -158.4),
+    ],
+}
+
+
+def point_in_polygon(lat, lon, polygon):
+    """Ray casting test on (lat, lon) vertices"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            cross = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+def _bounds(polygon):
+    lats = [p[0] for p in polygon]
+    lons = [p[1] for p in polygon]
+    return min(lats), max(lats), min(lons), max(lons)
+
+
+def sample_region(polygon, step=25):
+    """Grid of (lat, lon) points roughly step miles apart inside polygon"""
+    min_lat, max_lat, min_lon, max_lon = _bounds(polygon)
+    points = []
+    lat = min_lat
+    while lat <= max_lat:
+        dlon = step / (MILES_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+        lon = min_lon
+        while lon <= max_lon:
+            if point_in_polygon(lat, lon, polygon):
+                points.append((lat, lon))
+            lon += dlon
+        lat += step / MILES_PER_DEGREE_LAT
+    return points
+
+
+def hex_candidates(polygon, radius):
+    """Hex-tiled circle centers over the polygon's bounding box
+
+    Rows are 1.5 * radius apart and centers sqrt(3) * radius apart within a
+    row, with alternate rows shifted by half a spacing - the sparsest layout
+    of equal circles that still leaves no gaps between them.
+    """
+    spacing = radius * 0.95  # small margin for the per-row longitude scaling
+    min_lat, max_lat, min_lon, max_lon = _bounds(polygon)
+    pad_lat = radius / MILES_PER_DEGREE_LAT
+    lat = min_lat - pad_lat
+    row = 0
+    candidates = []
+    while lat <= max_lat + pad_lat:
+        miles_per_lon = MILES_PER_DEGREE_LAT * math.cos(math.radians(lat))
+        dlon = math.sqrt(3) * spacing / miles_per_lon
+        pad_lon = radius / miles_per_lon
+        lon = min_lon - pad_lon + (dlon / 2 if row % 2 else 0)
+        while lon <= max_lon + pad_lon:
+            candidates.append((lat, lon))
+            lon += dlon
+        lat += 1.5 * spacing / MILES_PER_DEGREE_LAT
+        row += 1
+    return candidates
+
+
+def _coverage_sets(centers, points, radius):
+    """For each center, the set of point indexes within radius"""
+    sets = []
+    for c_lat, c_lon in centers:
+        # Cheap latitude prefilter before the haversine
+        max_dlat = radius / MILES_PER_DEGREE_LAT
+        sets.append({
+            i for i, (p_lat, p_lon) in enumerate(points)
+            if abs(p_lat - c_lat) <= max_dlat and haversine_miles(c_lat, c_lon, p_lat, p_lon) <= radius
+        })
+    return sets
+
+
+def plan_centers(polygon, radius=100, step=25, target=1.0):
+    """Near-minimal list of (lat, lon) centers covering polygon
+
+    Starts from a hex tiling and keeps picking the candidate that covers the
+    most still-uncovered sample points (greedy set cover), which drops the
+    border tiles that only clip the edge of the region. Any slivers the
+    tiling misses are closed by centering a circle on them. Stops once
+    ``target`` of the sample points are covered.
+    """
+    points = sample_region(polygon, step)
+    candidates = hex_candidates(polygon, radius)
+    sets = _coverage_sets(candidates, points, radius)
+
+    uncovered = set(range(len(points)))
+    allowed_gaps = int(len(points) * (1 - target))
+    chosen = []
+    while len(uncovered) > allowed_gaps:
+        best = max(range(len(candidates)), key=lambda i: len(sets[i] & uncovered))
+        gain = sets[best] & uncovered
+        if not gain:
+            extra = [points[i] for i in sorted(uncovered)]
+            candidates.extend(extra)
+            sets.extend(_coverage_sets(extra, points, radius))
+            continue
+        chosen.append(candidates[best])
+        uncovered -= gain
+
+    # Sort north to south, west to east, for a stable, readable list
+    chosen.sort(key=lambda c: (-round(c[0], 1), c[1]))
+    return chosen
+
+
+def coverage_report(centers, polygon, radius=100, step=25):
+    """Overlap and gap statistics for centers over polygon"""
+    points = sample_region(polygon, step)
+    counts = [0] * len(points)
+    for covered in _coverage_sets(centers, points, radius):
+        for i in covered:
+            counts[i] += 1
+
+    covered_counts = [c for c in counts if c]
+    gaps = [points[i] for i, c in enumerate(counts) if not c]
+    circle_area = math.pi * radius ** 2
+    region_area = len(points) * step ** 2
+
+    return {
+        'centers': len(centers),
+        'radius_miles': radius,
+        'sample_points': len(points),
+        'covered_fraction': round(len(covered_counts) / len(points), 4) if points else 0,
+        'mean_circles_per_point': round(sum(covered_counts) / len(covered_counts), 2) if covered_counts else 0,
+        'overlap_fraction': round(sum(1 for c in covered_counts if c > 1) / len(points), 4) if points else 0,
+        'area_ratio': round(len(centers) * circle_area / region_area, 2) if region_area else 0,
+        'gap_points': [(round(lat, 2), round(lon, 2)) for lat, lon in gaps],
+    }
+
+
+def label_centers(centers, reference):
+    """Turn (lat, lon) centers into location dicts named after the nearest reference city"""
+    locations = []
+    for i, (lat, lon) in enumerate(centers):
+        name = f"Grid {i + 1}"
+        if reference:
+            nearest = min(reference, key=lambda r: haversine_miles(lat, lon, r['lat'], r['lon']))
+            name = f"{name} (near {nearest['city']})"
+        locations.append({"city": name, "lat": round(lat, 4), "lon": round(lon, 4)})
+    return locations
+
+
+def load_locations(source):
+    """Load a location list from a JSON file or a scraper module's SEARCH_LOCATIONS"""
+    if source.endswith('.json'):
+        with open(source) as f:
+            return json.load(f)
+    return importlib.import_module(source).SEARCH_LOCATIONS
+
+
+def print_report(title, report, max_gaps=10):
+    """Print a coverage report"""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    print(f"Search centers: {report['centers']} (radius {report['radius_miles']} mi)")
+    print(f"Covered: {report['covered_fraction']:.1%} of {report['sample_points']} sample points")
+    print(f"Circles per covered point: {report['mean_circles_per_point']}")
+    print(f"Points inside 2+ circles: {report['overlap_fraction']:.1%}")
+    print(f"Circle area / region area: {report['area_ratio']}")
+    gaps = report['gap_points']
+    if gaps:
+        print(f"⚠ {len(gaps)} uncovered sample points, e.g.:")
+        for lat, lon in gaps[:max_gaps]:
+            print(f"    ({lat}, {lon})")
+    else:
+        print("✓ No gaps")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Plan or check search-location coverage")
+    parser.add_argument('--region', choices=sorted(REGIONS), action='append',
+                        help="region(s) to cover (default: contiguous and hawaii)")
+    parser.add_argument('--radius', type=float, default=100, help="search radius in miles (default: 100)")
+    parser.add_argument('--step', type=float, default=25, help="sample grid spacing in miles (default: 25)")
+    parser.add_argument('--target', type=float, default=1.0,
+                        help="fraction of the region the plan must cover (default: 1.0)")
+    parser.add_argument('--report', metavar='SOURCE',
+                        help="only report on an existing list: a .json file or a module name like locations")
+    parser.add_argument('--output', metavar='PATH', help="write the planned locations to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Plan a coverage grid, or report on an existing location list"""
+    args = parse_args(argv)
+    regions = args.region or ['contiguous', 'hawaii']
+
+    if args.report:
+        locations = load_locations(args.report)
+        centers = [(loc['lat'], loc['lon']) for loc in locations]
+        for region in regions:
+            report = coverage_report(centers, REGIONS[region], args.radius, args.step)
+            print_report(f"{args.report} - {region}", report)
+        return
+
+    planned = []
+    for region in regions:
+        centers = plan_centers(REGIONS[region], args.radius, args.step, args.target)
+        print_report(f"Planned grid - {region}",
+                     coverage_report(centers, REGIONS[region], args.radius, args.step))
+        planned.extend(centers)
+
+    try:
+        reference = load_locations('locations')
+    except ImportError:
+        reference = []
+    locations = label_centers(planned, reference)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(locations, f, indent=2)
+        print(f"\n✓ Saved {len(locations)} locations to {args.output}")
+    else:
+        print(json.dumps(locations, indent=2))
+
+
+if __name__ == "__main__":
+    main()
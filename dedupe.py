@@ -0,0 +1,244 @@
+"""
+Pokemon Events Scraper - Deduplication
+Merges near-duplicate events returned by overlapping searches (or by
+different scrapers) into one record that remembers every source city.
+Candidates are blocked by day and place, so the work grows with the
+number of events rather than the number of pairs.
+"""
+
+import re
+import unicodedata
+
+from geo import geohash_encode
+
+# Geohash length for venue blocks (~4.9 x 4.9 km)
+BLOCK_PRECISION = 5
+
+# Geohash length of the search area standing in for an address with no
+# city or ZIP (~156 x 156 km, about one search radius)
+SEARCH_PRECISION = 3
+
+# Largest block compared all-pairs; bigger blocks are compared in a
+# sliding window over their sorted titles
+MAX_BLOCK = 64
+WINDOW = 16
+
+DEFAULT_THRESHOLD = 0.8
+
+# Title words that tell otherwise identical events apart: numbers
+# ("Cup 2" vs "Cup 3") and the game or division an event is for
+DISTINCT_WORDS = frozenset({'tcg', 'vgc', 'go', 'unite', 'juniors', 'seniors', 'masters'})
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_STREET_NUMBER = re.compile(r'\b(\d+)\s+([a-z]+)')
+# Last address part of canonical text: "tx 78701" or "tx 78701 1234"
+_STATE_ZIP = re.compile(r'\b([a-z]{2}) (\d{5})(?: \d{4})?$')
+_STATE = re.compile(r'^[a-z]{2}$')
+_COUNTRIES = frozenset({'us', 'usa', 'united states', 'united states of america'})
+
+
+def canonical(text):
+    """Lowercase ASCII words separated by single spaces"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def locality(address):
+    """ZIP code, or else "city st", of a US address; None if it has neither
+
+    "12 Main St, Austin, TX 78701" -> "78701"
+    "12 Main St, Springfield, IL" -> "springfield il"
+    """
+    parts = [part for part in map(canonical, (address or '').split(',')) if part and part not in _COUNTRIES]
+    if not parts:
+        return None
+    match = _STATE_ZIP.search(parts[-1])
+    if match:
+        return match.group(2)
+    if len(parts) >= 2 and _STATE.match(parts[-1]):
+        return f"{parts[-2]} {parts[-1]}"
+    return None
+
+
+def trigrams(text):
+    """Character trigrams of canonical text, ignoring spaces"""
+    compact = text.replace(' ', '')
+    if len(compact) < 3:
+        return {compact} if compact else set()
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def jaccard(a, b):
+    """Set overlap in [0, 1]"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    """Precomputed comparison features of one event"""
+
+    __slots__ = ('index', 'event', 'title', 'title_grams', 'markers', 'venue_grams', 'street', 'locality', 'area',
+                 'day', 'time')
+
+    def __init__(self, index, event):
+        self.index = index
+        self.event = event
+        self.title = canonical(event.get('title'))
+        self.title_grams = trigrams(self.title)
+        self.markers = frozenset(word for word in self.title.split() if word.isdigit() or word in DISTINCT_WORDS)
+        self.venue_grams = trigrams(canonical(event.get('location')))
+        street = _STREET_NUMBER.search(canonical(event.get('address')))
+        self.street = street.group(0) if street else None
+        self.locality = locality(event.get('address'))
+        # Where the event is, as far as can be told: the address's ZIP or
+        # city, else the cell around the search that found it
+        self.area = self.locality
+        if not self.area and event.get('search_lat') is not None and event.get('search_lon') is not None:
+            self.area = geohash_encode(float(event['search_lat']), float(event['search_lon']), SEARCH_PRECISION)
+        start = event.get('start') or ''
+        self.day = start[:10] or canonical(event.get('date'))
+        self.time = start[11:] or None
+
+    def block_keys(self):
+        """Keys of the blocks this event is compared within
+
+        Street and venue-name blocks are per area, so the same street
+        number or chain store name in another town is never a candidate.
+        """
+        keys = []
+        event = self.event
+        if event.get('venue_lat') is not None and event.get('venue_lon') is not None:
+            keys.append(('geo', self.day, geohash_encode(float(event['venue_lat']), float(event['venue_lon']),
+                                                           BLOCK_PRECISION)))
+        if self.street:
+            keys.append(('street', self.day, self.area, self.street))
+        if self.venue_grams:
+            keys.append(('venue', self.day, self.area, canonical(event.get('location'))[:12]))
+        if not keys:
+            keys.append(('title', self.day, self.title[:12]))
+        return keys
+
+
+def similarity(a, b):
+    """Match score in [0, 1] of two entries on the same day"""
+    # Same day but different start times are separate events at one store
+    if a.time and b.time and a.time != b.time:
+        return 0.0
+    if a.markers != b.markers:
+        return 0.0
+    # Same-named stores in different towns are different events
+    if a.locality and b.locality and a.locality != b.locality:
+        return 0.0
+    place = jaccard(a.venue_grams, b.venue_grams)
+    if a.street and a.street == b.street and a.area and a.area == b.area:
+        place = 1.0
+    return 0.6 * jaccard(a.title_grams, b.title_grams) + 0.4 * place
+
+
+def _richness(event):
+    """Preference for the record kept when merging: most complete first"""
+    return (
+        event.get('venue_lat') is not None,
+        bool(event.get('start')),
+        len(event.get('address') or ''),
+        len(event.get('description') or ''),
+        event.get('id', ''),
+    )
+
+
+def _sources(event):
+    """Provenance entries of an event (its own search if it has none yet)"""
+    if event.get('sources'):
+        return event['sources']
+    return [{
+        'city': event.get('search_city', ''),
+        'lat': event.get('search_lat'),
+        'lon': event.get('search_lon'),
+        'id': event.get('id', ''),
+    }]
+
+
+def merge_cluster(events):
+    """One event from a cluster of duplicates
+
+    The most complete record wins; its empty fields are filled from the
+    others, last_seen is the latest and sources lists every search that
+    returned the event.
+    """
+    events = sorted(events, key=_richness, reverse=True)
+    merged = dict(events[0])
+    for other in events[1:]:
+        for key, value in other.items():
+            if value not in (None, '') and merged.get(key) in (None, ''):
+                merged[key] = value
+        if (other.get('last_seen') or '') > (merged.get('last_seen') or ''):
+            merged['last_seen'] = other['last_seen']
+
+    sources = {}
+    for event in events:
+        for source in _sources(event):
+            sources.setdefault((source.get('city'), source.get('id')), source)
+    merged['sources'] = sorted(sources.values(), key=lambda s: (s.get('city') or '', s.get('id') or ''))
+    return merged
+
+
+def find_duplicates(events, threshold=DEFAULT_THRESHOLD):
+    """Clusters of indices of events that are the same real event"""
+    entries = [_Entry(i, event) for i, event in enumerate(events)]
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def compare(a, b):
+        root_a, root_b = find(a.index), find(b.index)
+        if root_a != root_b and similarity(a, b) >= threshold:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    # Identical ids are the same event whatever their text
+    by_id = {}
+    for entry in entries:
+        event_id = entry.event.get('id')
+        if event_id:
+            if event_id in by_id:
+                parent[find(entry.index)] = find(by_id[event_id])
+            else:
+                by_id[event_id] = entry.index
+
+    blocks = {}
+    for entry in entries:
+        for key in entry.block_keys():
+            blocks.setdefault(key, []).append(entry)
+
+    for block in blocks.values():
+        if len(block) <= MAX_BLOCK:
+            for i, a in enumerate(block):
+                for b in block[i + 1:]:
+                    compare(a, b)
+        else:
+            block.sort(key=lambda entry: entry.title)
+            for i, a in enumerate(block):
+                for b in block[i + 1:i + 1 + WINDOW]:
+                    compare(a, b)
+
+    clusters = {}
+    for entry in entries:
+        clusters.setdefault(find(entry.index), []).append(entry.index)
+    return list(clusters.values())
+
+
+def dedupe_events(events, threshold=DEFAULT_THRESHOLD):
+    """Events with near-duplicates merged, in their original order
+
+    Every returned event has a 'sources' list of the searches (city,
+    coordinates and original id) that found it.
+    """
+    events = list(events)
+    merged = []
+    for cluster in sorted(find_duplicates(events, threshold)):
+        merged.append(merge_cluster([events[i] for i in cluster]))
+    return merged
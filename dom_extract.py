@@ -0,0 +1,131 @@
+"""
+Pokemon Events Scraper - DOM Extraction
+Gathers every event card on the page in a single execute_script call
+instead of one WebDriver round trip per element, and turns the cards
+into events - with a learned extraction template when there is one
+"""
+
+import metrics
+from card_templates import card_lines, discover_template, fields_from_lines, learn_fields, site_version, \
+    validate_template
+from event_model import build_event
+from page_ready import EVENT_SELECTORS, NO_EVENTS_MARKERS
+
+# For the first selector that matches anything, return each match's
+# visible text, id/class/data-* attributes and link targets
+_COLLECT_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var found = document.querySelectorAll(selectors[i]);
+    if (!found.length) continue;
+    var cards = [];
+    for (var j = 0; j < found.length; j++) {
+        var el = found[j], attrs = {}, links = [];
+        for (var k = 0; k < el.attributes.length; k++) {
+            var attr = el.attributes[k];
+            if (attr.name === 'id' || attr.name === 'class' || attr.name.indexOf('data-') === 0) {
+                attrs[attr.name] = attr.value;
+            }
+        }
+        if (el.href) links.push(el.href);
+        var anchors = el.querySelectorAll('a[href]');
+        for (k = 0; k < anchors.length; k++) links.push(anchors[k].href);
+        cards.push({text: el.innerText || '', attrs: attrs, links: links});
+    }
+    return {selector: selectors[i], cards: cards};
+}
+return {selector: null, cards: []};
+"""
+
+
+def collect_event_cards(driver, selectors=EVENT_SELECTORS):
+    """(selector, cards) for the first selector that matches, or (None, [])
+
+    Each card is {'text': ..., 'attrs': {...}, 'links': [...]}.
+    """
+    result = driver.execute_script(_COLLECT_SCRIPT, list(selectors)) or {}
+    return result.get('selector'), result.get('cards') or []
+
+
+def collect_with_template(driver, page_source, templates):
+    """(selector, cards, fields) using the learned template for this site version
+
+    The template's selector is tried first and its cards validated. If
+    they don't read as events, a new template is discovered from
+    page_source, checked against the live cards and stored; only if that
+    fails too are the fixed EVENT_SELECTORS tried, with fields None.
+    """
+    version = site_version(page_source)
+    template = templates.get(version) or templates.latest()
+    if template:
+        selector, cards = collect_event_cards(driver, [template['selector']])
+        if validate_template(template, cards):
+            metrics.count('template_hits')
+            if templates.get(version) is not template:
+                # A redeploy that kept the markup: remember it under the new version
+                templates.put(version, template)
+            return selector, cards, template['fields']
+        if not cards and any(marker in page_source.lower() for marker in NO_EVENTS_MARKERS):
+            return selector, [], template['fields']
+        metrics.count('template_misses')
+
+    learned = discover_template(page_source)
+    if learned:
+        selector, cards = collect_event_cards(driver, [learned['selector']])
+        # Field positions from the browser's own rendering of the cards
+        learned['fields'] = learn_fields([card_lines(card['text']) for card in cards]) or learned['fields']
+        if validate_template(learned, cards):
+            metrics.count('templates_learned')
+            templates.put(version, learned)
+            print(f"  ✓ Learned extraction template for site version {version}: {selector}")
+            return selector, cards, learned['fields']
+
+    selector, cards = collect_event_cards(driver)
+    return selector, cards, None
+
+
+def parse_event_text(text, city):
+    """Split an event card's visible text into event fields"""
+    lines = text.split('\n')
+    if len(lines) >= 2:
+        return {
+            'title': lines[0],
+            'date': lines[1],
+            'location': lines[2] if len(lines) > 2 else city,
+            'address': lines[3] if len(lines) > 3 else "",
+            'description': '\n'.join(lines[4:]) if len(lines) > 4 else "",
+            'event_type': "",
+        }
+    return {
+        'title': text[:100],
+        'date': "Date TBA",
+        'location': city,
+        'address': "",
+        'description': "",
+        'event_type': "",
+    }
+
+
+def events_from_cards(cards, city, lat, lon, template_fields=None):
+    """Events built from the cards gathered by collect_event_cards
+
+    template_fields, a learned {field: line index} mapping, replaces the
+    default reading of the card text as title, date, venue, address.
+    """
+    events = []
+    for i, card in enumerate(cards):
+        try:
+            text = card['text'].strip()
+            if not text:
+                continue
+            if template_fields:
+                fields = fields_from_lines(card_lines(text), template_fields, city)
+            else:
+                fields = parse_event_text(text, city)
+            if card.get('links'):
+                fields['url'] = card['links'][0]
+            events.append(build_event(fields, city, lat, lon))
+        except Exception as e:
+            metrics.count('parse_errors')
+            print(f"  ⚠ Error parsing event {i}: {str(e)[:50]}")
+    return events
@@ -0,0 +1,118 @@
+"""
+Pokemon Events Scraper - Driver Manager
+Caches the resolved ChromeDriver binary, health-checks browser sessions,
+restarts crashed browsers and recycles them after a number of pages
+"""
+
+import json
+import os
+import threading
+import time
+
+import metrics
+
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'pokemon-events', 'chromedriver.json')
+DRIVER_CACHE_MAX_AGE = 7 * 24 * 3600
+
+_resolve_lock = threading.Lock()
+_resolved_path = None
+
+
+def resolve_driver_path(refresh=False, cache_file=DRIVER_CACHE_FILE):
+    """Path to a ChromeDriver binary, resolved with webdriver-manager at most once a week
+
+    The result is memoized for the process (all workers share one lookup)
+    and kept in cache_file between runs. Pass refresh=True after a session
+    fails to start, e.g. because Chrome was upgraded.
+    """
+    global _resolved_path
+    with _resolve_lock:
+        if not refresh:
+            if _resolved_path:
+                return _resolved_path
+            try:
+                with open(cache_file) as f:
+                    cached = json.load(f)
+                path = cached['path']
+                if time.time() - cached['resolved_at'] < DRIVER_CACHE_MAX_AGE and os.access(path, os.X_OK):
+                    _resolved_path = path
+                    return path
+            except (OSError, ValueError, KeyError):
+                pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        print("Installing ChromeDriver...")
+        path = ChromeDriverManager().install()
+
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+        _resolved_path = path
+        return path
+
+
+def is_alive(driver):
+    """True if the browser session still answers"""
+    try:
+        driver.execute_script('return 1')
+        return True
+    except Exception:
+        return False
+
+
+class DriverManager:
+    """Owns one browser session for a worker
+
+    ``scrape`` hands the current driver to a scrape function. Empty results
+    trigger a health check, and a dead session is replaced and the location
+    retried once. After ``max_pages`` pages the browser is restarted so
+    memory doesn't creep.
+    """
+
+    def __init__(self, factory, max_pages=25):
+        self.factory = factory
+        self.max_pages = max_pages
+        self.driver = None
+        self.pages = 0
+        self.restarts = 0
+
+    def start(self):
+        """Start a fresh browser, quitting the old one if any"""
+        self.quit()
+        self.driver = self.factory()
+        self.pages = 0
+        return self.driver
+
+    def get(self):
+        """Current driver, started or recycled as needed"""
+        if self.driver is None:
+            self.start()
+        elif self.max_pages and self.pages >= self.max_pages:
+            metrics.count('browser_recycles')
+            self.start()
+        return self.driver
+
+    def scrape(self, scrape, location):
+        """Run scrape(driver, location), recovering from a crashed browser once"""
+        with metrics.span('location', location['city']):
+            events = scrape(self.get(), location)
+            self.pages += 1
+            if events or is_alive(self.driver):
+                return events
+
+            print(f"  ⚠ Browser session died - restarting and retrying {location['city']}", flush=True)
+            metrics.count('browser_restarts')
+            self.restarts += 1
+            self.start()
+            events = scrape(self.driver, location)
+            self.pages += 1
+            return events
+
+    def quit(self):
+        """Close the browser if one is running"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
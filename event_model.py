@@ -0,0 +1,270 @@
+"""
+Pokemon Events Scraper - Event Model
+Slotted event record with parsed start/end times, a normalized venue and
+event type, plus a fast parser for the date formats the event locator uses
+"""
+
+import hashlib
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_ISO = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[t ](\d{1,2}):(\d{2}))?')
+_NUMERIC = re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b')
+_MONTH_DAY = re.compile(
+    r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b'
+    r'(?:\s*[-–]\s*(\d{1,2})(?:st|nd|rd|th)?\b(?!:))?'
+)
+_YEAR = re.compile(r'\b(20\d{2})\b')
+_TIME = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s?m\b\.?')
+
+# Canonical event types, matched against the scraped type or the title
+EVENT_TYPES = [
+    (re.compile(r'league\s+challenge', re.I), 'League Challenge'),
+    (re.compile(r'league\s+cup', re.I), 'League Cup'),
+    (re.compile(r'pre-?release', re.I), 'Prerelease'),
+    (re.compile(r'regional', re.I), 'Regional Championship'),
+    (re.compile(r'international\s+championship', re.I), 'International Championship'),
+    (re.compile(r'world\s+championship', re.I), 'World Championship'),
+    (re.compile(r'special\s+event', re.I), 'Special Event'),
+    (re.compile(r'premier\s+challenge', re.I), 'Premier Challenge'),
+    (re.compile(r'midseason\s+showdown', re.I), 'Midseason Showdown'),
+    (re.compile(r'\bgo\b.*(challenge|cup|event)|pok[eé]mon\s+go', re.I), 'Pokemon GO'),
+    (re.compile(r'\bleague\b', re.I), 'League'),
+]
+
+
+def _infer_year(month, day, reference):
+    """Year of a month/day with no year: the first occurrence no more than
+    two months before reference (an event that started recently), so
+    "Dec 30" read on Jan 5 is last week. Feb 29 skips to a leap year.
+    None if the month never has that day.
+    """
+    since = reference - timedelta(days=60)
+    # Four years ahead always reaches a leap year
+    for year in range(reference.year - 1, reference.year + 5):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= since:
+            return year
+    return None
+
+
+def _with_time(day, match):
+    """datetime on day at a matched 12-hour time"""
+    hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == 'p' else 0)
+    return datetime(day.year, day.month, day.day, hour, int(match.group(2) or 0))
+
+
+@lru_cache(maxsize=4096)
+def parse_event_date(text, reference=None):
+    """(start, end) parsed from an event locator date string
+
+    Handles ISO 8601 ("2026-11-07T13:00:00"), US numeric ("11/7/2026"),
+    month names ("Sat, Nov 7, 2026 1:00 PM"), day ranges ("Nov 7-8,
+    2026", "Nov 7 - Nov 8") and 12-hour times. Values are dates, or
+    datetimes when a time is given; end is None for single dates. A
+    missing year is taken relative to reference (a date, default today).
+    Unparseable text gives (None, None). ISO offsets are dropped: the
+    locator shows times in the venue's local time.
+    """
+    if not text:
+        return None, None
+    lowered = text.lower()
+
+    iso = _ISO.findall(lowered)
+    if iso:
+        bounds = []
+        for y, m, d, hh, mm in iso[:2]:
+            try:
+                bounds.append(datetime(int(y), int(m), int(d), int(hh), int(mm)) if hh
+                              else date(int(y), int(m), int(d)))
+            except ValueError:
+                return None, None
+        return bounds[0], bounds[1] if len(bounds) > 1 else None
+
+    reference = reference or date.today()
+    days = []
+    numeric = _NUMERIC.findall(lowered)
+    if numeric:
+        for m, d, y in numeric[:2]:
+            year = int(y) + 2000 if len(y) == 2 else int(y)
+            try:
+                days.append(date(year, int(m), int(d)))
+            except ValueError:
+                return None, None
+    else:
+        years = [int(y) for y in _YEAR.findall(lowered)]
+        for match in _MONTH_DAY.finditer(lowered):
+            month = MONTHS[match.group(1)]
+            for day in filter(None, (match.group(2), match.group(3))):
+                year = years[0] if years else _infer_year(month, int(day), reference)
+                if year is None:
+                    return None, None
+                try:
+                    days.append(date(year, month, int(day)))
+                except ValueError:
+                    return None, None
+            if len(days) >= 2:
+                break
+        # "Dec 30 - Jan 2, 2027" ends in the stated year, so it starts the year before
+        if len(days) == 2 and days[1] < days[0]:
+            days[0] = days[0].replace(year=days[0].year - 1)
+
+    if not days:
+        return None, None
+
+    times = list(_TIME.finditer(lowered))[:2]
+    start = _with_time(days[0], times[0]) if times else days[0]
+    end = days[1] if len(days) > 1 else None
+    if len(times) > 1:
+        end = _with_time(end or days[0], times[1])
+    return start, end
+
+
+def normalize_venue(name):
+    """Venue name with whitespace collapsed and stray punctuation trimmed"""
+    return re.sub(r'\s+', ' ', name or '').strip(' ,;-')
+
+
+def normalize_event_type(event_type, title=''):
+    """Canonical event type from the scraped type, else guessed from the title"""
+    for text in (event_type, title):
+        if not text:
+            continue
+        for pattern, canonical in EVENT_TYPES:
+            if pattern.search(text):
+                return canonical
+    return (event_type or '').strip()
+
+
+def _isoformat(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='minutes')
+    return value.isoformat()
+
+
+class Event:
+    """One normalized event
+
+    ``date`` keeps the text as shown by the locator; ``start`` and ``end``
+    are its parsed dates or datetimes. ``lat``/``lon`` are the venue
+    coordinates when known. ``sources`` lists the searches that found the
+    event once duplicates have been merged.
+    """
+
+    __slots__ = (
+        'id', 'title', 'date', 'start', 'end', 'venue', 'address', 'description', 'event_type',
+        'lat', 'lon', 'url', 'search_city', 'search_lat', 'search_lon', 'last_seen', 'sources',
+    )
+
+    def __init__(self, id='', title='', date='', start=None, end=None, venue='', address='',
+                 description='', event_type='', lat=None, lon=None, url=None,
+                 search_city='', search_lat=None, search_lon=None, last_seen='', sources=None):
+        self.id = id
+        self.title = title
+        self.date = date
+        self.start = start
+        self.end = end
+        self.venue = venue
+        self.address = address
+        self.description = description
+        self.event_type = event_type
+        self.lat = lat
+        self.lon = lon
+        self.url = url
+        self.search_city = search_city
+        self.search_lat = search_lat
+        self.search_lon = search_lon
+        self.last_seen = last_seen
+        self.sources = sources
+
+    @classmethod
+    def from_dict(cls, data):
+        """Normalized Event from a scraped event dict"""
+        last_seen = data.get('last_seen') or ''
+        try:
+            reference = datetime.fromisoformat(last_seen).date()
+        except ValueError:
+            reference = None
+        title = (data.get('title') or '').strip()
+        start, end = parse_event_date((data.get('date') or '').strip(), reference)
+        return cls(
+            id=data.get('id', ''),
+            title=title,
+            date=(data.get('date') or '').strip(),
+            start=start,
+            end=end,
+            venue=normalize_venue(data.get('location')),
+            address=normalize_venue(data.get('address')),
+            description=(data.get('description') or '').strip(),
+            event_type=normalize_event_type(data.get('event_type'), title),
+            lat=data.get('venue_lat'),
+            lon=data.get('venue_lon'),
+            url=data.get('url'),
+            search_city=data.get('search_city', ''),
+            search_lat=data.get('search_lat'),
+            search_lon=data.get('search_lon'),
+            last_seen=last_seen,
+            sources=data.get('sources'),
+        )
+
+    def to_dict(self):
+        """Event dict in the events.json layout, with ISO start/end"""
+        data = {
+            'search_city': self.search_city,
+            'search_lat': self.search_lat,
+            'search_lon': self.search_lon,
+            'title': self.title,
+            'date': self.date,
+            'start': _isoformat(self.start),
+            'end': _isoformat(self.end),
+            'location': self.venue,
+            'address': self.address,
+            'description': self.description,
+            'event_type': self.event_type,
+            'id': self.id,
+            'last_seen': self.last_seen,
+        }
+        if self.lat is not None and self.lon is not None:
+            data['venue_lat'] = self.lat
+            data['venue_lon'] = self.lon
+        if self.url:
+            data['url'] = self.url
+        if self.sources:
+            data['sources'] = self.sources
+        return data
+
+    def sort_key(self):
+        """Chronological order; undated events last"""
+        return (self.start is None, _isoformat(self.start) or '', self.title)
+
+
+def event_id(fields):
+    """Content hash identifying an event across runs and searches"""
+    key = f"{fields.get('title', '')}|{fields.get('date', '')}|{fields.get('location', '')}|{fields.get('address', '')}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def build_event(fields, city, lat, lon):
+    """Raw event dict from parsed fields plus search metadata, id and timestamp"""
+    event = {'search_city': city, 'search_lat': lat, 'search_lon': lon}
+    event.update(fields)
+    event['id'] = event_id(event)
+    event['last_seen'] = datetime.now().isoformat()
+    return event
+
+
+def normalize_events(events):
+    """Normalized, chronologically sorted event dicts"""
+    records = sorted((Event.from_dict(event) for event in events), key=Event.sort_key)
+    return [record.to_dict() for record in records]
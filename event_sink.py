@@ -0,0 +1,111 @@
+"""
+Pokemon Events Scraper - Event Sink
+Journals each location's events as soon as they are scraped and builds
+events.json from the journal with an atomic replace
+"""
+
+import json
+import os
+from datetime import datetime
+
+from scrape_state import location_key
+
+DEFAULT_JOURNAL_FILE = 'events.journal.jsonl'
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to a temp file, fsync it and rename it over path"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def trim_torn_line(path, chunk=4096):
+    """Cut a file back to just after its last newline
+
+    A crash mid-write can leave a partial last line; anything appended
+    after it would be joined onto that line and lost with it.
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+    return end - pos
+
+
+class EventSink:
+    """Append-only JSONL journal of per-location results
+
+    Every ``write`` is flushed and fsynced, so a crash loses at most the
+    location being scraped. With ``resume`` the existing journal is kept
+    and ``completed`` reports which locations it already holds; a torn
+    last line left by a crash is cut off before anything is appended.
+    """
+
+    def __init__(self, journal=DEFAULT_JOURNAL_FILE, resume=False):
+        self.journal = journal
+        if not resume and os.path.exists(journal):
+            os.remove(journal)
+        elif resume and os.path.exists(journal) and trim_torn_line(journal):
+            print(f"⚠ Dropped a partly written last record from {journal}")
+        self._file = open(journal, 'a', encoding='utf-8')
+
+    def records(self):
+        """Yield journal records in the order they were written"""
+        self._file.flush()
+        with open(self.journal, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write
+                    continue
+
+    def completed(self):
+        """Keys of locations already in the journal"""
+        return {record['key'] for record in self.records()}
+
+    def write(self, location, events, source='scraped'):
+        """Append one location's events to the journal"""
+        record = {
+            'key': location_key(location),
+            'location': location,
+            'source': source,
+            'written_at': datetime.now().isoformat(),
+            'events': events,
+        }
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def events(self):
+        """Every event in the journal, duplicates included, in write order"""
+        return [event for record in self.records() for event in record['events']]
+
+    def publish(self, path, output):
+        """Atomically write the final dataset and drop the journal"""
+        write_json_atomic(path, output, indent=2)
+        self.close()
+        os.remove(self.journal)
+
+    def discard(self):
+        """Drop the journal without publishing anything"""
+        self.close()
+        os.remove(self.journal)
+
+    def close(self):
+        """Close the journal file"""
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,122 @@
+"""
+Pokemon Events Scraper - Async Fetch Engine
+Fetches many locations concurrently over one pooled keep-alive session
+"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+
+class HostRateLimiter:
+    """Per-host spacing between request starts (event loop only, no locking)"""
+
+    def __init__(self, min_interval=0.2):
+        self.min_interval = min_interval
+        self._next_slot = {}
+
+    async def acquire(self, host):
+        """Wait until the next request slot for host is free"""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class FetchEngine:
+    """Bounded-concurrency JSON fetcher for speculative API endpoints
+
+    ``endpoints`` are URL templates formatted with ``lat`` and ``lon``. They
+    are probed in order once; the first one that answers with JSON is
+    remembered and every other location only uses that one. Responses are
+    kept in ``cache`` (a PageCache), if given, and read back from it. One
+    engine can run several batches; whoever owns it calls ``close()``.
+    """
+
+    def __init__(self, endpoints, headers=None, concurrency=8, min_interval=0.2, timeout=10, cache=None):
+        self.endpoints = list(endpoints)
+        self.cache = cache
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(min_interval)
+        self.working_endpoint = None
+        self._probed = False
+        self._semaphore = None
+        self._discovery_lock = None
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.concurrency = concurrency
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    async def fetch_json(self, url):
+        """GET url and return decoded JSON, or None on any failure"""
+        if self.cache:
+            data = self.cache.get(url, 'api')
+            if data is not None:
+                return data
+        await self.limiter.acquire(urlsplit(url).netloc)
+        async with self._semaphore:
+            try:
+                with metrics.span('http_fetch'):
+                    response = await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+            except requests.RequestException:
+                metrics.count('http_errors', status='exception')
+                return None
+        if response.status_code != 200:
+            metrics.count('http_errors', status=response.status_code)
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        if not isinstance(data, (list, dict)):
+            return None
+        if self.cache:
+            self.cache.put(url, 'api', data)
+        return data
+
+    async def _discover(self, lat, lon):
+        """Probe the candidate endpoints once and remember the first that works"""
+        async with self._discovery_lock:
+            if self._probed:
+                return None
+            self._probed = True
+            for endpoint in self.endpoints:
+                data = await self.fetch_json(endpoint.format(lat=lat, lon=lon))
+                if data is not None:
+                    self.working_endpoint = endpoint
+                    print(f"✓ Found API endpoint: {endpoint}")
+                    return data
+            return None
+
+    async def fetch_location(self, location):
+        """Fetch raw API data for one location, or None"""
+        lat = location['lat']
+        lon = location['lon']
+        if self.working_endpoint is None:
+            data = await self._discover(lat, lon)
+            if data is not None or self.working_endpoint is None:
+                return data
+        return await self.fetch_json(self.working_endpoint.format(lat=lat, lon=lon))
+
+    async def fetch_all(self, locations):
+        """Fetch every location concurrently, returning [(location, data), ...] in order"""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._discovery_lock = asyncio.Lock()
+        results = await asyncio.gather(*(self.fetch_location(location) for location in locations))
+        return list(zip(locations, results))
+
+    def run(self, locations):
+        """Synchronous wrapper around fetch_all; the session stays open until close()"""
+        return asyncio.run(self.fetch_all(locations))
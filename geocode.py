@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Geocoding
+Persistent SQLite cache in front of a pluggable geocoding backend, plus
+the ZIP / city / state centroid tables the website uses before falling
+back to a network geocode
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from event_sink import write_json_atomic
+
+DEFAULT_CACHE_FILE = 'geocode_cache.sqlite'
+DEFAULT_PLACES_DIR = os.path.join('data', 'places')
+
+# Days before a query that found nothing is looked up again
+DEFAULT_MISS_DAYS = 30
+
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+USER_AGENT = 'Pokemon Events Locator'
+
+# Approximate geographic centers, for searches like "Texas" or "TX"
+STATE_CENTROIDS = {
+    'AL': ('Alabama', 32.79, -86.83), 'AK': ('Alaska', 64.73, -152.47),
+    'AZ': ('Arizona', 34.29, -111.66), 'AR': ('Arkansas', 34.90, -92.44),
+    'CA': ('California', 37.18, -119.47), 'CO': ('Colorado', 38.99, -105.55),
+    'CT': ('Connecticut', 41.62, -72.73), 'DE': ('Delaware', 38.99, -75.51),
+    'DC': ('District of Columbia', 38.91, -77.01), 'FL': ('Florida', 28.63, -82.45),
+    'GA': ('Georgia', 32.64, -83.44), 'HI': ('Hawaii', 20.29, -156.37),
+    'ID': ('Idaho', 44.35, -114.61), 'IL': ('Illinois', 40.04, -89.20),
+    'IN': ('Indiana', 39.89, -86.28), 'IA': ('Iowa', 42.08, -93.50),
+    'KS': ('Kansas', 38.49, -98.38), 'KY': ('Kentucky', 37.53, -85.30),
+    'LA': ('Louisiana', 31.07, -91.99), 'ME': ('Maine', 45.37, -69.24),
+    'MD': ('Maryland', 39.05, -76.79), 'MA': ('Massachusetts', 42.26, -71.81),
+    'MI': ('Michigan', 44.35, -85.41), 'MN': ('Minnesota', 46.28, -94.31),
+    'MS': ('Mississippi', 32.74, -89.67), 'MO': ('Missouri', 38.36, -92.46),
+    'MT': ('Montana', 47.05, -109.63), 'NE': ('Nebraska', 41.54, -99.80),
+    'NV': ('Nevada', 39.33, -116.63), 'NH': ('New Hampshire', 43.68, -71.58),
+    'NJ': ('New Jersey', 40.19, -74.67), 'NM': ('New Mexico', 34.41, -106.11),
+    'NY': ('New York', 42.95, -75.53), 'NC': ('North Carolina', 35.56, -79.39),
+    'ND': ('North Dakota', 47.45, -100.47), 'OH': ('Ohio', 40.29, -82.79),
+    'OK': ('Oklahoma', 35.59, -97.49), 'OR': ('Oregon', 43.93, -120.56),
+    'PA': ('Pennsylvania', 40.88, -77.80), 'RI': ('Rhode Island', 41.68, -71.56),
+    'SC': ('South Carolina', 33.92, -80.90), 'SD': ('South Dakota', 44.44, -100.23),
+    'TN': ('Tennessee', 35.86, -86.35), 'TX': ('Texas', 31.48, -99.33),
+    'UT': ('Utah', 39.31, -111.67), 'VT': ('Vermont', 44.07, -72.67),
+    'VA': ('Virginia', 37.52, -78.85), 'WA': ('Washington', 47.38, -120.45),
+    'WV': ('West Virginia', 38.64, -80.62), 'WI': ('Wisconsin', 44.62, -89.99),
+    'WY': ('Wyoming', 43.00, -107.55),
+}
+
+# Suffixes the Census gazetteer appends to place names
+PLACE_SUFFIXES = re.compile(r'\s+(city|town|village|borough|CDP|municipality|city and borough)$')
+
+
+def normalize_query(query):
+    """Canonical cache key: lowercase words, no punctuation, no trailing country
+
+    index.html applies the same rules, so both sides agree on keys.
+    """
+    key = re.sub(r'[^a-z0-9]+', ' ', query.lower()).strip()
+    return re.sub(r'\s+(usa|us|united states)$', '', key)
+
+
+class GeocodeError(Exception):
+    """A lookup that failed for now (network error, rate limit, server
+    error), as opposed to one that found nothing"""
+
+
+class StubBackend:
+    """Offline backend answering from a fixed {query: (lat, lon)} table"""
+
+    name = 'stub'
+
+    def __init__(self, table=None):
+        self.table = {normalize_query(q): coords for q, coords in (table or {}).items()}
+        self.calls = 0
+
+    def lookup(self, query):
+        self.calls += 1
+        return self.table.get(normalize_query(query))
+
+
+class NominatimBackend:
+    """OpenStreetMap Nominatim, throttled to its one-request-per-second policy"""
+
+    name = 'nominatim'
+
+    def __init__(self, min_interval=1.0, timeout=10):
+        import requests
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._last = 0.0
+
+    def lookup(self, query):
+        """(lat, lon), or None if nothing matches; raises GeocodeError if the request fails"""
+        wait = self._last + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last = time.monotonic()
+        try:
+            response = self.session.get(NOMINATIM_URL, timeout=self.timeout, params={
+                'q': f"{query}, USA", 'format': 'json', 'limit': 1,
+            })
+        except Exception as e:
+            raise GeocodeError(f"{type(e).__name__}: {e}") from e
+        # 429 is the rate limit; any other non-200 says nothing about the query either
+        if response.status_code != 200:
+            raise GeocodeError(f"HTTP {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise GeocodeError(f"unreadable response: {e}") from e
+        if data:
+            return float(data[0]['lat']), float(data[0]['lon'])
+        return None
+
+
+BACKENDS = {'stub': StubBackend, 'nominatim': NominatimBackend}
+
+
+class GeocodeCache:
+    """SQLite table of normalized query -> coordinates
+
+    Misses are cached too, but only for ``miss_days``, so a venue the
+    backend didn't know yet is tried again later.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, miss_days=DEFAULT_MISS_DAYS):
+        self.path = path
+        self.miss_days = miss_days
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " query TEXT PRIMARY KEY, lat REAL, lon REAL, backend TEXT, resolved_at TEXT)"
+        )
+
+    def get_many(self, keys):
+        """{key: (lat, lon) or None} for the keys that are cached (expired misses left out)"""
+        found = {}
+        keys = list(keys)
+        misses_since = (datetime.now() - timedelta(days=self.miss_days)).isoformat()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT query, lat, lon FROM geocode WHERE query IN ({','.join('?' * len(chunk))})"
+                " AND (lat IS NOT NULL OR resolved_at >= ?)", [*chunk, misses_since]
+            )
+            for query, lat, lon in rows:
+                found[query] = (lat, lon) if lat is not None else None
+        return found
+
+    def put_many(self, results, backend):
+        """Store {key: (lat, lon) or None}"""
+        now = datetime.now().isoformat()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+            [(key, *(coords or (None, None)), backend, now) for key, coords in results.items()],
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class Geocoder:
+    """Cache-first geocoder; call it with a query or use resolve_many for batches
+
+    ``limit`` caps how many backend lookups one run may make, so a large
+    backlog of new venues is spread over several runs. A failed lookup
+    (GeocodeError) is not cached and ends the batch, since the rest would
+    most likely fail the same way; those queries are tried again next run.
+    """
+
+    def __init__(self, backend, cache=None, limit=None):
+        self.backend = backend
+        self.cache = cache
+        self.limit = limit
+        self.lookups = 0
+        self.failures = 0
+
+    def __call__(self, query):
+        return self.resolve_many([query]).get(normalize_query(query))
+
+    def resolve_many(self, queries):
+        """{normalized query: (lat, lon) or None}
+
+        Queries left unresolved this run, over the limit or after a
+        failed lookup, are missing from the result.
+        """
+        keys = {normalize_query(q): q for q in queries if q and q.strip()}
+        results = self.cache.get_many(keys) if self.cache else {}
+
+        fresh = {}
+        for key, query in keys.items():
+            if key in results:
+                continue
+            if self.limit is not None and self.lookups >= self.limit:
+                break
+            self.lookups += 1
+            try:
+                fresh[key] = self.backend.lookup(query)
+            except GeocodeError as e:
+                self.failures += 1
+                print(f"⚠ Geocoding stopped after a failed {self.backend.name} lookup ({e}); "
+                      f"{len(keys) - len(results) - len(fresh)} queries left for the next run")
+                break
+
+        if fresh and self.cache:
+            self.cache.put_many(fresh, self.backend.name)
+        results.update(fresh)
+        return results
+
+
+def create_geocoder(backend='nominatim', cache_path=DEFAULT_CACHE_FILE, limit=None):
+    """Geocoder with the named backend and a persistent cache"""
+    return Geocoder(BACKENDS[backend](), GeocodeCache(cache_path), limit)
+
+
+def read_gazetteer(path):
+    """Rows of a Census Gazetteer file (tab separated, padded headers)"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        reader = csv.reader(f, delimiter='\t')
+        header = [h.strip() for h in next(reader)]
+        for row in reader:
+            yield dict(zip(header, (v.strip() for v in row)))
+
+
+def build_places(zcta_file=None, place_file=None, extra=None):
+    """Centroid tables: ({zip: [lat, lon]}, {normalized name: [lat, lon]})
+
+    Names cover states (full name and abbreviation), Census places as
+    "name" and "name st", and any extra {name: (lat, lon)} locations. When
+    a bare place name is shared by several states, the largest by land
+    area wins.
+    """
+    zips = {}
+    names = {}
+    sizes = {}
+
+    def add(name, lat, lon, size=0):
+        key = normalize_query(name)
+        if key and size >= sizes.get(key, 0):
+            names[key] = [round(lat, 4), round(lon, 4)]
+            sizes[key] = size
+
+    for abbr, (state, lat, lon) in STATE_CENTROIDS.items():
+        add(state, lat, lon, float('inf'))
+        add(abbr, lat, lon, float('inf'))
+
+    for name, (lat, lon) in (extra or {}).items():
+        add(name, lat, lon)
+
+    if place_file:
+        for row in read_gazetteer(place_file):
+            name = PLACE_SUFFIXES.sub('', row['NAME'])
+            lat, lon = float(row['INTPTLAT']), float(row['INTPTLONG'])
+            size = float(row.get('ALAND') or 0)
+            add(f"{name} {row['USPS']}", lat, lon, size)
+            add(name, lat, lon, size)
+
+    if zcta_file:
+        for row in read_gazetteer(zcta_file):
+            zips[row['GEOID']] = [round(float(row['INTPTLAT']), 4), round(float(row['INTPTLONG']), 4)]
+
+    return zips, names
+
+
+def publish_places(zips, names, output_dir=DEFAULT_PLACES_DIR):
+    """Write names.json and one zip<first digit>.json per ZIP prefix"""
+    os.makedirs(output_dir, exist_ok=True)
+    compact = {'separators': (',', ':'), 'sort_keys': True}
+    write_json_atomic(os.path.join(output_dir, 'names.json'), names, **compact)
+    for digit in '0123456789':
+        shard = {z: coords for z, coords in zips.items() if z.startswith(digit)}
+        if shard:
+            write_json_atomic(os.path.join(output_dir, f"zip{digit}.json"), shard, **compact)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Geocode cache and centroid tables")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_FILE, help=f"cache file (default: {DEFAULT_CACHE_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    lookup = sub.add_parser('lookup', help="resolve queries through the cache")
+    lookup.add_argument('queries', nargs='+')
+    lookup.add_argument('--backend', choices=sorted(BACKENDS), default='nominatim')
+
+    places = sub.add_parser('places', help="publish ZIP / city / state centroid tables")
+    places.add_argument('--zcta', metavar='FILE', help="Census Gazetteer ZCTA file (e.g. 2020_Gaz_zcta_national.txt)")
+    places.add_argument('--place', metavar='FILE', help="Census Gazetteer places file (e.g. 2020_Gaz_place_national.txt)")
+    places.add_argument('--output-dir', default=DEFAULT_PLACES_DIR,
+                        help=f"where to write the tables (default: {DEFAULT_PLACES_DIR})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a geocoding command"""
+    args = parse_args(argv)
+
+    if args.command == 'lookup':
+        geocoder = create_geocoder(args.backend, args.cache)
+        for key, coords in geocoder.resolve_many(args.queries).items():
+            print(f"{key}: {coords if coords else 'not found'}")
+        print(f"({geocoder.lookups} backend lookups, {geocoder.failures} failed)")
+        return
+
+    from locations import SEARCH_LOCATIONS
+    extra = {loc['city']: (loc['lat'], loc['lon']) for loc in SEARCH_LOCATIONS}
+    zips, names = build_places(args.zcta, args.place, extra)
+    publish_places(zips, names, args.output_dir)
+    print(f"✓ Published {len(names)} names and {len(zips)} ZIP codes to {args.output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Event History
+Indexed SQLite store of every event ever published, with first/last seen
+times, so date range, region and event type queries and weekly trends
+don't need the git history of events.json
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+
+from geo import GEOHASH_ALPHABET, geohash_encode
+
+DEFAULT_HISTORY_FILE = 'events_history.sqlite'
+
+# Stored geohash length (~4.9 km); regions are queried by any shorter prefix
+GEOHASH_PRECISION = 5
+
+# "..., Austin, TX 78701" -> TX
+_STATE = re.compile(r'\b([A-Z]{2})\s+\d{5}(?:-\d{4})?\b')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    event_type TEXT,
+    start TEXT,
+    day TEXT,
+    week TEXT,
+    end TEXT,
+    venue TEXT,
+    address TEXT,
+    state TEXT,
+    search_city TEXT,
+    lat REAL,
+    lon REAL,
+    geohash TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_day ON events (day);
+CREATE INDEX IF NOT EXISTS events_week ON events (week, state, event_type);
+CREATE INDEX IF NOT EXISTS events_state_day ON events (state, day);
+CREATE INDEX IF NOT EXISTS events_geohash_day ON events (geohash, day);
+CREATE INDEX IF NOT EXISTS events_type_day ON events (event_type, day);
+CREATE INDEX IF NOT EXISTS events_last_seen ON events (last_seen);
+CREATE TABLE IF NOT EXISTS runs (
+    run_at TEXT PRIMARY KEY,
+    total_events INTEGER,
+    new_events INTEGER
+);
+"""
+
+# Trend groupings: name -> SQL expression
+GROUPS = {
+    'state': "coalesce(state, '?')",
+    'city': "coalesce(search_city, '?')",
+    'type': "coalesce(nullif(event_type, ''), '?')",
+    'region': "coalesce(substr(geohash, 1, 2), '?')",
+}
+
+
+def event_state(event):
+    """Two-letter state from the event's address, or None"""
+    match = _STATE.search(event.get('address') or '')
+    return match.group(1) if match else None
+
+
+def week_of(day):
+    """Monday of the ISO week of a YYYY-MM-DD day"""
+    day = date.fromisoformat(day)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def event_row(event, seen):
+    """events table row of a normalized event dict"""
+    lat, lon = event.get('venue_lat'), event.get('venue_lon')
+    if lat is None or lon is None:
+        lat, lon = event.get('search_lat'), event.get('search_lon')
+    start = event.get('start')
+    day = start[:10] if start else None
+    return (
+        event['id'],
+        event.get('title', ''),
+        event.get('event_type', ''),
+        start,
+        day,
+        week_of(day) if day else None,
+        event.get('end'),
+        event.get('location', ''),
+        event.get('address', ''),
+        event_state(event),
+        event.get('search_city', ''),
+        lat,
+        lon,
+        geohash_encode(lat, lon, GEOHASH_PRECISION) if lat is not None and lon is not None else None,
+        seen,
+        seen,
+        json.dumps(event, sort_keys=True),
+    )
+
+
+def _prefix_range(prefix):
+    """[low, high) bounds matching every geohash that starts with prefix"""
+    return prefix, prefix + GEOHASH_ALPHABET[-1] * (GEOHASH_PRECISION - len(prefix) + 1)
+
+
+class EventHistory:
+    """SQLite history of published events
+
+    ``record`` upserts one run's events: new ids get first_seen, known ids
+    move last_seen forward and take the latest details. Queries filter by
+    event day, state, geohash prefix and event type through the indexes.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def record(self, events, run_at=None):
+        """Add one run's events; returns how many ids were new"""
+        run_at = run_at or datetime.now().isoformat()
+        rows = [event_row(event, event.get('last_seen') or run_at) for event in events]
+        with self.db:
+            before = self.db.execute("SELECT count(*) FROM events").fetchone()[0]
+            self.db.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET"
+                " title = excluded.title, event_type = excluded.event_type, start = excluded.start,"
+                " day = excluded.day, week = excluded.week, end = excluded.end, venue = excluded.venue, address = excluded.address,"
+                " state = excluded.state, search_city = excluded.search_city, lat = excluded.lat,"
+                " lon = excluded.lon, geohash = excluded.geohash, data = excluded.data,"
+                " first_seen = min(first_seen, excluded.first_seen),"
+                " last_seen = max(last_seen, excluded.last_seen)",
+                rows,
+            )
+            added = self.db.execute("SELECT count(*) FROM events").fetchone()[0] - before
+            self.db.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?)", (run_at, len(rows), added))
+        return added
+
+    def _where(self, start=None, end=None, state=None, geohash=None, event_type=None):
+        """SQL condition and parameters for the common filters"""
+        clauses, params = [], []
+        if start:
+            clauses.append("day >= ?")
+            params.append(str(start))
+        if end:
+            clauses.append("day <= ?")
+            params.append(str(end))
+        if state:
+            clauses.append("state = ?")
+            params.append(state.upper())
+        if geohash:
+            clauses.append("geohash >= ? AND geohash < ?")
+            params.extend(_prefix_range(geohash.lower()))
+        if event_type:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, start=None, end=None, state=None, geohash=None, event_type=None, limit=None):
+        """Events (dicts with first_seen/last_seen) held between start and end, by day"""
+        where, params = self._where(start, end, state, geohash, event_type)
+        sql = f"SELECT data, first_seen, last_seen FROM events{where} ORDER BY day, start, title"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        events = []
+        for row in self.db.execute(sql, params):
+            event = json.loads(row['data'])
+            event['first_seen'] = row['first_seen']
+            event['last_seen'] = row['last_seen']
+            events.append(event)
+        return events
+
+    def weekly_counts(self, by='state', start=None, end=None, state=None, geohash=None, event_type=None):
+        """[(week, group, events)] with week as the Monday of each ISO week"""
+        where, params = self._where(start, end, state, geohash, event_type)
+        where = f"{where} AND week IS NOT NULL" if where else " WHERE week IS NOT NULL"
+        sql = (
+            f"SELECT week, {GROUPS[by]} AS grp, count(*) AS events"
+            f" FROM events{where} GROUP BY week, grp ORDER BY week, grp"
+        )
+        return [tuple(row) for row in self.db.execute(sql, params)]
+
+    def runs(self, limit=10):
+        """Most recent runs, newest first"""
+        return [dict(row) for row in
+                self.db.execute("SELECT * FROM runs ORDER BY run_at DESC LIMIT ?", (limit,))]
+
+    def close(self):
+        self.db.close()
+
+
+def record_run(events, path=DEFAULT_HISTORY_FILE, run_at=None):
+    """Append one run's events to the history at path; returns the new id count"""
+    history = EventHistory(path)
+    try:
+        return history.record(events, run_at)
+    finally:
+        history.close()
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Query the historical event store")
+    parser.add_argument('--db', default=DEFAULT_HISTORY_FILE, help=f"history database (default: {DEFAULT_HISTORY_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    imp = sub.add_parser('import', help="add events.json snapshots, oldest first")
+    imp.add_argument('paths', nargs='+')
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument('--from', dest='start', metavar='YYYY-MM-DD', help="first event day")
+    filters.add_argument('--to', dest='end', metavar='YYYY-MM-DD', help="last event day")
+    filters.add_argument('--state', help="two-letter state, e.g. TX")
+    filters.add_argument('--geohash', help="geohash prefix of the region, e.g. 9v")
+    filters.add_argument('--type', dest='event_type', help="event type, e.g. 'League Cup'")
+
+    query = sub.add_parser('query', parents=[filters], help="list matching events")
+    query.add_argument('--limit', type=int, default=50)
+    query.add_argument('--json', action='store_true', help="print events as JSON")
+
+    trends = sub.add_parser('trends', parents=[filters], help="events per week per group")
+    trends.add_argument('--by', choices=sorted(GROUPS), default='state')
+
+    sub.add_parser('runs', help="show recent runs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a history command"""
+    args = parse_args(argv)
+    history = EventHistory(args.db)
+    try:
+        if args.command == 'import':
+            for path in args.paths:
+                with open(path) as f:
+                    dataset = json.load(f)
+                added = history.record(dataset.get('events', []), dataset.get('last_updated'))
+                print(f"✓ {path}: {len(dataset.get('events', []))} events, {added} new")
+        elif args.command == 'query':
+            events = history.query(args.start, args.end, args.state, args.geohash, args.event_type, args.limit)
+            if args.json:
+                print(json.dumps(events, indent=2))
+            for event in [] if args.json else events:
+                print(f"{event.get('start') or '?':<17} {event.get('event_type', ''):<22} "
+                      f"{event.get('title', '')[:40]:<40} {event.get('location', '')[:30]}")
+        elif args.command == 'trends':
+            for week, group, count in history.weekly_counts(args.by, args.start, args.end, args.state,
+                                                            args.geohash, args.event_type):
+                print(f"{week}  {group:<24} {count}")
+        else:
+            for run in history.runs():
+                print(f"{run['run_at']}  {run['total_events']} events, {run['new_events']} new")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Pokemon Events Scraper - HTTP API Backend
+Fetches event lists from JSON API endpoints with plain HTTP requests
+Note: May not work if site has strict bot protection
+"""
+
+import time
+
+import metrics
+from backends import Backend
+from event_model import build_event
+from fetch_engine import FetchEngine
+from network_capture import extract_payload_events, find_event_items
+
+API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Referer': 'https://events.pokemon.com/'
+}
+
+# Potential API endpoints, formatted with lat/lon
+API_ENDPOINTS = [
+    "https://events.pokemon.com/api/events?latitude={lat}&longitude={lon}&range=100",
+    "https://events.pokemon.com/api/v1/events?lat={lat}&lng={lon}&radius=100",
+    "https://events.pokemon.com/EventLocator/api/search?lat={lat}&lon={lon}&range=100",
+]
+
+
+def parse_api_response(data, city, lat, lon):
+    """Events from a decoded API response"""
+    items = find_event_items(data) or []
+    return [build_event(fields, city, lat, lon) for fields in extract_payload_events(items)]
+
+
+class HttpApiBackend(Backend):
+    """Concurrent requests-based backend
+
+    ``workers`` requests are kept in flight, with ``min_interval`` seconds
+    between request starts to the same host. The candidate endpoints are
+    probed once and the first that answers is used for every location.
+    Responses cached today in ``cache`` (a PageCache) aren't fetched again.
+    """
+
+    def __init__(self, workers=8, min_interval=0.2, endpoints=API_ENDPOINTS, headers=API_HEADERS, timeout=10,
+                 cache=None):
+        self.engine = FetchEngine(endpoints, headers=headers, concurrency=max(1, workers),
+                                  min_interval=min_interval, timeout=timeout, cache=cache)
+
+    def run(self, locations, handle):
+        started = time.monotonic()
+        results = self.engine.run(locations)
+
+        for i, (location, data) in enumerate(results):
+            city = location['city']
+            events = []
+            if data is not None:
+                with metrics.span('parse', city):
+                    events = parse_api_response(data, city, location['lat'], location['lon'])
+            print(f"[{i+1}/{len(results)}] {city}: {len(events)} events" if events
+                  else f"[{i+1}/{len(results)}] {city}: no events")
+            handle(location, events)
+
+        print(f"\nFetched {len(results)} locations in {time.monotonic() - started:.1f}s")
+        if locations and self.engine.working_endpoint is None:
+            print("\n⚠ Could not find working API endpoint")
+            print("This backend requires an accessible API.")
+            print("Please use a Selenium backend instead (--backend selenium-headless).")
+
+    def close(self):
+        self.engine.close()
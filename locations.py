@@ -0,0 +1,127 @@
+"""
+Pokemon Events Scraper - Search Locations
+Built-in search location lists shared by every scraper backend, and the
+split of a list into shards for parallel runs
+"""
+
+import json
+
+from scrape_state import location_key
+
+# Full US coverage - 65 locations
+SEARCH_LOCATIONS = [
+    {"city": "Seattle", "lat": 47.6062, "lon": -122.3321},
+    {"city": "Portland", "lat": 45.5152, "lon": -122.6784},
+    {"city": "San Francisco", "lat": 37.7749, "lon": -122.4194},
+    {"city": "Los Angeles", "lat": 34.0522, "lon": -118.2437},
+    {"city": "San Diego", "lat": 32.7157, "lon": -117.1611},
+    {"city": "Sacramento", "lat": 38.5816, "lon": -121.4944},
+    {"city": "Fresno", "lat": 36.7378, "lon": -119.7871},
+    {"city": "Las Vegas", "lat": 36.1699, "lon": -115.1398},
+    {"city": "Phoenix", "lat": 33.4484, "lon": -112.0740},
+    {"city": "Tucson", "lat": 32.2226, "lon": -110.9747},
+    {"city": "Albuquerque", "lat": 35.0844, "lon": -106.6504},
+    {"city": "Denver", "lat": 39.7392, "lon": -104.9903},
+    {"city": "Salt Lake City", "lat": 40.7608, "lon": -111.8910},
+    {"city": "Boise", "lat": 43.6150, "lon": -116.2023},
+    {"city": "El Paso", "lat": 31.7619, "lon": -106.4850},
+    {"city": "San Antonio", "lat": 29.4241, "lon": -98.4936},
+    {"city": "Austin", "lat": 30.2672, "lon": -97.7431},
+    {"city": "Dallas", "lat": 32.7767, "lon": -96.7970},
+    {"city": "Houston", "lat": 29.7604, "lon": -95.3698},
+    {"city": "Oklahoma City", "lat": 35.4676, "lon": -97.5164},
+    {"city": "Tulsa", "lat": 36.1540, "lon": -95.9928},
+    {"city": "Kansas City", "lat": 39.0997, "lon": -94.5786},
+    {"city": "Omaha", "lat": 41.2565, "lon": -95.9345},
+    {"city": "Minneapolis", "lat": 44.9778, "lon": -93.2650},
+    {"city": "Milwaukee", "lat": 43.0389, "lon": -87.9065},
+    {"city": "Chicago", "lat": 41.8781, "lon": -87.6298},
+    {"city": "St. Louis", "lat": 38.6270, "lon": -90.1994},
+    {"city": "Indianapolis", "lat": 39.7684, "lon": -86.1581},
+    {"city": "Detroit", "lat": 42.3314, "lon": -83.0458},
+    {"city": "Cleveland", "lat": 41.4993, "lon": -81.6944},
+    {"city": "Cincinnati", "lat": 39.1031, "lon": -84.5120},
+    {"city": "Columbus", "lat": 39.9612, "lon": -82.9988},
+    {"city": "Memphis", "lat": 35.1495, "lon": -90.0490},
+    {"city": "Nashville", "lat": 36.1627, "lon": -86.7816},
+    {"city": "Birmingham", "lat": 33.5186, "lon": -86.8104},
+    {"city": "Atlanta", "lat": 33.7490, "lon": -84.3880},
+    {"city": "Jacksonville", "lat": 30.3322, "lon": -81.6557},
+    {"city": "Orlando", "lat": 28.5383, "lon": -81.3792},
+    {"city": "Tampa", "lat": 27.9506, "lon": -82.4572},
+    {"city": "Miami", "lat": 25.7617, "lon": -80.1918},
+    {"city": "New Orleans", "lat": 29.9511, "lon": -90.0715},
+    {"city": "Charlotte", "lat": 35.2271, "lon": -80.8431},
+    {"city": "Raleigh", "lat": 35.7796, "lon": -78.6382},
+    {"city": "Richmond", "lat": 37.5407, "lon": -77.4360},
+    {"city": "Washington DC", "lat": 38.9072, "lon": -77.0369},
+    {"city": "Baltimore", "lat": 39.2904, "lon": -76.6122},
+    {"city": "Philadelphia", "lat": 39.9526, "lon": -75.1652},
+    {"city": "New York", "lat": 40.7128, "lon": -74.0060},
+    {"city": "Newark", "lat": 40.7357, "lon": -74.1724},
+    {"city": "Boston", "lat": 42.3601, "lon": -71.0589},
+    {"city": "Buffalo", "lat": 42.8864, "lon": -78.8784},
+    {"city": "Pittsburgh", "lat": 40.4406, "lon": -79.9959},
+    {"city": "Spokane", "lat": 47.6588, "lon": -117.4260},
+    {"city": "Billings", "lat": 45.7833, "lon": -108.5007},
+    {"city": "Fargo", "lat": 46.8772, "lon": -96.7898},
+    {"city": "Des Moines", "lat": 41.5868, "lon": -93.6250},
+    {"city": "Little Rock", "lat": 34.7465, "lon": -92.2896},
+    {"city": "Jackson", "lat": 32.2988, "lon": -90.1848},
+    {"city": "Louisville", "lat": 38.2527, "lon": -85.7585},
+    {"city": "Charleston", "lat": 32.7765, "lon": -79.9311},
+    {"city": "Columbia", "lat": 34.0007, "lon": -81.0348},
+    {"city": "Providence", "lat": 41.8240, "lon": -71.4128},
+    {"city": "Hartford", "lat": 41.7658, "lon": -72.6734},
+    {"city": "Anchorage", "lat": 61.2181, "lon": -149.9003},
+    {"city": "Honolulu", "lat": 21.3099, "lon": -157.8581},
+]
+
+# Reduced location set for faster runs - covers major regions
+MAJOR_LOCATIONS = [
+    {"city": "Seattle", "lat": 47.6062, "lon": -122.3321},
+    {"city": "Los Angeles", "lat": 34.0522, "lon": -118.2437},
+    {"city": "Phoenix", "lat": 33.4484, "lon": -112.0740},
+    {"city": "Denver", "lat": 39.7392, "lon": -104.9903},
+    {"city": "Dallas", "lat": 32.7767, "lon": -96.7970},
+    {"city": "Houston", "lat": 29.7604, "lon": -95.3698},
+    {"city": "Chicago", "lat": 41.8781, "lon": -87.6298},
+    {"city": "Atlanta", "lat": 33.7490, "lon": -84.3880},
+    {"city": "Miami", "lat": 25.7617, "lon": -80.1918},
+    {"city": "New York", "lat": 40.7128, "lon": -74.0060},
+    {"city": "Boston", "lat": 42.3601, "lon": -71.0589},
+    {"city": "Washington DC", "lat": 38.9072, "lon": -77.0369},
+]
+
+LOCATION_SETS = {
+    'full': SEARCH_LOCATIONS,
+    'major': MAJOR_LOCATIONS,
+}
+
+
+def load_locations(source):
+    """Location list from a built-in set name ('full', 'major') or a JSON file"""
+    if source in LOCATION_SETS:
+        return list(LOCATION_SETS[source])
+    with open(source) as f:
+        return json.load(f)
+
+
+def parse_shard(spec):
+    """(index, count) from a 1-based 'i/N' shard spec"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, e.g. 2/4, not {spec!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {spec} is out of range; i runs from 1 to N")
+    return index, count
+
+
+def shard_locations(locations, index, count):
+    """Shard index of count: disjoint, near-equal slices of locations
+
+    Locations are dealt round-robin in coordinate order, so the split
+    doesn't depend on the order of the list and every shard spans the map.
+    """
+    return sorted(locations, key=location_key)[index - 1::count]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Shard Merge
+Combines the partial results of a sharded scrape into events.json, then
+updates the change feed, the scrape state and the history once for all
+shards. The same partials always produce the same events.json.
+"""
+
+import argparse
+import glob
+import json
+import os
+
+from changes import DEFAULT_FEED_FILE, has_changes, publish_if_changed, summary
+from dedupe import dedupe_events
+from event_model import normalize_events
+from history import DEFAULT_HISTORY_FILE, record_run
+from pipeline import DEFAULT_OUTPUT_FILE, DEFAULT_PARTIAL_DIR, PARTIAL_VERSION
+from scrape_state import ScrapeState, DEFAULT_STATE_FILE
+
+
+def load_partials(paths, shards=None):
+    """Partial results ordered by shard, checked to be one complete split
+
+    Raises ValueError if the files come from different splits, repeat a
+    shard or leave one out (e.g. a shard that found nothing and wrote no
+    partial), since merging them would drop that shard's events.
+    """
+    partials = []
+    for path in paths:
+        with open(path) as f:
+            partial = json.load(f)
+        if partial.get('version') != PARTIAL_VERSION or 'shard' not in partial:
+            raise ValueError(f"{path} is not a version {PARTIAL_VERSION} partial result")
+        partials.append(partial)
+    if not partials:
+        raise ValueError("no partial results to merge")
+
+    counts = {partial['shard'][1] for partial in partials}
+    if len(counts) > 1:
+        raise ValueError(f"partials come from different splits (N = {', '.join(map(str, sorted(counts)))})")
+    count = shards or counts.pop()
+    found = sorted(partial['shard'][0] for partial in partials)
+    if found != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(found))
+        extra = len(found) - len(set(found))
+        problem = f"missing shards {', '.join(map(str, missing))}" if missing else f"{extra} repeated shards"
+        raise ValueError(f"need one partial for each of {count} shards: {problem}")
+    return sorted(partials, key=lambda partial: partial['shard'][0])
+
+
+def merge_partials(partials):
+    """The events.json dataset for a complete, shard-ordered set of partials
+
+    Shards overlap at their edges, so the same event can come back from
+    several of them. Identical ids are joined first and near-duplicates
+    across shards after that, keeping the latest last_seen and every
+    source. Events are put in id order before merging, so the result
+    doesn't depend on the order each shard's pages happened to finish.
+    """
+    found = sorted((event for partial in partials for event in partial['events']), key=lambda e: e['id'])
+    events_list = dedupe_events(normalize_events(found))
+    return {
+        'last_updated': max(partial['last_updated'] for partial in partials),
+        'total_events': len(events_list),
+        'locations_scraped': sum(partial['locations_scraped'] for partial in partials),
+        'locations_reused': sum(partial['locations_reused'] for partial in partials),
+        'successful_scrapes': sum(partial['successful_scrapes'] for partial in partials),
+        'shards': len(partials),
+        'events': events_list,
+    }
+
+
+def merge(paths, output=DEFAULT_OUTPUT_FILE, state_path=DEFAULT_STATE_FILE, history=DEFAULT_HISTORY_FILE,
+          feed=DEFAULT_FEED_FILE, shards=None):
+    """Merge partial result files and publish them like a single run
+
+    Returns a summary dict in the same shape as pipeline.run_scrape.
+    """
+    partials = load_partials(paths, shards)
+    result = merge_partials(partials)
+    found = sum(len(partial['events']) for partial in partials)
+
+    changes = publish_if_changed(None, output, result, feed)
+
+    state = ScrapeState(state_path)
+    for partial in partials:
+        state.locations.update(partial['state'])
+    state.save()
+
+    new_events = record_run(result['events'], history, result['last_updated']) if history else None
+
+    print("=" * 60)
+    print(f"✓ MERGED {len(partials)} SHARDS")
+    print("=" * 60)
+    print(f"Locations scraped: {result['successful_scrapes']}/{result['locations_scraped']}")
+    print(f"Locations reused: {result['locations_reused']}")
+    print(f"Unique events: {result['total_events']} ({found - result['total_events']} duplicates across shards)")
+    print(f"Changes: {summary(changes)}")
+    if new_events is not None:
+        print(f"History: {new_events} events seen for the first time ({history})")
+    if has_changes(changes):
+        print(f"Data saved to: {output} (delta in {feed})")
+    else:
+        print(f"No event changes - {output} left as is")
+    print("=" * 60, flush=True)
+
+    return {'changes': changes, 'duplicates': found - result['total_events'], 'new_events': new_events, **result}
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Combine sharded scrape results into events.json")
+    parser.add_argument('partials', nargs='*', metavar='PARTIAL',
+                        help=f"partial result files (default: every {DEFAULT_PARTIAL_DIR}/shard-*.json)")
+    parser.add_argument('--shards', type=int,
+                        help="number of shards the run was split into (default: the N recorded in the partials)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE,
+                        help=f"where to publish the events (default: {DEFAULT_OUTPUT_FILE})")
+    parser.add_argument('--feed', default=DEFAULT_FEED_FILE,
+                        help=f"change feed updated when the events change (default: {DEFAULT_FEED_FILE})")
+    parser.add_argument('--state', default=DEFAULT_STATE_FILE,
+                        help=f"per-location freshness state file (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_FILE, metavar='PATH',
+                        help=f"SQLite event history to add this run to, '' to skip (default: {DEFAULT_HISTORY_FILE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Merge the partials named on the command line"""
+    args = parse_args(argv)
+    paths = args.partials or sorted(glob.glob(os.path.join(DEFAULT_PARTIAL_DIR, 'shard-*.json')))
+    try:
+        return merge(paths, output=args.output, state_path=args.state, history=args.history, feed=args.feed,
+                     shards=args.shards)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"✗ Not merged, {args.output} left as is: {e}")
+
+
+if __name__ == "__main__":
+    main()
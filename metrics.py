@@ -0,0 +1,158 @@
+"""
+Pokemon Events Scraper - Metrics
+Per-stage timings and counters for a scrape run, exported as a JSON run
+report or in the Prometheus text format
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from event_sink import write_json_atomic
+
+METRIC_PREFIX = 'scraper'
+
+
+def _quantile(ordered, q):
+    """q-quantile (0-1) of a sorted list, nearest rank"""
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def _labels(labels):
+    """Prometheus label set, e.g. {stage="page_load"}"""
+    if not labels:
+        return ''
+    escaped = (
+        f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of stage timings and counters
+
+    ``span(stage, location)`` times a block; timings are kept per stage
+    and, when a location is given, summed per location so a slow city can
+    be traced to the stage that made it slow. ``count(name, **labels)``
+    bumps a counter such as blocked pages or selector hits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.started = time.time()
+            self.timings = {}
+            self.locations = {}
+            self.counters = {}
+
+    @contextmanager
+    def span(self, stage, location=None):
+        """Time the enclosed block as one sample of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, location)
+
+    def observe(self, stage, seconds, location=None):
+        """Record one timing sample"""
+        with self._lock:
+            self.timings.setdefault(stage, []).append(seconds)
+            if location is not None:
+                stages = self.locations.setdefault(location, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def count(self, name, value=1, **labels):
+        """Add value to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def stage_stats(self):
+        """{stage: {count, total, mean, p50, p95, max}} in seconds"""
+        with self._lock:
+            timings = {stage: sorted(samples) for stage, samples in self.timings.items()}
+        return {
+            stage: {
+                'count': len(samples),
+                'total': round(sum(samples), 4),
+                'mean': round(sum(samples) / len(samples), 4),
+                'p50': round(_quantile(samples, 0.5), 4),
+                'p95': round(_quantile(samples, 0.95), 4),
+                'max': round(samples[-1], 4),
+            }
+            for stage, samples in sorted(timings.items())
+        }
+
+    def report(self):
+        """JSON-serializable run report"""
+        stages = self.stage_stats()
+        with self._lock:
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                if labels:
+                    counters.setdefault(name, {})[','.join(f"{k}={v}" for k, v in labels)] = value
+                else:
+                    counters[name] = value
+            locations = {
+                city: {stage: round(seconds, 4) for stage, seconds in sorted(stages_.items())}
+                for city, stages_ in sorted(self.locations.items())
+            }
+            started = self.started
+        return {
+            'started_at': datetime.fromtimestamp(started).isoformat(),
+            'duration': round(time.time() - started, 3),
+            'stages': stages,
+            'counters': counters,
+            'locations': locations,
+        }
+
+    def prometheus(self, prefix=METRIC_PREFIX):
+        """Run metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_run_seconds Wall time of the run so far",
+            f"# TYPE {prefix}_run_seconds gauge",
+            f"{prefix}_run_seconds {time.time() - self.started:.3f}",
+            f"# HELP {prefix}_stage_seconds Time spent per scrape stage",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, stats in self.stage_stats().items():
+            for q in ('0.5', '0.95'):
+                value = stats['p50'] if q == '0.5' else stats['p95']
+                lines.append(f"{prefix}_stage_seconds{_labels([('stage', stage), ('quantile', q)])} {value}")
+            lines.append(f"{prefix}_stage_seconds_sum{_labels([('stage', stage)])} {stats['total']}")
+            lines.append(f"{prefix}_stage_seconds_count{_labels([('stage', stage)])} {stats['count']}")
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+        seen = set()
+        for (name, labels), value in counters:
+            metric = f"{prefix}_{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Save to path: Prometheus text for .prom/.txt, else a JSON report"""
+        if path.endswith(('.prom', '.txt')):
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w') as f:
+                f.write(self.prometheus())
+            os.replace(tmp, path)
+        else:
+            write_json_atomic(path, self.report(), indent=2)
+
+
+# Shared registry for the whole process
+METRICS = Metrics()
+span = METRICS.span
+count = METRICS.count
@@ -0,0 +1,152 @@
+"""
+Pokemon Events Scraper - Network Capture
+Reads the event locator's JSON responses from Chrome's performance log
+instead of scraping the rendered page
+"""
+
+import json
+import time
+
+# Keys that commonly wrap a list of results in a JSON payload
+LIST_KEYS = ('events', 'results', 'data', 'items', 'eventList')
+
+TITLE_KEYS = ('name', 'title', 'eventName')
+DATE_KEYS = ('date', 'start_date', 'startDate', 'startDateTime', 'start')
+VENUE_KEYS = ('venue', 'location', 'venueName', 'storeName', 'store')
+ADDRESS_KEYS = ('address', 'address1', 'streetAddress', 'street')
+TYPE_KEYS = ('type', 'event_type', 'eventType', 'category')
+
+
+def enable_network_logging(chrome_options):
+    """Turn on Chrome performance logging so network events can be read back"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def clear_network_log(driver):
+    """Drain buffered log entries so earlier pages are not picked up"""
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+
+def _first(item, keys, default=''):
+    """Return the first non-empty value for any of keys"""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def _looks_like_events(items):
+    """True if items is a non-empty list of dicts with a title-like key"""
+    return (
+        isinstance(items, list) and items
+        and all(isinstance(item, dict) for item in items)
+        and any(key in items[0] for key in TITLE_KEYS)
+    )
+
+
+def find_event_items(payload, depth=0):
+    """Locate the list of event records inside a JSON payload, or None"""
+    if _looks_like_events(payload):
+        return payload
+    if isinstance(payload, dict) and depth < 3:
+        for key in LIST_KEYS:
+            if payload.get(key) == []:
+                return []
+            if key in payload:
+                found = find_event_items(payload[key], depth + 1)
+                if found is not None:
+                    return found
+        for value in payload.values():
+            if isinstance(value, (dict, list)):
+                found = find_event_items(value, depth + 1)
+                if found is not None:
+                    return found
+    return None
+
+
+def extract_payload_events(items):
+    """Map raw event records to the scraper's event fields"""
+    events = []
+    for item in items:
+        venue = _first(item, VENUE_KEYS)
+        address = _first(item, ADDRESS_KEYS)
+        if isinstance(venue, dict):
+            address = address or _first(venue, ADDRESS_KEYS)
+            venue = _first(venue, TITLE_KEYS)
+        if isinstance(address, dict):
+            address = ', '.join(str(v) for v in address.values() if v)
+
+        event = {
+            'title': str(_first(item, TITLE_KEYS, 'Unknown Event')),
+            'date': str(_first(item, DATE_KEYS, 'Date TBA')),
+            'location': str(venue),
+            'address': str(address),
+            'description': str(item.get('description', '')),
+            'event_type': str(_first(item, TYPE_KEYS)),
+        }
+
+        lat = _first(item, ('latitude', 'lat'), None)
+        lon = _first(item, ('longitude', 'lon', 'lng'), None)
+        if lat is not None and lon is not None:
+            try:
+                event['venue_lat'] = float(lat)
+                event['venue_lon'] = float(lon)
+            except (TypeError, ValueError):
+                pass
+
+        events.append(event)
+    return events
+
+
+def _is_candidate(response):
+    """True for successful JSON responses from the event locator"""
+    return (
+        'pokemon.com' in response.get('url', '')
+        and 'json' in response.get('mimeType', '').lower()
+        and response.get('status') == 200
+    )
+
+
+def wait_for_event_payload(driver, timeout=10, poll=0.2):
+    """Poll the performance log until an event list JSON response has loaded
+
+    Returns the list of raw event records, or None if nothing matching
+    arrived within timeout seconds.
+    """
+    pending = set()
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        for entry in driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                if _is_candidate(params.get('response', {})):
+                    pending.add(params.get('requestId'))
+
+            elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+                request_id = params['requestId']
+                pending.discard(request_id)
+                try:
+                    body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                    payload = json.loads(body.get('body', ''))
+                except Exception:
+                    continue
+
+                items = find_event_items(payload)
+                if items is not None:
+                    return items
+
+        time.sleep(poll)
+
+    return None
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Page Cache
+On-disk cache of fetched pages, extracted event cards and API payloads,
+so a retried run or a change to the parsers doesn't load every page again.
+Bodies are stored once per distinct content; a SQLite index maps each
+(kind, URL, day) to its body with a time-to-live and least-recently-used
+eviction when the cache grows past its size limit.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import metrics
+
+DEFAULT_CACHE_DIR = 'page_cache'
+DEFAULT_TTL_HOURS = 12
+DEFAULT_MAX_MB = 256
+
+# Kinds of entry; text is stored as is, the rest as JSON
+TEXT_KINDS = {'page'}
+
+
+class PageCache:
+    """Content-addressed blobs under ``directory`` with an SQLite index
+
+    Entries are keyed by the day they were fetched as well as the URL, so
+    nothing from an earlier day is reused even when the URL carries no
+    date, and entries older than ``ttl_hours`` are never returned. When
+    the blobs take more than ``max_mb`` the least recently used entries
+    are dropped until they fit again. Safe to share between threads, and between
+    processes through SQLite's own locking.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl_hours=DEFAULT_TTL_HOURS, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        os.makedirs(os.path.join(directory, 'blobs'), exist_ok=True)
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), timeout=30, check_same_thread=False)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT, url TEXT, day TEXT, digest TEXT, size INTEGER, fetched_at TEXT, used_at TEXT,"
+            " PRIMARY KEY (kind, url, day));"
+            "CREATE INDEX IF NOT EXISTS entries_used ON entries (used_at);"
+            "CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);"
+        )
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, 'blobs', digest[:2], f"{digest}.gz")
+
+    def get(self, url, kind='page'):
+        """Body cached for url today, or None if missing or older than the TTL"""
+        now = datetime.now()
+        with self._lock:
+            row = self.db.execute(
+                "SELECT digest FROM entries WHERE kind = ? AND url = ? AND day = ? AND fetched_at >= ?",
+                (kind, url, now.date().isoformat(), (now - self.ttl).isoformat()),
+            ).fetchone()
+            if row:
+                self.db.execute("UPDATE entries SET used_at = ? WHERE kind = ? AND url = ? AND day = ?",
+                                (now.isoformat(), kind, url, now.date().isoformat()))
+                self.db.commit()
+        body = None
+        if row:
+            try:
+                with gzip.open(self._blob_path(row[0]), 'rt', encoding='utf-8') as f:
+                    body = f.read()
+            except OSError:
+                # Blob removed behind the index's back; treat it as a miss
+                pass
+        if body is None:
+            metrics.count('cache_misses', kind=kind)
+            return None
+        metrics.count('cache_hits', kind=kind)
+        return body if kind in TEXT_KINDS else json.loads(body)
+
+    def put(self, url, kind, data):
+        """Store data for url; identical bodies share one blob"""
+        body = data if kind in TEXT_KINDS else json.dumps(data, separators=(',', ':'), sort_keys=True)
+        raw = body.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Unique temp name, so two writers of the same body can't collide
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(raw, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        now = datetime.now()
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (kind, url, now.date().isoformat(), digest, os.path.getsize(path),
+                             now.isoformat(), now.isoformat()))
+            self.db.commit()
+        metrics.count('cache_writes', kind=kind)
+        self.evict()
+
+    def _drop(self, rows):
+        """Delete index rows and any blobs no entry refers to any more"""
+        self.db.executemany("DELETE FROM entries WHERE kind = ? AND url = ? AND day = ?",
+                            [(kind, url, day) for kind, url, day, _ in rows])
+        for digest in {row[-1] for row in rows}:
+            if not self.db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+        self.db.commit()
+
+    def size(self):
+        """Bytes taken by the distinct blobs in the index"""
+        row = self.db.execute("SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM entries)").fetchone()
+        return row[0] or 0
+
+    def evict(self):
+        """Drop least recently used entries until the blobs fit in max_bytes"""
+        with self._lock:
+            excess = self.size() - self.max_bytes
+            if excess <= 0:
+                return 0
+            rows, freed = [], 0
+            for kind, url, day, digest, size in self.db.execute(
+                    "SELECT kind, url, day, digest, size FROM entries ORDER BY used_at"):
+                rows.append((kind, url, day, digest))
+                freed += size
+                if freed >= excess:
+                    break
+            self._drop(rows)
+        metrics.count('cache_evictions', len(rows))
+        return len(rows)
+
+    def prune(self):
+        """Drop every entry older than the TTL or from an earlier day"""
+        now = datetime.now()
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT kind, url, day, digest FROM entries WHERE fetched_at < ? OR day < ?",
+                ((now - self.ttl).isoformat(), now.date().isoformat()),
+            ).fetchall()
+            self._drop(rows)
+        return len(rows)
+
+    def stats(self):
+        """Entry counts per kind, distinct blobs and their total size"""
+        kinds = dict(self.db.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind"))
+        blobs = self.db.execute("SELECT COUNT(DISTINCT digest) FROM entries").fetchone()[0]
+        return {'entries': kinds, 'blobs': blobs, 'bytes': self.size()}
+
+    def entries(self, kind=None):
+        """(kind, url, fetched_at, size) of every entry, newest first"""
+        query = "SELECT kind, url, fetched_at, size FROM entries"
+        args = ()
+        if kind:
+            query += " WHERE kind = ?"
+            args = (kind,)
+        return self.db.execute(query + " ORDER BY fetched_at DESC", args).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Inspect or trim the page cache")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_DIR, help=f"cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL_HOURS,
+                        help=f"hours an entry stays usable (default: {DEFAULT_TTL_HOURS})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('stats', help="entries, blobs and size")
+    listing = commands.add_parser('list', help="cached URLs, newest first")
+    listing.add_argument('--kind', choices=['page', 'cards', 'payload', 'api'])
+    show = commands.add_parser('show', help="print a cached body, e.g. a page to inspect or debug")
+    show.add_argument('url')
+    show.add_argument('--kind', default='page', choices=['page', 'cards', 'payload', 'api'])
+    commands.add_parser('prune', help="drop entries older than the TTL or from an earlier day")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Cache maintenance command line"""
+    args = parse_args(argv)
+    cache = PageCache(args.cache, ttl_hours=args.ttl)
+    try:
+        if args.command == 'stats':
+            stats = cache.stats()
+            kinds = ', '.join(f"{count} {kind}" for kind, count in sorted(stats['entries'].items())) or 'empty'
+            print(f"{args.cache}: {kinds}; {stats['blobs']} distinct bodies, {stats['bytes']:,} bytes")
+        elif args.command == 'list':
+            for kind, url, fetched_at, size in cache.entries(args.kind):
+                print(f"{fetched_at[:19]}  {kind:<7} {size:>9,}  {url}")
+        elif args.command == 'show':
+            body = cache.get(args.url, args.kind)
+            if body is None:
+                raise SystemExit(f"✗ No fresh {args.kind} cached for {args.url}")
+            print(body if isinstance(body, str) else json.dumps(body, indent=2))
+        elif args.command == 'prune':
+            print(f"✓ Dropped {cache.prune()} expired entries")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Pokemon Events Scraper - Page Readiness
+Waits for the event locator to show a result - an event list, a "no
+events" message or a bot challenge - instead of sleeping a fixed time
+"""
+
+import re
+
+# CSS selectors for event list entries, most specific first
+EVENT_SELECTORS = [
+    '.event-item',
+    '.event-card',
+    '.event',
+    '[data-event-id]',
+    '.event-listing',
+    "div[class*='event']",
+]
+
+# Page text shown when a search has finished with no results
+NO_EVENTS_MARKERS = ['no events', 'no results']
+
+# Elements and document titles of a bot-protection interstitial, the
+# same signatures as CHALLENGE_SOURCE_PATTERNS below. Body text is not
+# checked: an event description may well say "access denied".
+CHALLENGE_SELECTORS = [
+    "iframe[src*='_Incapsula_Resource']",
+    "iframe[src*='captcha']",
+    '#challenge-form',
+    '.g-recaptcha',
+    '.h-captcha',
+    '.cf-challenge',
+]
+CHALLENGE_TITLES = ['access denied', 'attention required', 'just a moment', 'pardon our interruption']
+
+# Page source signatures of a block or challenge page. Ordinary pages on
+# the site load an Incapsula script too, so the bare word "incapsula" (or
+# "security", which appears in footers) is not a signal on its own.
+CHALLENGE_SOURCE_PATTERNS = [
+    r'<iframe[^>]+_incapsula_resource',
+    r'incapsula incident id',
+    r'request unsuccessful\. incapsula',
+    r'<title>[^<]*(access denied|attention required|just a moment|pardon our interruption)',
+    r'class="[^"]*\b(g-recaptcha|h-captcha|cf-challenge)\b',
+    r'id="challenge-form"',
+    r'verify (that )?you are (a )?human',
+]
+_CHALLENGE_SOURCE = re.compile('|'.join(CHALLENGE_SOURCE_PATTERNS), re.IGNORECASE)
+
+# Possible results of wait_for_page
+READY_EVENTS = 'events'
+READY_EMPTY = 'empty'
+READY_CHALLENGE = 'challenge'
+READY_TIMEOUT = 'timeout'
+
+# One round trip per poll: challenge elements or title first, then a
+# non-empty event entry, then a "no events" message
+_PROBE_SCRIPT = """
+var events = arguments[0], empty = arguments[1], selectors = arguments[2], titles = arguments[3];
+var title = (document.title || '').toLowerCase();
+var i;
+for (i = 0; i < selectors.length; i++) {
+    if (document.querySelector(selectors[i])) return 'challenge';
+}
+for (i = 0; i < titles.length; i++) {
+    if (title.indexOf(titles[i]) !== -1) return 'challenge';
+}
+for (i = 0; i < events.length; i++) {
+    var found = document.querySelectorAll(events[i]);
+    for (var j = 0; j < found.length; j++) {
+        if ((found[j].innerText || '').trim()) return 'events';
+    }
+}
+var text = ((document.body && document.body.innerText) || '').toLowerCase();
+for (i = 0; i < empty.length; i++) {
+    if (text.indexOf(empty[i]) !== -1) return 'empty';
+}
+return null;
+"""
+
+
+def probe_page(driver, selectors=EVENT_SELECTORS):
+    """Current page state: 'events', 'empty', 'challenge' or None if still loading"""
+    return driver.execute_script(_PROBE_SCRIPT, list(selectors), NO_EVENTS_MARKERS,
+                                 CHALLENGE_SELECTORS, CHALLENGE_TITLES)
+
+
+def wait_for_page(driver, timeout=15, poll=0.25, selectors=EVENT_SELECTORS):
+    """Block until the page shows events, a "no events" message or a challenge
+
+    Returns as soon as one appears; 'timeout' means none showed up within
+    timeout seconds and the caller should inspect the page as it is.
+    selectors are the event card selectors to watch for.
+    """
+    # Imported here so the parsers and selectors in this module load without Selenium
+    from selenium.common.exceptions import JavascriptException, TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # The probe can fail while the document is being replaced mid-navigation
+    wait = WebDriverWait(driver, timeout, poll_frequency=poll, ignored_exceptions=[JavascriptException])
+    try:
+        return wait.until(lambda d: probe_page(d, selectors))
+    except TimeoutException:
+        return READY_TIMEOUT
+
+
+def is_challenge_page(page_source):
+    """True if page_source is a bot-protection block or challenge page"""
+    return bool(_CHALLENGE_SOURCE.search(page_source))
@@ -0,0 +1,222 @@
+"""
+Pokemon Events Scraper - Pipeline
+The shared scrape run: choose the locations that are due, feed them to a
+backend, journal the results, merge duplicates and publish events.json -
+or, for one shard of a split run, a partial result for merge.py
+"""
+
+import json
+import os
+from datetime import datetime
+
+import metrics
+from changes import DEFAULT_FEED_FILE, has_changes, publish_if_changed, summary
+from dedupe import dedupe_events
+from event_model import normalize_events
+from event_sink import DEFAULT_JOURNAL_FILE, EventSink
+from history import DEFAULT_HISTORY_FILE, record_run
+from scrape_state import ScrapeState, DEFAULT_STATE_FILE, location_key
+
+DEFAULT_OUTPUT_FILE = 'events.json'
+DEFAULT_PARTIAL_DIR = 'partials'
+PARTIAL_VERSION = 1
+
+
+def shard_name(shard):
+    """'shard-i-of-N' for an (index, count) shard"""
+    return f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def shard_file(path, shard):
+    """path with the shard name before its extension, for per-shard files"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{shard_name(shard)}{ext}"
+
+
+def partial_path(shard, directory=DEFAULT_PARTIAL_DIR):
+    """Where a shard run writes its partial result"""
+    return os.path.join(directory, f"{shard_name(shard)}.json")
+
+
+def load_previous_events(path=DEFAULT_OUTPUT_FILE):
+    """Events from the last published file, keyed by id and by source id
+
+    A merged duplicate is published under one surviving id, while each
+    location's state lists the ids its own search returned, so the event
+    is also found under the original id of every search in its sources.
+    """
+    try:
+        with open(path) as f:
+            published = json.load(f).get('events', [])
+    except (OSError, ValueError):
+        return {}
+    events = {}
+    for event in published:
+        for source in event.get('sources') or []:
+            if source.get('id'):
+                events.setdefault(source['id'], event)
+    events.update((event['id'], event) for event in published)
+    return events
+
+
+def run_scrape(backend, locations, output=DEFAULT_OUTPUT_FILE, state_path=DEFAULT_STATE_FILE, full=False,
+               resume=False, history=DEFAULT_HISTORY_FILE, feed=DEFAULT_FEED_FILE, shard=None,
+               partial_dir=DEFAULT_PARTIAL_DIR):
+    """Scrape locations with backend and publish the merged events to output
+
+    Locations scraped recently enough keep their events from the previous
+    output unless ``full`` is set. Every result is journaled as it arrives,
+    so ``resume`` continues an interrupted run. Returns a summary dict, or
+    None when no location returned any events and output was left alone.
+
+    With ``shard`` (index, count) the run only writes a partial result -
+    its events plus the state of its locations - to partial_dir, and
+    output, the feed, the state file and history are left to merge.py.
+    """
+    state = ScrapeState(state_path)
+    journal = DEFAULT_JOURNAL_FILE
+    if shard:
+        os.makedirs(partial_dir, exist_ok=True)
+        journal = os.path.join(partial_dir, f"{shard_name(shard)}.journal.jsonl")
+        # A stale partial must never stand in for a shard that fails this time
+        if os.path.exists(partial_path(shard, partial_dir)):
+            os.remove(partial_path(shard, partial_dir))
+    if full:
+        due, fresh = list(locations), []
+    else:
+        due, fresh = state.split_due(locations)
+
+    # Every result goes to the journal as soon as it is scraped
+    sink = EventSink(journal, resume=resume)
+    done = set()
+    resumed_scrapes = 0
+    if resume:
+        for record in sink.records():
+            done.add(record['key'])
+            if record['source'] == 'scraped':
+                resumed_scrapes += 1
+                state.record(record['location'], record['events'],
+                             now=datetime.fromisoformat(record['written_at']))
+        due = [location for location in due if location_key(location) not in done]
+
+    print("=" * 60)
+    print("Pokemon Events Scraper - Starting")
+    print("=" * 60)
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Backend: {backend.name}")
+    if shard:
+        print(f"Shard: {shard[0]}/{shard[1]} ({len(locations)} locations)")
+    print(f"Locations to scrape: {len(due)} (skipping {len(fresh)} still fresh)")
+    if done:
+        print(f"Resuming: {len(done)} locations already in the journal")
+    print("=" * 60, flush=True)
+
+    successful_scrapes = resumed_scrapes
+    changed_locations = 0
+
+    # Locations that are still fresh keep the events from their last scrape
+    previous_events = load_previous_events(output)
+    reused_events = 0
+    for location in fresh:
+        if location_key(location) not in done:
+            # Several of a location's ids can have been merged into one event
+            found = {}
+            for i in state.event_ids(location):
+                if i in previous_events:
+                    found.setdefault(previous_events[i]['id'], previous_events[i])
+            events = list(found.values())
+            reused_events += len(events)
+            sink.write(location, events, source='reused')
+
+    def handle(location, events):
+        nonlocal successful_scrapes, changed_locations
+        metrics.count('locations', result='events' if events else 'empty')
+        if events:
+            successful_scrapes += 1
+            sink.write(location, events)
+            # Empty results can't be told apart from a blocked page, so only
+            # real results move a location's freshness forward
+            if state.record(location, events):
+                changed_locations += 1
+
+    try:
+        if due:
+            backend.run(due, handle)
+        else:
+            print("\n✓ Every location is still fresh - nothing to scrape")
+
+        if not successful_scrapes and not reused_events:
+            print("\n⚠ No location returned any events - keeping the previous data", flush=True)
+            sink.discard()
+            return None
+
+        # Normalize, sort chronologically and merge the same event found by several searches
+        with metrics.span('dedupe'):
+            found = normalize_events(sink.events())
+            events_list = dedupe_events(found)
+
+        result = {
+            'last_updated': datetime.now().isoformat(),
+            'total_events': len(events_list),
+            'locations_scraped': len(due) + resumed_scrapes,
+            'locations_reused': len(fresh),
+            'successful_scrapes': successful_scrapes,
+            'events': events_list
+        }
+
+        if shard:
+            path = partial_path(shard, partial_dir)
+            keys = {location_key(location) for location in locations}
+            partial = {
+                'version': PARTIAL_VERSION,
+                'shard': list(shard),
+                'state': {key: record for key, record in state.locations.items() if key in keys},
+                **result,
+            }
+            with metrics.span('publish'):
+                sink.publish(path, partial)
+
+            print("\n" + "=" * 60)
+            print(f"✓ SHARD {shard[0]}/{shard[1]} COMPLETE")
+            print("=" * 60)
+            print(f"Locations scraped: {successful_scrapes}/{len(due) + resumed_scrapes} ({changed_locations} changed)")
+            print(f"Locations reused: {len(fresh)}")
+            print(f"Unique events found: {len(events_list)} ({len(found) - len(events_list)} duplicates merged)")
+            print(f"Partial result saved to: {path} (combine the shards with merge.py)")
+            print("=" * 60, flush=True)
+            return {'partial': path, 'duplicates': len(found) - len(events_list), **result}
+
+        with metrics.span('publish'):
+            changes = publish_if_changed(sink, output, result, feed)
+            state.save()
+
+        new_events = None
+        if history:
+            with metrics.span('history'):
+                new_events = record_run(events_list, history, result['last_updated'])
+
+        print("\n" + "=" * 60)
+        print("✓ SCRAPING COMPLETE")
+        print("=" * 60)
+        print(f"Locations scraped: {successful_scrapes}/{len(due) + resumed_scrapes} ({changed_locations} changed)")
+        print(f"Locations reused: {len(fresh)}")
+        print(f"Unique events found: {len(events_list)} ({len(found) - len(events_list)} duplicates merged)")
+        print(f"Changes: {summary(changes)}")
+        if new_events is not None:
+            print(f"History: {new_events} events seen for the first time ({history})")
+        if has_changes(changes):
+            print(f"Data saved to: {output} (delta in {feed})")
+        else:
+            print(f"No event changes - {output} left as is")
+        print("=" * 60, flush=True)
+
+        return {'changes': changes, 'duplicates': len(found) - len(events_list),
+                'new_events': new_events, **result}
+
+    except Exception as e:
+        print(f"\n✗ FATAL ERROR: {e}", flush=True)
+        print("Scraped locations are saved in the journal - rerun with --resume to continue", flush=True)
+        raise
+
+    finally:
+        sink.close()
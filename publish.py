@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Publisher
+Turns events.json into compact geohash tiles plus a small manifest so
+the website only downloads the events near a search. Each tile carries a
+cell index so a radius query only scans rows in nearby cells.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from datetime import date
+
+from event_sink import write_json_atomic
+from event_model import normalize_events
+from geocode import BACKENDS, DEFAULT_CACHE_FILE, create_geocoder, normalize_query
+from geo import geohash_encode, geohash_bbox, haversine_miles, bbox_distance_miles
+
+DEFAULT_OUTPUT_DIR = 'data'
+FORMAT_VERSION = 3
+
+# Column order of each event row in a tile
+# (start and end are ISO dates or datetimes, or null when the date couldn't be parsed)
+EVENT_FIELDS = ['id', 'title', 'date', 'start', 'end', 'venue', 'city', 'lat', 'lon', 'exact', 'description',
+                'event_type', 'last_seen']
+
+# Geohash length of the cells inside a tile (~39 x 20 km)
+CELL_PRECISION = 4
+
+# Slack for cell pruning, since clamping to a box edge slightly
+# overestimates the true great-circle distance away from the meridians
+CELL_SLACK = 1.02
+
+COMPACT = {'separators': (',', ':'), 'ensure_ascii': False}
+
+
+def venue_query(event):
+    """Address string used to geocode an event's venue"""
+    return ', '.join(part for part in (event.get('location', ''), event.get('address', '')) if part)
+
+
+def event_coordinates(event, geocoder=None, cache=None):
+    """Best known (lat, lon, exact) for an event
+
+    Uses the venue coordinates from the scrape if present, then the
+    geocoder (called once per distinct venue), then the search center with
+    exact=0.
+    """
+    if event.get('venue_lat') is not None and event.get('venue_lon') is not None:
+        return round(float(event['venue_lat']), 4), round(float(event['venue_lon']), 4), 1
+
+    if geocoder and event.get('address'):
+        query = venue_query(event)
+        if cache is None or query not in cache:
+            coords = geocoder(query)
+            if cache is not None:
+                cache[query] = coords
+        else:
+            coords = cache[query]
+        if coords:
+            return round(coords[0], 4), round(coords[1], 4), 1
+
+    if event.get('search_lat') is None or event.get('search_lon') is None:
+        return None
+    return round(float(event['search_lat']), 4), round(float(event['search_lon']), 4), 0
+
+
+def index_tile(tile, cell_precision=CELL_PRECISION):
+    """Sort a tile's rows by cell and add [[cell, start, count], ...] ranges"""
+    lat_col = EVENT_FIELDS.index('lat')
+    lon_col = EVENT_FIELDS.index('lon')
+    keyed = sorted(
+        ((geohash_encode(row[lat_col], row[lon_col], cell_precision), row) for row in tile['events']),
+        key=lambda item: item[0],
+    )
+    tile['events'] = [row for cell, row in keyed]
+    cells = []
+    for i, (cell, row) in enumerate(keyed):
+        if cells and cells[-1][0] == cell:
+            cells[-1][2] += 1
+        else:
+            cells.append([cell, i, 1])
+    tile['cells'] = cells
+
+
+def build_tiles(events, precision=2, geocoder=None):
+    """Group events into geohash tiles with shared city and per-tile venue tables
+
+    Returns (cities, tiles) where cities is a list of [name, lat, lon] and
+    tiles maps geohash -> {'venues': [[location, address], ...],
+    'events': [row, ...], 'cells': [[cell, start, count], ...]}.
+    """
+    cities = []
+    city_index = {}
+    tiles = {}
+    geocode_cache = {}
+
+    # Resolve every venue that still needs coordinates in one batch
+    if geocoder and hasattr(geocoder, 'resolve_many'):
+        queries = {
+            venue_query(event) for event in events
+            if event.get('address') and (event.get('venue_lat') is None or event.get('venue_lon') is None)
+        }
+        resolved = geocoder.resolve_many(queries)
+        geocode_cache = {query: resolved.get(normalize_query(query)) for query in queries}
+
+    for event in events:
+        coords = event_coordinates(event, geocoder, geocode_cache)
+        if coords is None:
+            continue
+        lat, lon, exact = coords
+
+        city_key = (event.get('search_city', ''), event.get('search_lat'), event.get('search_lon'))
+        if city_key not in city_index:
+            city_index[city_key] = len(cities)
+            cities.append(list(city_key))
+
+        tile = tiles.setdefault(geohash_encode(lat, lon, precision), {'venues': [], 'venue_index': {}, 'events': []})
+        venue_key = (event.get('location', ''), event.get('address', ''))
+        if venue_key not in tile['venue_index']:
+            tile['venue_index'][venue_key] = len(tile['venues'])
+            tile['venues'].append(list(venue_key))
+
+        tile['events'].append([
+            event.get('id', ''),
+            event.get('title', ''),
+            event.get('date', ''),
+            event.get('start'),
+            event.get('end'),
+            tile['venue_index'][venue_key],
+            city_index[city_key],
+            lat,
+            lon,
+            exact,
+            event.get('description', ''),
+            event.get('event_type', ''),
+            event.get('last_seen', ''),
+        ])
+
+    for tile in tiles.values():
+        del tile['venue_index']
+        index_tile(tile)
+    return cities, tiles
+
+
+def query_radius(manifest, load_tile, lat, lon, radius):
+    """Rows within radius miles of (lat, lon); mirrors the search in index.html
+
+    ``load_tile(geohash)`` returns a published tile. Only tiles and cells
+    whose bounding box is within reach are touched.
+    """
+    lat_col = EVENT_FIELDS.index('lat')
+    lon_col = EVENT_FIELDS.index('lon')
+    reach = radius * CELL_SLACK
+    matches = []
+    for geohash, info in manifest['tiles'].items():
+        if bbox_distance_miles(lat, lon, info['bbox']) > reach:
+            continue
+        tile = load_tile(geohash)
+        for cell, start, count in tile['cells']:
+            if bbox_distance_miles(lat, lon, geohash_bbox(cell)) > reach:
+                continue
+            for row in tile['events'][start:start + count]:
+                if haversine_miles(lat, lon, row[lat_col], row[lon_col]) <= radius:
+                    matches.append(row)
+    return matches
+
+
+def upcoming(events, today=None):
+    """Events that haven't ended before today; undated events are kept"""
+    today = (today or date.today()).isoformat()
+    return [event for event in events if not event.get('start') or (event.get('end') or event['start'])[:10] >= today]
+
+
+def publish(events_path='events.json', output_dir=DEFAULT_OUTPUT_DIR, precision=2, geocoder=None, keep_past=False):
+    """Write tiles and manifest for events_path into output_dir; returns the manifest"""
+    with open(events_path) as f:
+        dataset = json.load(f)
+
+    events = normalize_events(dataset.get('events', []))
+    if not keep_past:
+        events = upcoming(events)
+    cities, tiles = build_tiles(events, precision, geocoder)
+
+    # Rebuild the tile directory from scratch so removed tiles don't linger
+    tiles_dir = os.path.join(output_dir, 'tiles')
+    if os.path.isdir(tiles_dir):
+        shutil.rmtree(tiles_dir)
+    os.makedirs(tiles_dir)
+
+    tile_index = {}
+    for geohash in sorted(tiles):
+        path = os.path.join(tiles_dir, f"{geohash}.json")
+        write_json_atomic(path, tiles[geohash], **COMPACT)
+        tile_index[geohash] = {
+            'count': len(tiles[geohash]['events']),
+            'bbox': [round(v, 4) for v in geohash_bbox(geohash)],
+            'bytes': os.path.getsize(path),
+        }
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'last_updated': dataset.get('last_updated'),
+        'total_events': sum(tile['count'] for tile in tile_index.values()),
+        'precision': precision,
+        'cell_precision': CELL_PRECISION,
+        'fields': EVENT_FIELDS,
+        'cities': cities,
+        'tiles': tile_index,
+    }
+    # Manifest last, once every tile it lists has been written
+    write_json_atomic(os.path.join(output_dir, 'manifest.json'), manifest, **COMPACT)
+    return manifest
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Publish events.json as compact geohash tiles")
+    parser.add_argument('--input', default='events.json', help="dataset to publish (default: events.json)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"directory for manifest and tiles (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--precision', type=int, default=2,
+                        help="geohash length of each tile; 2 is roughly 1250 x 625 km (default: 2)")
+    parser.add_argument('--keep-past', action='store_true',
+                        help="also publish events that have already ended")
+    parser.add_argument('--geocode', choices=['none'] + sorted(BACKENDS), default='none',
+                        help="backend for resolving venue addresses (default: none)")
+    parser.add_argument('--geocode-cache', default=DEFAULT_CACHE_FILE,
+                        help=f"geocode cache file (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--geocode-limit', type=int, default=200,
+                        help="maximum new venue lookups per run (default: 200)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Publish the dataset"""
+    args = parse_args(argv)
+    geocoder = None
+    if args.geocode != 'none':
+        geocoder = create_geocoder(args.geocode, args.geocode_cache, args.geocode_limit)
+
+    manifest = publish(args.input, args.output_dir, args.precision, geocoder, args.keep_past)
+    if geocoder:
+        print(f"Geocoded venues with {geocoder.lookups} new lookups (cache: {args.geocode_cache})")
+
+    tile_bytes = sum(tile['bytes'] for tile in manifest['tiles'].values())
+    print(f"✓ Published {manifest['total_events']} events in {len(manifest['tiles'])} tiles "
+          f"({tile_bytes:,} bytes) to {args.output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
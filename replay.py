@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Offline Replay
+Records event locator pages and event payloads per city into fixtures,
+serves them from a local stand-in server and benchmarks the extraction
+pipeline and every backend against them without touching the network
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from backends import BACKENDS, DEFAULT_BACKEND, create_backend
+from dom_extract import events_from_cards
+from event_model import build_event
+from event_sink import write_json_atomic
+from network_capture import extract_payload_events
+from scrape_state import location_key
+
+DEFAULT_FIXTURES_DIR = 'fixtures'
+
+SCRIPT_TAG = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def fixture_slug(location):
+    """Directory name of a location's fixture"""
+    return re.sub(r'[^a-z0-9]+', '-', location['city'].lower()).strip('-')
+
+
+def save_fixture(fixtures_dir, location, url, page_source, payload, selector, cards):
+    """Write one recorded search into fixtures_dir/<slug>/"""
+    path = os.path.join(fixtures_dir, fixture_slug(location))
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'page.html'), 'w', encoding='utf-8') as f:
+        f.write(page_source)
+    if payload is not None:
+        write_json_atomic(os.path.join(path, 'payload.json'), payload)
+    write_json_atomic(os.path.join(path, 'elements.json'), {'selector': selector, 'cards': cards}, indent=2)
+    write_json_atomic(os.path.join(path, 'meta.json'), {
+        'location': location,
+        'url': url,
+        'recorded_at': datetime.now().isoformat(),
+    }, indent=2)
+    return path
+
+
+def load_fixtures(fixtures_dir=DEFAULT_FIXTURES_DIR):
+    """Recorded fixtures, sorted by directory name
+
+    Each is a dict with location, page (HTML), payload (raw JSON text or
+    None) and cards (as returned by collect_event_cards).
+    """
+    fixtures = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        path = os.path.join(fixtures_dir, name)
+        if not os.path.isfile(os.path.join(path, 'meta.json')):
+            continue
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, 'page.html'), encoding='utf-8') as f:
+            page = f.read()
+        payload = None
+        if os.path.exists(os.path.join(path, 'payload.json')):
+            with open(os.path.join(path, 'payload.json'), encoding='utf-8') as f:
+                payload = f.read()
+        with open(os.path.join(path, 'elements.json')) as f:
+            elements = json.load(f)
+        cards = elements['cards']
+        fixtures.append({'name': name, 'location': meta['location'], 'page': page,
+                         'payload': payload, 'cards': cards})
+    return fixtures
+
+
+def record(locations, fixtures_dir=DEFAULT_FIXTURES_DIR, profile='lean', page_timeout=15):
+    """Load each location live once and save its page, payload and event cards"""
+    from selenium_backend import create_driver, search_url
+    from network_capture import clear_network_log, wait_for_event_payload
+    from page_ready import wait_for_page
+    from dom_extract import collect_event_cards
+
+    driver = create_driver(capture=True, profile=profile)
+    try:
+        for i, location in enumerate(locations):
+            url = search_url(location)
+            print(f"[{i+1}/{len(locations)}] Recording {location['city']}...", flush=True)
+            clear_network_log(driver)
+            driver.get(url)
+            payload = wait_for_event_payload(driver)
+            ready = wait_for_page(driver, page_timeout)
+            selector, cards = collect_event_cards(driver)
+            path = save_fixture(fixtures_dir, location, url, driver.page_source, payload, selector, cards)
+            print(f"  ✓ {ready}: {len(cards)} elements, "
+                  f"{'no payload' if payload is None else f'{len(payload)} payload items'} -> {path}")
+            if i < len(locations) - 1:
+                time.sleep(3)
+    finally:
+        driver.quit()
+
+
+class StandInServer:
+    """Local HTTP server answering event locator searches from fixtures
+
+    A search for /EventLocator/Home?latitude=..&longitude=.. gets the
+    recorded page of the fixture at those coordinates, with its scripts
+    removed so the replayed page can't reach out to the live site.
+    /api/events?latitude=..&longitude=.. answers with its recorded payload
+    for the HTTP API backend.
+    """
+
+    def __init__(self, fixtures, host='127.0.0.1', port=0):
+        pages = {location_key(fixture['location']): SCRIPT_TAG.sub('', fixture['page']) for fixture in fixtures}
+        payloads = {location_key(fixture['location']): fixture['payload']
+                    for fixture in fixtures if fixture['payload'] is not None}
+        routes = {
+            '/EventLocator/Home': (pages, 'text/html; charset=utf-8'),
+            '/api/events': (payloads, 'application/json'),
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                page = None
+                content, content_type = routes.get(url.path, ({}, None))
+                try:
+                    page = content.get(location_key({'lat': float(query['latitude'][0]),
+                                                     'lon': float(query['longitude'][0])}))
+                except (KeyError, ValueError):
+                    pass
+                if page is None:
+                    self.send_error(404)
+                    return
+                body = page.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/EventLocator/Home"
+
+    @property
+    def api_endpoint(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/events?latitude={{lat}}&longitude={{lon}}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def payload_stage(fixture):
+    """Network capture path: decode the payload and build events"""
+    location = fixture['location']
+    items = json.loads(fixture['payload'])
+    return [build_event(fields, location['city'], location['lat'], location['lon'])
+            for fields in extract_payload_events(items)]
+
+
+def dom_stage(fixture):
+    """Page parsing path: turn recorded event cards into events"""
+    location = fixture['location']
+    return events_from_cards(fixture['cards'], location['city'], location['lat'], location['lon'])
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) of a list, nearest rank"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def measure(stage, fixtures, rounds=20, allocations=True):
+    """Timing and allocation stats of running stage over every fixture"""
+    # One untimed pass warms imports and caches
+    for fixture in fixtures:
+        stage(fixture)
+
+    timings = []
+    events = 0
+    for _ in range(rounds):
+        for fixture in fixtures:
+            start = time.perf_counter()
+            events += len(stage(fixture))
+            timings.append(time.perf_counter() - start)
+
+    stats = {
+        'pages': len(timings),
+        'events_per_page': events / len(timings),
+        'pages_per_sec': len(timings) / sum(timings) if sum(timings) else float('inf'),
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+    }
+
+    # Allocations are traced in a separate pass so tracing doesn't skew timings
+    if allocations:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for fixture in fixtures:
+            stage(fixture)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+        stats['peak_kib'] = peak / 1024
+        stats['retained_blocks_per_page'] = blocks / len(fixtures)
+    return stats
+
+
+def stand_in_options(name, server, profile='lean', scratch=None):
+    """Options pointing a backend at the stand-in server with no pacing
+
+    Learned state (extraction templates) goes to the scratch directory, so
+    a benchmark never touches the files real runs use; without one, no
+    templates are kept at all.
+    """
+    if name == 'http-api':
+        return {'endpoints': [server.api_endpoint], 'min_interval': 0}
+    templates = os.path.join(scratch, 'extraction_templates.json') if scratch else ''
+    return {'base_url': server.base_url, 'profile': profile, 'min_interval': 0, 'jitter': 0, 'rate_state': None,
+            'templates': templates}
+
+
+def measure_backend(name, fixtures, server, profile='lean'):
+    """Throughput of a whole backend run over every fixture location"""
+    events = []
+    with tempfile.TemporaryDirectory() as scratch:
+        backend = create_backend(name, **stand_in_options(name, server, profile, scratch))
+        try:
+            start = time.perf_counter()
+            backend.run([fixture['location'] for fixture in fixtures],
+                        lambda location, found: events.append(len(found)))
+            elapsed = time.perf_counter() - start
+        finally:
+            backend.close()
+    return {
+        'pages': len(events),
+        'events_per_page': sum(events) / len(events) if events else 0.0,
+        'pages_per_sec': len(events) / elapsed if elapsed else float('inf'),
+        'mean_ms': elapsed / len(events) * 1000 if events else 0.0,
+    }
+
+
+def bench(fixtures, rounds=20, backends=(), profile='lean'):
+    """{stage: stats} for every pipeline stage the fixtures support
+
+    Each named backend is also run end to end against the stand-in server,
+    so backends can be compared on the same recorded pages.
+    """
+    results = {}
+    with_payload = [fixture for fixture in fixtures if fixture['payload'] is not None]
+    if with_payload:
+        results['payload'] = measure(payload_stage, with_payload, rounds)
+    results['dom'] = measure(dom_stage, fixtures, rounds)
+
+    if backends:
+        with StandInServer(fixtures) as server:
+            for name in backends:
+                results[name] = measure_backend(name, fixtures, server, profile)
+    return results
+
+
+def print_results(results, fixtures):
+    """Print a benchmark table"""
+    print(f"{len(fixtures)} fixtures")
+    print(f"{'stage':<18}{'pages/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>10}{'retained':>11}{'events/pg':>11}")
+    for stage, stats in results.items():
+        p50 = f"{stats['p50_ms']:.3f}" if 'p50_ms' in stats else '-'
+        p95 = f"{stats['p95_ms']:.3f}" if 'p95_ms' in stats else '-'
+        peak = f"{stats['peak_kib']:.1f}" if 'peak_kib' in stats else '-'
+        blocks = f"{stats['retained_blocks_per_page']:.0f}" if 'retained_blocks_per_page' in stats else '-'
+        print(f"{stage:<18}{stats['pages_per_sec']:>10.0f}{stats['mean_ms']:>10.3f}{p50:>10}"
+              f"{p95:>10}{peak:>10}{blocks:>11}{stats['events_per_page']:>11.1f}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Record, serve and benchmark offline event locator fixtures")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR,
+                        help=f"fixture directory (default: {DEFAULT_FIXTURES_DIR})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="load cities live and save them as fixtures")
+    rec.add_argument('cities', nargs='*', help="cities from the built-in location list (default: all)")
+    rec.add_argument('--locations', metavar='PATH', help="JSON list of {city, lat, lon} to record instead")
+
+    serve = sub.add_parser('serve', help="serve fixtures as a stand-in event locator")
+    serve.add_argument('--port', type=int, default=8765)
+
+    run = sub.add_parser('bench', help="benchmark the extraction pipeline against fixtures")
+    run.add_argument('--rounds', type=int, default=20, help="passes over the fixtures per stage (default: 20)")
+    run.add_argument('--backend', action='append', choices=sorted(BACKENDS), metavar='NAME',
+                     help=f"also time a full run of this backend against the stand-in server "
+                          f"({', '.join(sorted(BACKENDS))}; repeatable)")
+    run.add_argument('--browser', action='append_const', const=DEFAULT_BACKEND, dest='backend',
+                     help=f"same as --backend {DEFAULT_BACKEND}")
+    run.add_argument('--json', metavar='PATH', help="also write the results to PATH")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a replay command"""
+    args = parse_args(argv)
+
+    if args.command == 'record':
+        if args.locations:
+            with open(args.locations) as f:
+                locations = json.load(f)
+        else:
+            from locations import SEARCH_LOCATIONS
+            locations = [loc for loc in SEARCH_LOCATIONS if not args.cities or loc['city'] in args.cities]
+        record(locations, args.fixtures)
+        return
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        raise SystemExit(f"No fixtures in {args.fixtures}/ - record some with: python replay.py record")
+
+    if args.command == 'serve':
+        with StandInServer(fixtures, port=args.port) as server:
+            print(f"Serving {len(fixtures)} fixtures at {server.base_url}?latitude=..&longitude=..")
+            try:
+                server.thread.join()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    results = bench(fixtures, args.rounds, args.backend or ())
+    print_results(results, fixtures)
+    if args.json:
+        write_json_atomic(args.json, {
+            'run_at': datetime.now().isoformat(),
+            'fixtures': len(fixtures),
+            'rounds': args.rounds,
+            'stages': results,
+        }, indent=2)
+        print(f"✓ Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Pokemon Events Scraper - Per-Location State
+Remembers when each location was last scraped and what it returned, so
+locations whose results have been stable can be refreshed less often
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+DEFAULT_STATE_FILE = 'scrape_state.json'
+
+
+def result_hash(events):
+    """Content hash of a result set (event ids are already content hashes)"""
+    ids = sorted(event['id'] for event in events)
+    return hashlib.md5('|'.join(ids).encode()).hexdigest()
+
+
+def location_key(location):
+    """Stable key for a search location"""
+    return f"{location['lat']:.4f},{location['lon']:.4f}"
+
+
+class ScrapeState:
+    """Per-location freshness record with a backoff schedule
+
+    A location is due once ``base_hours`` have passed since its last scrape.
+    Every consecutive run that returns the same result set doubles that
+    interval, up to ``max_hours``; any change resets it.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_FILE, base_hours=20, max_hours=168):
+        self.path = path
+        self.base_hours = base_hours
+        self.max_hours = max_hours
+        self.locations = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.locations = json.load(f).get('locations', {})
+
+    def save(self):
+        """Write the state file atomically"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'locations': self.locations}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def interval(self, record):
+        """Refresh interval for a location record"""
+        hours = self.base_hours * 2 ** record.get('stable_runs', 0)
+        return timedelta(hours=min(hours, self.max_hours))
+
+    def staleness(self, location, now=None):
+        """Elapsed time over refresh interval; 1.0 or more means due"""
+        record = self.locations.get(location_key(location))
+        if not record:
+            return float('inf')
+        now = now or datetime.now()
+        elapsed = now - datetime.fromisoformat(record['last_scraped'])
+        return elapsed / self.interval(record)
+
+    def split_due(self, locations, now=None):
+        """Split locations into (due, fresh); due is ordered stalest first"""
+        now = now or datetime.now()
+        scored = [(self.staleness(location, now), i, location) for i, location in enumerate(locations)]
+        due = [location for score, i, location in sorted(scored, key=lambda s: (-s[0], s[1])) if score >= 1]
+        fresh = [location for score, i, location in scored if score < 1]
+        return due, fresh
+
+    def event_ids(self, location):
+        """Event ids from the location's last recorded scrape"""
+        return self.locations.get(location_key(location), {}).get('event_ids', [])
+
+    def record(self, location, events, now=None):
+        """Record a scrape result; returns True if it differs from the last one"""
+        key = location_key(location)
+        previous = self.locations.get(key, {})
+        content_hash = result_hash(events)
+        changed = previous.get('content_hash') != content_hash
+
+        self.locations[key] = {
+            'city': location['city'],
+            'last_scraped': (now or datetime.now()).isoformat(),
+            'content_hash': content_hash,
+            'event_ids': sorted(event['id'] for event in events),
+            'stable_runs': 0 if changed else previous.get('stable_runs', 0) + 1,
+            'scrapes': previous.get('scrapes', 0) + 1,
+            'changes': previous.get('changes', 0) + (1 if changed else 0),
+        }
+        return changed
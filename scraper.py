@@ -1,271 +1,234 @@
 #!/usr/bin/env python3
 """
-Pokemon Events Scraper - Robust Version
-Enhanced bot protection evasion and error handling
+Pokemon Events Scraper
+Single command line for every backend: scrapes the search locations with
+Selenium (headless or visible) or the HTTP API and publishes events.json.
+A run can be split into shards, on separate machines or in local
+processes, and merged afterwards. The publish, diff, validate, plan-grid
+and merge subcommands run without loading Selenium at all.
 """
 
-import json
-import time
+import argparse
+import importlib
 import os
-from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-import hashlib
-import random
+import sys
 
-# Reduced location set for faster testing - covers major regions
-SEARCH_LOCATIONS = [
-    # Major cities only - strategic coverage
-    {"city": "Seattle", "lat": 47.6062, "lon": -122.3321},
-    {"city": "Los Angeles", "lat": 34.0522, "lon": -118.2437},
-    {"city": "Phoenix", "lat": 33.4484, "lon": -112.0740},
-    {"city": "Denver", "lat": 39.7392, "lon": -104.9903},
-    {"city": "Dallas", "lat": 32.7767, "lon": -96.7970},
-    {"city": "Houston", "lat": 29.7604, "lon": -95.3698},
-    {"city": "Chicago", "lat": 41.8781, "lon": -87.6298},
-    {"city": "Atlanta", "lat": 33.7490, "lon": -84.3880},
-    {"city": "Miami", "lat": 25.7617, "lon": -80.1918},
-    {"city": "New York", "lat": 40.7128, "lon": -74.0060},
-    {"city": "Boston", "lat": 42.3601, "lon": -71.0589},
-    {"city": "Washington DC", "lat": 38.9072, "lon": -77.0369},
-]
+# Subcommand -> (module whose main() runs it, help line). Scraping is the
+# default command; these only import their own module so they start fast.
+COMMANDS = {
+    'publish': ('publish', "build the map tiles and manifest from events.json"),
+    'diff': ('changes', "compare two event files, or update a change feed"),
+    'validate': ('validate', "check events.json and the published tiles for problems"),
+    'plan-grid': ('coverage_plan', "plan or report search location coverage"),
+    'merge': ('merge', "combine the partial results of a sharded run into events.json"),
+}
 
-def create_driver():
-    """Create and configure Chrome driver with enhanced stealth"""
-    chrome_options = Options()
-    
-    # Essential options
-    chrome_options.add_argument('--headless=new')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    
-    # Enhanced bot detection evasion
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    # Realistic user agent
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36')
-    
-    # Window size
-    chrome_options.add_argument('--window-size=1920,1080')
-    
-    # Additional stealth
-    chrome_options.add_argument('--disable-web-security')
-    chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-    
+
+def shard_spec(value):
+    """argparse type for --shard i/N"""
+    from locations import parse_shard
     try:
-        print("Installing ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Execute CDP commands to mask automation
-        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-        })
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        print("✓ ChromeDriver ready")
-        return driver
-        
-    except Exception as e:
-        print(f"✗ Error creating driver: {e}")
-        raise
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
-def get_event_id(event_data):
-    """Generate unique ID for an event"""
-    event_str = f"{event_data.get('title', '')}|{event_data.get('date', '')}|{event_data.get('location', '')}|{event_data.get('address', '')}"
-    return hashlib.md5(event_str.encode()).hexdigest()
 
-def scrape_location(driver, location, retry=0):
-    """Scrape events for a specific location with retries"""
-    lat = location['lat']
-    lon = location['lon']
-    city = location['city']
-    
-    today = datetime.now().strftime('%Y-%m-%d')
-    url = f"https://events.pokemon.com/EventLocator/Home?iskm=false&longitude={lon}&latitude={lat}&locale=en-US&range=100&startdate={today}"
-    
-    print(f"Scraping {city} ({lat}, {lon})...", flush=True)
-    
-    try:
-        driver.get(url)
-        
-        # Random wait to appear more human-like
-        wait_time = random.uniform(3, 6)
-        time.sleep(wait_time)
-        
-        # Check for bot detection page
-        page_source = driver.page_source.lower()
-        if 'incapsula' in page_source or 'access denied' in page_source or 'security' in page_source:
-            print(f"  ⚠ Bot protection detected for {city}")
-            if retry < 2:
-                print(f"  Retrying in 10 seconds... (attempt {retry + 1}/2)")
-                time.sleep(10)
-                return scrape_location(driver, location, retry + 1)
-            return []
-        
-        # Save page for debugging if needed
-        if os.getenv('DEBUG'):
-            with open(f'debug_{city}.html', 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
-        
-        events = []
-        
-        # Try multiple selectors for events
-        selectors_to_try = [
-            (By.CLASS_NAME, "event-item"),
-            (By.CLASS_NAME, "event-card"),
-            (By.CLASS_NAME, "event"),
-            (By.CSS_SELECTOR, "[data-event-id]"),
-            (By.CSS_SELECTOR, ".event-listing"),
-            (By.CSS_SELECTOR, "div[class*='event']"),
-        ]
-        
-        event_elements = []
-        for by, selector in selectors_to_try:
-            try:
-                elements = driver.find_elements(by, selector)
-                if elements and len(elements) > 0:
-                    event_elements = elements
-                    print(f"  ✓ Found {len(elements)} potential events using {selector}")
-                    break
-            except:
-                continue
-        
-        if not event_elements:
-            # Check if page says "no events"
-            if 'no events' in page_source or 'no results' in page_source:
-                print(f"  → No events scheduled in {city}")
-            else:
-                print(f"  ⚠ Could not find events in {city} (selectors may need update)")
-            return []
-        
-        # Parse events
-        for i, elem in enumerate(event_elements[:20]):  # Limit to 20 per location
-            try:
-                event_data = {
-                    'search_city': city,
-                    'search_lat': lat,
-                    'search_lon': lon
-                }
-                
-                # Try to extract text content
-                text_content = elem.text.strip()
-                if not text_content:
-                    continue
-                
-                # Basic parsing - adjust based on actual structure
-                lines = text_content.split('\n')
-                if len(lines) >= 2:
-                    event_data['title'] = lines[0] if len(lines) > 0 else "Unknown Event"
-                    event_data['date'] = lines[1] if len(lines) > 1 else "Date TBA"
-                    event_data['location'] = lines[2] if len(lines) > 2 else city
-                    event_data['address'] = lines[3] if len(lines) > 3 else ""
-                    event_data['description'] = '\n'.join(lines[4:]) if len(lines) > 4 else ""
-                else:
-                    event_data['title'] = text_content[:100]
-                    event_data['date'] = "Date TBA"
-                    event_data['location'] = city
-                    event_data['address'] = ""
-                    event_data['description'] = ""
-                
-                event_data['event_type'] = ""
-                event_data['id'] = get_event_id(event_data)
-                event_data['last_seen'] = datetime.now().isoformat()
-                
-                events.append(event_data)
-                
-            except Exception as e:
-                print(f"  ⚠ Error parsing event {i}: {str(e)[:50]}")
-                continue
-        
-        print(f"  ✓ Extracted {len(events)} events from {city}")
-        return events
-        
-    except WebDriverException as e:
-        print(f"  ✗ WebDriver error in {city}: {str(e)[:100]}")
-        return []
-    except Exception as e:
-        print(f"  ✗ Error scraping {city}: {str(e)[:100]}")
-        return []
+def parse_args(argv=None):
+    """Parse command line options"""
+    # Scrape-only modules are imported here so subcommands never load them
+    from backends import BACKENDS, DEFAULT_BACKEND
+    from browser_profile import PROFILES, DEFAULT_PROFILE
+    from card_templates import DEFAULT_TEMPLATES_FILE
+    from changes import DEFAULT_FEED_FILE
+    from history import DEFAULT_HISTORY_FILE
+    from locations import LOCATION_SETS
+    from page_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, DEFAULT_TTL_HOURS
+    from pipeline import DEFAULT_OUTPUT_FILE, DEFAULT_PARTIAL_DIR
+    from scrape_state import DEFAULT_STATE_FILE
+    from worker_pool import DEFAULT_RATE_STATE_FILE
+
+    commands = '\n'.join(f"  {name:<10} {help_text}" for name, (_, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        description="Pokemon Events Scraper",
+        usage="%(prog)s [scrape] [options] | %(prog)s {" + ','.join(COMMANDS) + "} [options]",
+        epilog=f"other commands (run '%(prog)s COMMAND --help' for their options):\n{commands}",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"how to fetch events (default: {DEFAULT_BACKEND})")
+    parser.add_argument('--workers', '--concurrency', dest='workers', type=int,
+                        default=int(os.getenv('SCRAPER_WORKERS', '0')) or None,
+                        help="browsers to run in parallel, or HTTP requests in flight "
+                             "(default: 1 browser, 8 requests)")
+    parser.add_argument('--locations', default='major', metavar='SET_OR_PATH',
+                        help=f"built-in location set ({', '.join(sorted(LOCATION_SETS))}) or a JSON list "
+                             "of {city, lat, lon}, e.g. from coverage_plan.py (default: major)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE,
+                        help=f"where to publish the events (default: {DEFAULT_OUTPUT_FILE})")
+    parser.add_argument('--feed', default=DEFAULT_FEED_FILE,
+                        help=f"change feed updated when the events change (default: {DEFAULT_FEED_FILE})")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its journal")
+    parser.add_argument('--full', action='store_true',
+                        help="scrape every location, even ones refreshed recently")
+    parser.add_argument('--state', default=DEFAULT_STATE_FILE,
+                        help=f"per-location freshness state file (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_FILE, metavar='PATH',
+                        help=f"SQLite event history to add this run to, '' to skip (default: {DEFAULT_HISTORY_FILE})")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="write stage timings and counters to PATH (.prom for Prometheus text, else JSON)")
+    parser.add_argument('--min-interval', type=float,
+                        help="fastest spacing in seconds between requests to the site, across all shards "
+                             "of a sharded run (default: 2.0 for browsers, 0.2 for HTTP)")
+
+    cache = parser.add_argument_group('page cache')
+    cache.add_argument('--cache', default=DEFAULT_CACHE_DIR, metavar='DIR',
+                       help=f"reuse pages and responses fetched today from DIR, '' to always fetch "
+                            f"(default: {DEFAULT_CACHE_DIR})")
+    cache.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL_HOURS, metavar='HOURS',
+                       help=f"how long a cached page can be reused (default: {DEFAULT_TTL_HOURS})")
+    cache.add_argument('--cache-size', type=float, default=DEFAULT_MAX_MB, metavar='MB',
+                       help=f"drop the least recently used pages beyond this size (default: {DEFAULT_MAX_MB})")
+
+    sharding = parser.add_argument_group('sharded runs')
+    sharding.add_argument('--shard', type=shard_spec, metavar='i/N',
+                          help="scrape only shard i of N of the locations and write a partial result "
+                               "for 'merge' instead of publishing")
+    sharding.add_argument('--processes', type=int, default=1, metavar='N',
+                          help="run N shards in parallel processes on this machine, then merge them (default: 1)")
+    sharding.add_argument('--partial-dir', default=DEFAULT_PARTIAL_DIR,
+                          help=f"where shards write their partial results and journals (default: {DEFAULT_PARTIAL_DIR})")
+
+    browser = parser.add_argument_group('selenium backends')
+    browser.add_argument('--capture', choices=['dom', 'network'], default='dom',
+                         help="read events from the rendered page or from captured network responses (default: dom)")
+    browser.add_argument('--profile', choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                         help="resources to block: full loads everything, lean skips images, fonts, "
+                              "media and trackers, strict also skips stylesheets (default: lean)")
+    browser.add_argument('--block', action='append', metavar='PATTERN',
+                         help="extra URL pattern to block, e.g. '*example.com*' (repeatable)")
+    browser.add_argument('--page-timeout', type=float, default=15,
+                         help="seconds to wait for a page to show events or a no-events message (default: 15)")
+    browser.add_argument('--recycle-after', type=int, default=25,
+                         help="restart each browser after this many pages (default: 25)")
+    browser.add_argument('--max-interval', type=float, default=60.0,
+                         help="slowest spacing the rate controller backs off to (default: 60)")
+    browser.add_argument('--rate-state', default=DEFAULT_RATE_STATE_FILE,
+                         help=f"where the learned request spacing is kept between runs (default: {DEFAULT_RATE_STATE_FILE})")
+    browser.add_argument('--templates', default=DEFAULT_TEMPLATES_FILE, metavar='PATH',
+                         help="learned event card selectors and field positions, '' to use only the fixed "
+                              f"selector list (default: {DEFAULT_TEMPLATES_FILE})")
+    return parser.parse_args(argv)
+
+
+def backend_options(args):
+    """Backend keyword options from the parsed command line"""
+    options = {'workers': args.workers, 'min_interval': args.min_interval}
+    if args.backend.startswith('selenium'):
+        options.update(
+            capture=args.capture == 'network',
+            profile=args.profile,
+            block=args.block,
+            page_timeout=args.page_timeout,
+            recycle_after=args.recycle_after,
+            max_interval=args.max_interval,
+            rate_state=args.rate_state,
+            templates=args.templates,
+        )
+    # Unset options fall back to each backend's own defaults
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _run_shard(argv):
+    """Process pool entry point: one shard's scrape"""
+    return main(argv) is not None
+
+
+def run_processes(argv, args):
+    """Run args.processes shards of the command line in a process pool and merge them"""
+    from concurrent.futures import ProcessPoolExecutor
 
-def main():
-    """Main scraping function"""
-    print("=" * 60)
-    print("Pokemon Events Scraper - Starting")
-    print("=" * 60)
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Locations to scrape: {len(SEARCH_LOCATIONS)}")
-    print("=" * 60, flush=True)
-    
-    driver = None
-    
+    from merge import merge
+    from pipeline import partial_path
+
+    count = args.processes
+    shards = [(index, count) for index in range(1, count + 1)]
+    # The last --shard/--processes on a command line wins, so each worker runs one shard
+    jobs = [argv + ['--shard', f"{index}/{count}", '--processes', '1'] for index, _ in shards]
+    print(f"Running {count} shards in parallel processes", flush=True)
+    with ProcessPoolExecutor(max_workers=count) as pool:
+        published = list(pool.map(_run_shard, jobs))
+
+    if not all(published):
+        failed = [f"{index}/{count}" for (index, _), ok in zip(shards, published) if not ok]
+        print(f"\n⚠ Shards {', '.join(failed)} returned no events - keeping the previous data", flush=True)
+        return None
+    return merge([partial_path(shard, args.partial_dir) for shard in shards], output=args.output,
+                 state_path=args.state, history=args.history, feed=args.feed, shards=count)
+
+
+def run_command(name, argv):
+    """Run a subcommand's main() with the rest of the command line"""
+    module, _ = COMMANDS[name]
+    sys.argv[0] = f"{os.path.basename(sys.argv[0])} {name}"
+    return importlib.import_module(module).main(argv)
+
+
+def main(argv=None):
+    """Main scraping function, or the subcommand named first on the command line"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    if argv and argv[0] == 'scrape':
+        argv = argv[1:]
+
+    import metrics
+    from backends import backend_default, create_backend
+    from locations import load_locations, shard_locations
+    from page_cache import PageCache
+    from pipeline import run_scrape, shard_file
+
+    args = parse_args(argv)
+    if args.processes > 1 and not args.shard:
+        return run_processes(argv, args)
+
+    metrics.METRICS.reset()
+    locations = load_locations(args.locations)
+    if args.shard:
+        locations = shard_locations(locations, *args.shard)
+        # All N shards load pages from the same site at once, so each gets
+        # 1/N of the request rate --min-interval allows
+        count = args.shard[1]
+        min_interval = args.min_interval if args.min_interval is not None else \
+            backend_default(args.backend, 'min_interval')
+        if min_interval and count > 1:
+            args.min_interval = round(min_interval * count, 3)
+            args.max_interval = max(args.max_interval, args.min_interval)
+            print(f"Shard {args.shard[0]}/{count}: at most one request every {args.min_interval:g}s "
+                  f"({count} shards share the {min_interval:g}s spacing)", flush=True)
+        # Shards running side by side each keep their own pacing and metrics
+        if args.rate_state:
+            args.rate_state = shard_file(args.rate_state, args.shard)
+        if args.metrics:
+            args.metrics = shard_file(args.metrics, args.shard)
+
+    options = backend_options(args)
+    if args.cache:
+        options['cache'] = PageCache(args.cache, ttl_hours=args.cache_ttl, max_mb=args.cache_size)
+
+    backend = create_backend(args.backend, **options)
     try:
-        driver = create_driver()
-        all_events = {}
-        successful_scrapes = 0
-        
-        for i, location in enumerate(SEARCH_LOCATIONS):
-            print(f"\n[{i+1}/{len(SEARCH_LOCATIONS)}] ", end='', flush=True)
-            
-            events = scrape_location(driver, location)
-            
-            if events:
-                successful_scrapes += 1
-                for event in events:
-                    event_id = event['id']
-                    if event_id not in all_events:
-                        all_events[event_id] = event
-                    else:
-                        all_events[event_id]['last_seen'] = event['last_seen']
-            
-            # Rate limiting with randomization
-            if i < len(SEARCH_LOCATIONS) - 1:
-                wait = random.uniform(3, 7)
-                time.sleep(wait)
-        
-        # Convert to list and sort
-        events_list = list(all_events.values())
-        events_list.sort(key=lambda x: x.get('date', ''))
-        
-        # Save results
-        output = {
-            'last_updated': datetime.now().isoformat(),
-            'total_events': len(events_list),
-            'locations_scraped': len(SEARCH_LOCATIONS),
-            'successful_scrapes': successful_scrapes,
-            'events': events_list
-        }
-        
-        with open('events.json', 'w') as f:
-            json.dump(output, f, indent=2)
-        
-        print("\n" + "=" * 60)
-        print("✓ SCRAPING COMPLETE")
-        print("=" * 60)
-        print(f"Locations scraped: {successful_scrapes}/{len(SEARCH_LOCATIONS)}")
-        print(f"Unique events found: {len(events_list)}")
-        print(f"Data saved to: events.json")
-        print("=" * 60, flush=True)
-        
-    except Exception as e:
-        print(f"\n✗ FATAL ERROR: {e}", flush=True)
-        raise
-        
+        return run_scrape(backend, locations, output=args.output, state_path=args.state, full=args.full,
+                          resume=args.resume, history=args.history, feed=args.feed, shard=args.shard,
+                          partial_dir=args.partial_dir)
     finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+        backend.close()
+        if args.cache:
+            options['cache'].close()
+        if args.metrics:
+            metrics.METRICS.write(args.metrics)
+            print(f"Metrics saved to: {args.metrics}", flush=True)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,319 @@
+"""
+Pokemon Events Scraper - Selenium Backend
+Loads event locator searches in Chrome, headless or in a visible window,
+with one browser or a pool of them
+"""
+
+import functools
+import os
+import time
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException
+
+import metrics
+from backends import Backend
+from browser_profile import DEFAULT_PROFILE, configure_options, apply_profile
+from card_templates import DEFAULT_TEMPLATES_FILE, TemplateStore
+from dom_extract import collect_event_cards, collect_with_template, events_from_cards
+from driver_manager import DriverManager, resolve_driver_path
+from event_model import build_event
+from network_capture import enable_network_logging, clear_network_log, wait_for_event_payload, extract_payload_events
+from page_ready import EVENT_SELECTORS, READY_CHALLENGE, READY_TIMEOUT, is_challenge_page, wait_for_page
+from worker_pool import AdaptiveRateBudget, DEFAULT_RATE_STATE_FILE, EVENT_LOCATOR_ORIGIN, run_pool
+
+EVENT_LOCATOR_URL = "https://events.pokemon.com/EventLocator/Home"
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/121.0.0.0 Safari/537.36')
+
+
+def create_driver(headless=True, capture=False, profile=DEFAULT_PROFILE, block=None):
+    """Create and configure Chrome with automation masked
+
+    A visible window is less suspicious than headless when running from a
+    home connection; headless also needs a realistic user agent.
+    """
+    chrome_options = Options()
+
+    if headless:
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument(f'--user-agent={USER_AGENT}')
+        chrome_options.add_argument('--disable-web-security')
+        chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+
+    # Bot detection evasion
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument('--window-size=1920,1080')
+
+    # Network capture reads the event data straight from the performance log
+    if capture:
+        enable_network_logging(chrome_options)
+
+    # Skip images, fonts and trackers the scraper never looks at
+    configure_options(chrome_options, profile)
+
+    if not headless:
+        print("Starting Chrome browser...")
+        print("(You'll see the browser window - this is normal!)")
+
+    try:
+        with metrics.span('driver_start'):
+            try:
+                driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
+            except SessionNotCreatedException:
+                # Cached driver no longer matches the installed Chrome
+                metrics.count('driver_refreshes')
+                driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=chrome_options)
+
+        if headless:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": USER_AGENT})
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        apply_profile(driver, profile, block)
+
+        print("✓ ChromeDriver ready")
+        return driver
+
+    except Exception as e:
+        print(f"✗ Error creating driver: {e}")
+        if not headless:
+            print("\nMake sure you have:")
+            print("1. Chrome browser installed")
+            print("2. Run: pip install selenium webdriver-manager")
+            print("3. ChromeDriver will auto-install\n")
+        raise
+
+
+def search_url(location, base_url=EVENT_LOCATOR_URL):
+    """Event locator search URL for a location, starting today"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    return f"{base_url}?iskm=false&longitude={location['lon']}&latitude={location['lat']}&locale=en-US&range=100&startdate={today}"
+
+
+def cached_events(cache, location, capture=False, base_url=EVENT_LOCATOR_URL):
+    """Events for location from today's cached payload or cards, or None if it must be loaded"""
+    url = search_url(location, base_url)
+    city, lat, lon = location['city'], location['lat'], location['lon']
+    if capture:
+        items = cache.get(url, 'payload')
+        if items is not None:
+            with metrics.span('parse', city):
+                return [build_event(fields, city, lat, lon) for fields in extract_payload_events(items)]
+    found = cache.get(url, 'cards')
+    if found is None:
+        return None
+    with metrics.span('parse', city):
+        return events_from_cards(found['cards'], city, lat, lon, found.get('fields'))
+
+
+def scrape_location(driver, location, retry=0, capture=False, page_timeout=15, base_url=EVENT_LOCATOR_URL, budget=None,
+                    cache=None, templates=None):
+    """Scrape events for a specific location with retries
+
+    budget, if given, is told about normal and challenge pages and paces
+    the retries after a challenge. cache, if given, keeps the page and
+    what was read from it; challenge pages are never cached. templates,
+    a TemplateStore, supplies and learns the card selector and fields.
+    """
+    lat = location['lat']
+    lon = location['lon']
+    city = location['city']
+
+    url = search_url(location, base_url)
+
+    print(f"Scraping {city} ({lat}, {lon})...", flush=True)
+
+    try:
+        if capture:
+            clear_network_log(driver)
+
+        with metrics.span('page_load', city):
+            driver.get(url)
+
+        if capture:
+            # Take the event list straight from the XHR/JSON response
+            with metrics.span('payload_wait', city):
+                items = wait_for_event_payload(driver)
+            if items is not None:
+                if cache:
+                    cache.put(url, 'payload', items)
+                with metrics.span('parse', city):
+                    events = [build_event(fields, city, lat, lon) for fields in extract_payload_events(items)]
+                metrics.count('payload_captures')
+                if budget:
+                    budget.success(EVENT_LOCATOR_ORIGIN)
+                print(f"  ✓ Captured {len(events)} events from network response")
+                return events
+            metrics.count('payload_misses')
+            print(f"  ⚠ No event response captured for {city}, falling back to page parsing")
+
+        # Wait for the event list, a "no events" message or a challenge
+        with metrics.span('ready_wait', city):
+            learned = templates.ready_selectors() if templates else []
+            ready = wait_for_page(driver, page_timeout, selectors=learned or EVENT_SELECTORS)
+            if ready == READY_TIMEOUT and learned:
+                # The learned cards never showed up, e.g. after a redesign:
+                # one look for anything the fixed selectors recognize
+                metrics.count('template_wait_misses')
+                ready = wait_for_page(driver, 0, selectors=EVENT_SELECTORS)
+        metrics.count('page_ready', state=ready)
+        if ready == READY_TIMEOUT:
+            print(f"  ⚠ Page for {city} did not settle within {page_timeout}s")
+
+        # Check for bot detection page
+        with metrics.span('page_source', city):
+            raw_source = driver.page_source
+        page_source = raw_source.lower()
+        if ready == READY_CHALLENGE or is_challenge_page(raw_source):
+            metrics.count('blocked_pages')
+            print(f"  ⚠ Bot protection detected for {city}")
+            delay = budget.challenge(EVENT_LOCATOR_ORIGIN) if budget else 10
+            if retry < 2:
+                metrics.count('retries')
+                print(f"  Retrying in {delay:.0f} seconds... (attempt {retry + 1}/2)")
+                with metrics.span('retry_backoff', city):
+                    if budget:
+                        budget.acquire(EVENT_LOCATOR_ORIGIN)
+                    else:
+                        time.sleep(delay)
+                return scrape_location(driver, location, retry + 1, capture, page_timeout, base_url, budget, cache,
+                                       templates)
+            return []
+        if budget:
+            budget.success(EVENT_LOCATOR_ORIGIN)
+
+        # Keep the page for debugging: in the cache, one copy per URL and day,
+        # or else in a file that the next run overwrites
+        if cache:
+            cache.put(url, 'page', raw_source)
+        elif os.getenv('DEBUG'):
+            with open(f'debug_{city}.html', 'w', encoding='utf-8') as f:
+                f.write(raw_source)
+
+        # One round trip gathers every event card on the page
+        with metrics.span('extract', city):
+            if templates:
+                selector, cards, fields = collect_with_template(driver, raw_source, templates)
+            else:
+                selector, cards = collect_event_cards(driver)
+                fields = None
+
+        # An empty list is only worth caching when the page says so
+        if cache and (cards or 'no events' in page_source or 'no results' in page_source):
+            cache.put(url, 'cards', {'selector': selector, 'cards': cards, 'fields': fields})
+
+        if not cards:
+            # Check if page says "no events"
+            if 'no events' in page_source or 'no results' in page_source:
+                metrics.count('empty_pages')
+                print(f"  → No events scheduled in {city}")
+            else:
+                metrics.count('selector_misses')
+                print(f"  ⚠ Could not find events in {city} (selectors may need update)")
+            return []
+
+        metrics.count('selector_hits', selector=selector)
+        print(f"  ✓ Found {len(cards)} potential events using {selector}")
+
+        with metrics.span('parse', city):
+            events = events_from_cards(cards, city, lat, lon, fields)
+
+        metrics.count('events_extracted', len(events))
+        print(f"  ✓ Extracted {len(events)} events from {city}")
+        return events
+
+    except WebDriverException as e:
+        metrics.count('webdriver_errors')
+        print(f"  ✗ WebDriver error in {city}: {str(e)[:100]}")
+        return []
+    except Exception as e:
+        metrics.count('scrape_errors')
+        print(f"  ✗ Error scraping {city}: {str(e)[:100]}")
+        return []
+
+
+class SeleniumBackend(Backend):
+    """Chrome-driven backend
+
+    With ``workers`` above 1 several browsers share the location queue.
+    Page loads across all of them are paced by one adaptive rate budget,
+    whose learned spacing is saved to ``rate_state`` on close. Locations
+    found in ``cache`` (a PageCache) are read from it, and no browser is
+    started if every location is cached. Extraction templates are read
+    from and learned into ``templates`` ('' for the fixed selectors only).
+    """
+
+    def __init__(self, headless=True, workers=1, capture=False, profile=DEFAULT_PROFILE, block=None,
+                 page_timeout=15, recycle_after=25, min_interval=2.0, max_interval=60.0, jitter=1.0,
+                 rate_state=DEFAULT_RATE_STATE_FILE, base_url=EVENT_LOCATOR_URL, cache=None,
+                 templates=DEFAULT_TEMPLATES_FILE):
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.templates = TemplateStore(templates) if templates else None
+        self.cached = functools.partial(cached_events, capture=capture, base_url=base_url)
+        self.recycle_after = recycle_after
+        # Speeds up while pages load normally and backs off on challenge pages
+        self.budget = AdaptiveRateBudget(min_interval=min_interval, jitter=jitter, max_interval=max_interval,
+                                         path=rate_state)
+        self.scrape = functools.partial(scrape_location, capture=capture, page_timeout=page_timeout,
+                                        base_url=base_url, budget=self.budget, cache=cache,
+                                        templates=self.templates)
+        self.driver_factory = functools.partial(create_driver, headless=headless, capture=capture,
+                                                profile=profile, block=block)
+        self.manager = None
+
+    def from_cache(self, locations, handle):
+        """Handle every location cached today; returns the ones left to load"""
+        remaining = []
+        for location in locations:
+            events = self.cached(self.cache, location)
+            if events is None:
+                remaining.append(location)
+                continue
+            print(f"{location['city']}: {len(events)} events from the page cache", flush=True)
+            handle(location, events)
+        return remaining
+
+    def run(self, locations, handle):
+        if self.cache:
+            locations = self.from_cache(locations, handle)
+            if not locations:
+                return
+        if self.workers > 1:
+            run_pool(locations, self.scrape, self.driver_factory, handle, workers=self.workers,
+                     budget=self.budget, max_pages=self.recycle_after)
+            return
+
+        self.manager = DriverManager(self.driver_factory, self.recycle_after)
+        self.manager.start()
+        for i, location in enumerate(locations):
+            # Rate limiting with randomization
+            self.budget.acquire(EVENT_LOCATOR_ORIGIN)
+            print(f"\n[{i+1}/{len(locations)}] ", end='', flush=True)
+            try:
+                events = self.manager.scrape(self.scrape, location)
+            except Exception as e:
+                # The browser could not be restarted - report this and every
+                # remaining location as empty so the run still finishes
+                print(f"✗ Browser stopped: {str(e)[:100]}", flush=True)
+                for remaining in locations[i:]:
+                    handle(remaining, [])
+                if len(locations) > i + 1:
+                    print(f"⚠ {len(locations) - i - 1} locations were not scraped", flush=True)
+                return
+            handle(location, events)
+
+    def close(self):
+        if self.manager:
+            self.manager.quit()
+        self.budget.save()
+        if self.templates:
+            self.templates.save()
@@ -0,0 +1,110 @@
+"""
+Pokemon Events Scraper - Extraction Template Tests
+"""
+
+import selenium_backend
+from card_templates import TemplateStore, discover_template, learn_fields, node_lines, parse_html, select, \
+    site_version, validate_template
+from page_ready import EVENT_SELECTORS, READY_EVENTS, READY_TIMEOUT
+
+
+def page(count=3, card='event-tile', asset='app.3f2a1b.js'):
+    cards = ''.join(f'''
+      <li class="{card}{' is-featured' if i == 0 else ''}">
+        <h3>League Cup {i}</h3>
+        <div><span>Sat, Nov {7 + i}, 2026</span> <span>1:00 PM</span></div>
+        <div>Game Store {i}</div>
+        <div>{100 + i} Main St, Austin, TX 78701</div>
+        <p>Bring your   deck.</p>
+      </li>''' for i in range(count))
+    return f'''<html><head><script src="/dist/{asset}"></script></head><body>
+<nav><ul><li class="nav-item">Home</li><li class="nav-item">Events</li></ul></nav>
+<div class="events-wrapper"><h2>Events near Austin</h2><ul class="event-list">{cards}</ul></div>
+</body></html>'''
+
+
+def browser_cards(source, selector):
+    """Cards as collect_event_cards returns them from a browser"""
+    return [{'text': '\n'.join(node_lines(node)), 'attrs': {}, 'links': []}
+            for node in select(parse_html(source), selector)]
+
+
+def test_discovers_repeated_dated_cards():
+    template = discover_template(page())
+    assert template['selector'] == 'li.event-tile'
+    assert template['fields'] == {'title': 0, 'date': 1, 'location': 2, 'address': 3, 'description': 4}
+
+
+def test_site_version_follows_assets():
+    assert site_version(page()) == site_version(page(count=5))
+    assert site_version(page()) != site_version(page(asset='app.77aa.js'))
+    assert site_version('<html><body></body></html>') == 'unversioned'
+
+
+def test_template_validation():
+    template = discover_template(page())
+    assert validate_template(template, browser_cards(page(), template['selector']))
+    assert not validate_template(template, browser_cards(page(card='evt-card'), template['selector']))
+    assert learn_fields([['Events near Austin'], ['Home']]) is None
+
+
+def test_store_round_trip_and_ready_selector(tmp_path):
+    path = str(tmp_path / 'templates.json')
+    store = TemplateStore(path)
+    assert store.ready_selectors() == []
+    store.put('v1', dict(discover_template(page()), learned_at='2026-10-01T00:00:00'))
+    store.put('v2', dict(discover_template(page(card='evt-card')), learned_at='2026-10-02T00:00:00'))
+    store.save()
+    loaded = TemplateStore(path)
+    assert loaded.get('v1')['selector'] == 'li.event-tile'
+    # Only the newest learned selector, none of the broad fixed ones
+    assert loaded.ready_selectors() == ['li.evt-card']
+
+
+class FakeDriver:
+    def __init__(self, source):
+        self.page_source = source
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script, *args):
+        for selector in args[0]:
+            cards = browser_cards(self.page_source, selector)
+            if cards:
+                return {'selector': selector, 'cards': cards}
+        return {'selector': None, 'cards': []}
+
+
+def scrape(monkeypatch, source, store, ready):
+    waits = []
+
+    def wait_for_page(driver, timeout=15, poll=0.25, selectors=EVENT_SELECTORS):
+        waits.append(list(selectors))
+        return ready.pop(0)
+
+    monkeypatch.setattr(selenium_backend, 'wait_for_page', wait_for_page)
+    location = {'city': 'Austin', 'lat': 30.27, 'lon': -97.74}
+    return selenium_backend.scrape_location(FakeDriver(source), location, templates=store), waits
+
+
+def test_learned_selector_is_the_only_one_waited_for(monkeypatch, tmp_path):
+    store = TemplateStore(str(tmp_path / 'templates.json'))
+    events, waits = scrape(monkeypatch, page(), store, [READY_EVENTS])
+    assert waits == [EVENT_SELECTORS]
+    assert [event['title'] for event in events] == ['League Cup 0', 'League Cup 1', 'League Cup 2']
+    assert events[0]['address'] == '100 Main St, Austin, TX 78701'
+
+    events, waits = scrape(monkeypatch, page(), store, [READY_EVENTS])
+    assert waits == [['li.event-tile']]
+    assert len(events) == 3
+
+
+def test_redesign_falls_back_and_relearns(monkeypatch, tmp_path):
+    store = TemplateStore(str(tmp_path / 'templates.json'))
+    scrape(monkeypatch, page(), store, [READY_EVENTS])
+    redesign = page(card='evt-card', asset='app.77aa.js')
+    events, waits = scrape(monkeypatch, redesign, store, [READY_TIMEOUT, READY_EVENTS])
+    assert waits == [['li.event-tile'], EVENT_SELECTORS]
+    assert len(events) == 3
+    assert store.ready_selectors() == ['li.evt-card']
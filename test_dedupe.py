@@ -0,0 +1,79 @@
+"""
+Pokemon Events Scraper - Deduplication Tests
+"""
+
+from dedupe import dedupe_events, locality
+
+
+def event(id, title='Prerelease Tournament', location='GameStop', address='100 Main St, Austin, TX 78701',
+          start='2026-11-07T13:00', city='Austin', lat=30.27, lon=-97.74):
+    return {'id': id, 'title': title, 'location': location, 'address': address, 'start': start,
+            'date': 'Sat, Nov 7, 2026 1:00 PM', 'search_city': city, 'search_lat': lat, 'search_lon': lon,
+            'last_seen': '2026-11-01T00:00:00'}
+
+
+def test_locality():
+    assert locality('100 Main St, Austin, TX 78701') == '78701'
+    assert locality('100 Main St, Austin, TX 78701-1234, USA') == '78701'
+    assert locality('12 Main St, Springfield, IL') == 'springfield il'
+    assert locality('12 Main St') is None
+    assert locality(None) is None
+
+
+def test_same_event_from_overlapping_searches_is_merged():
+    events = dedupe_events([
+        event('a' * 32, city='Austin'),
+        event('b' * 32, title='Prerelease Tournament!', location='GameStop #1234', city='San Antonio',
+              lat=29.42, lon=-98.49),
+    ])
+    assert len(events) == 1
+    assert [source['city'] for source in events[0]['sources']] == ['Austin', 'San Antonio']
+
+
+def test_same_chain_in_other_cities_is_kept_apart():
+    events = dedupe_events([
+        event('a' * 32, address='400 Pine St, Seattle, WA 98101', city='Seattle', lat=47.61, lon=-122.33),
+        event('b' * 32, address='100 Congress Ave, Austin, TX 78701', city='Austin'),
+    ])
+    assert len(events) == 2
+
+
+def test_same_street_address_in_other_states_is_kept_apart():
+    events = dedupe_events([
+        event('a' * 32, location='Card Shop', address='12 Main St, Springfield, IL', city='Springfield',
+              lat=39.78, lon=-89.65),
+        event('b' * 32, location='Game Den', address='12 Main St, Rexburg, ID', city='Idaho Falls',
+              lat=43.49, lon=-112.03),
+    ])
+    assert len(events) == 2
+
+
+def test_address_without_town_falls_back_to_search_area():
+    same_search = dedupe_events([
+        event('a' * 32, location='Card Shop', address='12 Main St'),
+        event('b' * 32, location='Card Shop LLC', address='12 Main St.'),
+    ])
+    assert len(same_search) == 1
+    far_apart = dedupe_events([
+        event('a' * 32, location='Card Shop', address='12 Main St', lat=47.61, lon=-122.33),
+        event('b' * 32, location='Card Shop', address='12 Main St'),
+    ])
+    assert len(far_apart) == 2
+
+
+def test_numbered_and_format_titles_are_kept_apart():
+    assert len(dedupe_events([event('a' * 32, title='League Challenge 1'),
+                              event('b' * 32, title='League Challenge 11')])) == 2
+    assert len(dedupe_events([event('a' * 32, title='League Cup TCG'),
+                              event('b' * 32, title='League Cup VGC')])) == 2
+
+
+def test_different_start_times_are_kept_apart():
+    assert len(dedupe_events([event('a' * 32), event('b' * 32, start='2026-11-07T18:00')])) == 2
+
+
+def test_identical_ids_keep_latest_last_seen():
+    later = dict(event('a' * 32), last_seen='2026-11-02T00:00:00')
+    events = dedupe_events([event('a' * 32), later])
+    assert len(events) == 1
+    assert events[0]['last_seen'] == '2026-11-02T00:00:00'
@@ -0,0 +1,60 @@
+"""
+Pokemon Events Scraper - Event Model Tests
+"""
+
+from datetime import date, datetime
+
+from event_model import build_event, normalize_events, parse_event_date
+
+TODAY = date(2026, 10, 18)
+
+
+def test_iso_and_numeric_dates():
+    assert parse_event_date('2026-11-07T13:00:00-06:00') == (datetime(2026, 11, 7, 13, 0), None)
+    assert parse_event_date('2026-11-07') == (date(2026, 11, 7), None)
+    assert parse_event_date('11/7/2026') == (date(2026, 11, 7), None)
+    assert parse_event_date('11/7/26 - 11/8/26') == (date(2026, 11, 7), date(2026, 11, 8))
+
+
+def test_month_names_ranges_and_times():
+    assert parse_event_date('Sat, Nov 7, 2026 1:00 PM') == (datetime(2026, 11, 7, 13, 0), None)
+    assert parse_event_date('Nov 7-8, 2026') == (date(2026, 11, 7), date(2026, 11, 8))
+    assert parse_event_date('Nov 7 - Nov 8', TODAY) == (date(2026, 11, 7), date(2026, 11, 8))
+    assert parse_event_date('November 7th, 2026 10am - 6:30pm') == (datetime(2026, 11, 7, 10, 0),
+                                                                   datetime(2026, 11, 7, 18, 30))
+    assert parse_event_date('Dec 30 - Jan 2, 2027') == (date(2026, 12, 30), date(2027, 1, 2))
+
+
+def test_missing_year_is_next_occurrence():
+    assert parse_event_date('Sat, Nov 7', TODAY) == (date(2026, 11, 7), None)
+    assert parse_event_date('Mar 3', TODAY) == (date(2027, 3, 3), None)
+
+
+def test_missing_year_looks_back_two_months():
+    assert parse_event_date('Sep 1', TODAY) == (date(2026, 9, 1), None)
+    assert parse_event_date('Aug 1', TODAY) == (date(2027, 8, 1), None)
+    # Read early in January, a late December date is last week, not next December
+    assert parse_event_date('Dec 30', date(2027, 1, 5)) == (date(2026, 12, 30), None)
+    assert parse_event_date('Dec 30 - Jan 2', date(2027, 1, 5)) == (date(2026, 12, 30), date(2027, 1, 2))
+
+
+def test_missing_year_on_leap_day():
+    assert parse_event_date('Feb 29', date(2027, 6, 1)) == (date(2028, 2, 29), None)
+    assert parse_event_date('Feb 29', date(2028, 1, 10)) == (date(2028, 2, 29), None)
+
+
+def test_unparseable_dates():
+    assert parse_event_date('') == (None, None)
+    assert parse_event_date('TBA') == (None, None)
+    assert parse_event_date('Feb 30', TODAY) == (None, None)
+    assert parse_event_date('2026-02-30') == (None, None)
+
+
+def test_normalize_events_sorts_and_parses():
+    events = normalize_events([
+        build_event({'title': 'Later', 'date': 'Sat, Nov 14, 2026 1:00 PM'}, 'Austin', 30.27, -97.74),
+        build_event({'title': 'Sooner', 'date': 'Sat, Nov 7, 2026'}, 'Austin', 30.27, -97.74),
+    ])
+    assert [event['title'] for event in events] == ['Sooner', 'Later']
+    assert events[0]['start'] == '2026-11-07'
+    assert events[1]['start'] == '2026-11-14T13:00'
@@ -0,0 +1,74 @@
+"""
+Pokemon Events Scraper - Event Sink Tests
+"""
+
+import json
+
+from event_sink import EventSink, trim_torn_line, write_json_atomic
+
+
+COORDINATES = {'Austin': (30.27, -97.74), 'Dallas': (32.78, -96.80), 'Houston': (29.76, -95.37)}
+
+
+def location(city):
+    lat, lon = COORDINATES[city]
+    return {'city': city, 'lat': lat, 'lon': lon}
+
+
+def test_fresh_sink_drops_old_journal(tmp_path):
+    journal = str(tmp_path / 'events.journal.jsonl')
+    sink = EventSink(journal)
+    sink.write(location('Austin'), [{'id': 'a'}])
+    sink.close()
+    sink = EventSink(journal)
+    assert sink.completed() == set()
+    sink.close()
+
+
+def test_resume_keeps_completed_locations(tmp_path):
+    journal = str(tmp_path / 'events.journal.jsonl')
+    sink = EventSink(journal)
+    sink.write(location('Austin'), [{'id': 'a'}])
+    sink.close()
+    sink = EventSink(journal, resume=True)
+    sink.write(location('Dallas'), [{'id': 'b'}])
+    assert [event['id'] for event in sink.events()] == ['a', 'b']
+    sink.close()
+
+
+def test_resume_after_torn_write_keeps_later_records(tmp_path):
+    journal = str(tmp_path / 'events.journal.jsonl')
+    sink = EventSink(journal)
+    sink.write(location('Austin'), [{'id': 'a'}])
+    sink.close()
+    # A crash in the middle of writing the next record
+    with open(journal, 'a') as f:
+        f.write('{"key": "dallas", "events": [{"id"')
+
+    sink = EventSink(journal, resume=True)
+    sink.write(location('Houston'), [{'id': 'c'}])
+    assert len(sink.completed()) == 2
+    assert [event['id'] for event in sink.events()] == ['a', 'c']
+    sink.close()
+
+
+def test_trim_torn_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_bytes(b'{"a": 1}\n' + b'x' * 10000)
+    assert trim_torn_line(str(path), chunk=64) == 10000
+    assert path.read_bytes() == b'{"a": 1}\n'
+    assert trim_torn_line(str(path)) == 0
+    path.write_bytes(b'torn')
+    trim_torn_line(str(path))
+    assert path.read_bytes() == b''
+
+
+def test_publish_replaces_output_and_drops_journal(tmp_path):
+    journal = tmp_path / 'events.journal.jsonl'
+    output = tmp_path / 'events.json'
+    write_json_atomic(str(output), {'events': []})
+    sink = EventSink(str(journal))
+    sink.write(location('Austin'), [{'id': 'a'}])
+    sink.publish(str(output), {'events': sink.events()})
+    assert json.loads(output.read_text()) == {'events': [{'id': 'a'}]}
+    assert not journal.exists()
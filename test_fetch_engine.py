@@ -0,0 +1,49 @@
+"""
+Pokemon Events Scraper - Fetch Engine Tests
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fetch_engine import FetchEngine
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if not self.path.startswith('/api'):
+            self.send_error(404)
+            return
+        body = json.dumps({'events': [{'path': self.path}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_discovers_working_endpoint_and_runs_again(server):
+    engine = FetchEngine([server + '/missing?lat={lat}', server + '/api?lat={lat}&lon={lon}'], min_interval=0)
+    locations = [{'lat': 1, 'lon': 2}, {'lat': 3, 'lon': 4}]
+    first = engine.run(locations)
+    assert engine.working_endpoint == server + '/api?lat={lat}&lon={lon}'
+    assert [data['events'][0]['path'] for _, data in first] == ['/api?lat=1&lon=2', '/api?lat=3&lon=4']
+    # The session stays open for a second batch until the owner closes it
+    second = engine.run(locations[:1])
+    assert second[0][1] == first[0][1]
+    engine.close()
@@ -0,0 +1,70 @@
+"""
+Pokemon Events Scraper - Geocoding Tests
+"""
+
+from datetime import datetime, timedelta
+
+from geocode import GeocodeCache, GeocodeError, Geocoder, StubBackend, normalize_query
+
+
+class FlakyBackend(StubBackend):
+    """Stub that fails every lookup from the ``fail_at``-th call on"""
+
+    def __init__(self, table=None, fail_at=None):
+        super().__init__(table)
+        self.fail_at = fail_at
+
+    def lookup(self, query):
+        if self.fail_at is not None and self.calls + 1 >= self.fail_at:
+            self.calls += 1
+            raise GeocodeError("HTTP 429")
+        return super().lookup(query)
+
+
+def test_normalize_query():
+    assert normalize_query('  Austin, TX, USA ') == 'austin tx'
+    assert normalize_query('Austin TX') == 'austin tx'
+
+
+def test_hits_and_misses_are_cached(tmp_path):
+    cache = GeocodeCache(str(tmp_path / 'geocode.sqlite'))
+    backend = StubBackend({'Austin, TX': (30.27, -97.74)})
+    geocoder = Geocoder(backend, cache)
+    assert geocoder.resolve_many(['Austin, TX', 'Nowhere']) == {'austin tx': (30.27, -97.74), 'nowhere': None}
+    assert Geocoder(backend, cache).resolve_many(['austin tx', 'nowhere']) == {'austin tx': (30.27, -97.74),
+                                                                                'nowhere': None}
+    assert backend.calls == 2
+    cache.close()
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    cache = GeocodeCache(str(tmp_path / 'geocode.sqlite'))
+    table = {'a': (1.0, 1.0), 'b': (2.0, 2.0), 'c': (3.0, 3.0)}
+    geocoder = Geocoder(FlakyBackend(table, fail_at=2), cache)
+    assert geocoder.resolve_many(['a', 'b', 'c']) == {'a': (1.0, 1.0)}
+    assert geocoder.failures == 1
+    assert cache.get_many(['a', 'b', 'c']) == {'a': (1.0, 1.0)}
+
+    # The next run looks up what failed instead of treating it as not found
+    retry = StubBackend(table)
+    assert Geocoder(retry, cache).resolve_many(['a', 'b', 'c']) == table
+    assert retry.calls == 2
+    cache.close()
+
+
+def test_misses_expire(tmp_path):
+    cache = GeocodeCache(str(tmp_path / 'geocode.sqlite'), miss_days=30)
+    cache.put_many({'new venue': None, 'old venue': None, 'known': (1.0, 1.0)}, 'stub')
+    old = (datetime.now() - timedelta(days=31)).isoformat()
+    cache.db.execute("UPDATE geocode SET resolved_at = ? WHERE query IN ('old venue', 'known')", (old,))
+    assert cache.get_many(['new venue', 'old venue', 'known']) == {'new venue': None, 'known': (1.0, 1.0)}
+    cache.close()
+
+
+def test_limit_spreads_lookups_over_runs(tmp_path):
+    cache = GeocodeCache(str(tmp_path / 'geocode.sqlite'))
+    backend = StubBackend({'a': (1.0, 1.0), 'b': (2.0, 2.0)})
+    assert len(Geocoder(backend, cache, limit=1).resolve_many(['a', 'b'])) == 1
+    assert len(Geocoder(backend, cache, limit=1).resolve_many(['a', 'b'])) == 2
+    assert backend.calls == 2
+    cache.close()
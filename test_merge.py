@@ -0,0 +1,107 @@
+"""
+Pokemon Events Scraper - Shard Merge Tests
+"""
+
+import json
+
+import pytest
+
+from locations import SEARCH_LOCATIONS, parse_shard, shard_locations
+from merge import load_partials, merge, merge_partials
+from pipeline import PARTIAL_VERSION
+
+
+def event(id, title, last_seen='2026-11-01T00:00:00', city='Austin'):
+    return {'id': id, 'title': title, 'date': 'Sat, Nov 7, 2026 1:00 PM', 'location': 'Game Store',
+            'address': '100 Main St, Austin, TX 78701', 'search_city': city, 'search_lat': 30.27,
+            'search_lon': -97.74, 'last_seen': last_seen}
+
+
+def partial(index, count, events, last_updated='2026-11-01T00:00:00'):
+    return {'version': PARTIAL_VERSION, 'shard': [index, count], 'state': {f"{index}.0000,0.0000": {}},
+            'last_updated': last_updated, 'locations_scraped': 2, 'locations_reused': 0, 'successful_scrapes': 2,
+            'total_events': len(events), 'events': events}
+
+
+def write_partials(tmp_path, partials):
+    paths = []
+    for data in partials:
+        path = tmp_path / f"shard-{data['shard'][0]}-of-{data['shard'][1]}.json"
+        path.write_text(json.dumps(data))
+        paths.append(str(path))
+    return paths
+
+
+def test_parse_shard():
+    assert parse_shard('2/4') == (2, 4)
+    for spec in ('0/4', '5/4', 'two/4', '2'):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_shards_split_locations_evenly():
+    shards = [shard_locations(SEARCH_LOCATIONS, index, 4) for index in range(1, 5)]
+    sizes = [len(shard) for shard in shards]
+    assert max(sizes) - min(sizes) <= 1
+    keys = [(loc['lat'], loc['lon']) for shard in shards for loc in shard]
+    assert sorted(keys) == sorted((loc['lat'], loc['lon']) for loc in SEARCH_LOCATIONS)
+    assert shard_locations(list(reversed(SEARCH_LOCATIONS)), 1, 4) == shards[0]
+
+
+def test_load_partials_orders_by_shard(tmp_path):
+    paths = write_partials(tmp_path, [partial(2, 2, []), partial(1, 2, [])])
+    assert [data['shard'][0] for data in load_partials(paths)] == [1, 2]
+
+
+@pytest.mark.parametrize('shards, count, message', [
+    ([(1, 3), (2, 3)], None, 'missing shards 3'),
+    ([(1, 2), (1, 2), (2, 2)], None, 'need one partial'),
+    ([(1, 2), (2, 3)], None, 'different splits'),
+    ([(1, 2), (2, 2)], 3, 'missing shards 3'),
+])
+def test_load_partials_rejects_incomplete_splits(tmp_path, shards, count, message):
+    paths = []
+    for n, (index, total) in enumerate(shards):
+        path = tmp_path / f"{n}.json"
+        path.write_text(json.dumps(partial(index, total, [])))
+        paths.append(str(path))
+    with pytest.raises(ValueError, match=message):
+        load_partials(paths, count)
+
+
+def test_load_partials_rejects_other_files(tmp_path):
+    path = tmp_path / 'events.json'
+    path.write_text(json.dumps({'events': []}))
+    with pytest.raises(ValueError, match='not a version'):
+        load_partials([str(path)])
+    with pytest.raises(ValueError, match='no partial results'):
+        load_partials([])
+
+
+def test_merge_partials_joins_overlap_and_ignores_order():
+    shared = 'c' * 32
+    first = partial(1, 2, [event('a' * 32, 'League Cup'), event(shared, 'Prerelease', '2026-11-01T00:00:00')])
+    second = partial(2, 2, [event(shared, 'Prerelease', '2026-11-02T00:00:00', city='San Antonio'),
+                            event('b' * 32, 'League Challenge')], last_updated='2026-11-02T00:00:00')
+    result = merge_partials([first, second])
+    assert result['total_events'] == 3
+    assert result['shards'] == 2
+    assert result['last_updated'] == '2026-11-02T00:00:00'
+    assert result['locations_scraped'] == 4
+    merged = next(e for e in result['events'] if e['id'] == shared)
+    assert merged['last_seen'] == '2026-11-02T00:00:00'
+
+    # Shards finishing their pages in another order give the same dataset
+    second['events'].reverse()
+    assert merge_partials([first, second]) == result
+
+
+def test_merge_publishes_and_updates_state(tmp_path):
+    paths = write_partials(tmp_path, [partial(1, 2, [event('a' * 32, 'League Cup')]),
+                                      partial(2, 2, [event('b' * 32, 'League Challenge')])])
+    output, state = tmp_path / 'events.json', tmp_path / 'scrape_state.json'
+    result = merge(paths, output=str(output), state_path=str(state), history='',
+                   feed=str(tmp_path / 'changes.json'))
+    assert result['total_events'] == 2
+    assert json.loads(output.read_text())['total_events'] == 2
+    assert set(json.loads(state.read_text())['locations']) == {'1.0000,0.0000', '2.0000,0.0000'}
@@ -0,0 +1,62 @@
+"""
+Pokemon Events Scraper - Page Cache Tests
+"""
+
+from datetime import datetime, timedelta
+
+from page_cache import PageCache
+
+
+def test_pages_and_json_round_trip(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put('https://example.test/a', 'page', '<html>a</html>')
+    cache.put('https://example.test/a', 'cards', {'selector': 'li', 'cards': [{'text': 'x'}]})
+    assert cache.get('https://example.test/a') == '<html>a</html>'
+    assert cache.get('https://example.test/a', 'cards') == {'selector': 'li', 'cards': [{'text': 'x'}]}
+    assert cache.get('https://example.test/b') is None
+    cache.close()
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put('https://example.test/a', 'page', '<html>same</html>')
+    cache.put('https://example.test/b', 'page', '<html>same</html>')
+    assert cache.stats()['blobs'] == 1
+    assert cache.stats()['entries'] == {'page': 2}
+    cache.close()
+
+
+def age(cache, url, **delta):
+    when = datetime.now() - timedelta(**delta)
+    cache.db.execute("UPDATE entries SET fetched_at = ?, day = ? WHERE url = ?",
+                     (when.isoformat(), when.date().isoformat(), url))
+    cache.db.commit()
+
+
+def test_expired_and_earlier_day_entries_are_not_used(tmp_path):
+    cache = PageCache(str(tmp_path), ttl_hours=12)
+    cache.put('https://example.test/old', 'page', 'old')
+    cache.put('https://example.test/yesterday', 'page', 'yesterday')
+    cache.put('https://example.test/fresh', 'page', 'fresh')
+    age(cache, 'https://example.test/old', hours=13)
+    age(cache, 'https://example.test/yesterday', days=1)
+    assert cache.get('https://example.test/old') is None
+    assert cache.get('https://example.test/yesterday') is None
+    assert cache.prune() == 2
+    assert cache.get('https://example.test/fresh') == 'fresh'
+    assert cache.stats()['blobs'] == 1
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = PageCache(str(tmp_path), max_mb=0.02)
+    for name in 'abc':
+        # Random-looking text, about 6 KB gzipped; three fit, four do not
+        cache.put(f'https://example.test/{name}', 'page', ''.join(f"{name}{i * 7919 % 10007:x}" for i in range(2500)))
+        cache.get('https://example.test/a')
+    cache.put('https://example.test/d', 'page', ''.join(f"d{i * 7907 % 10007:x}" for i in range(2500)))
+    assert cache.size() <= cache.max_bytes
+    assert cache.get('https://example.test/a') is not None
+    assert cache.get('https://example.test/d') is not None
+    assert cache.get('https://example.test/b') is None
+    cache.close()
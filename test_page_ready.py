@@ -0,0 +1,23 @@
+"""
+Pokemon Events Scraper - Page Readiness Tests
+"""
+
+from page_ready import CHALLENGE_TITLES, is_challenge_page
+
+
+def test_challenge_pages_are_recognized():
+    assert is_challenge_page('<html><head><title>Access Denied</title></head><body></body></html>')
+    assert is_challenge_page('<iframe id="main-iframe" src="/_Incapsula_Resource?SWUDNSAI=31"></iframe>')
+    assert is_challenge_page('<div class="g-recaptcha" data-sitekey="x"></div>')
+
+
+def test_event_text_is_not_a_challenge():
+    page = ('<html><head><title>Event Locator</title><script src="/_Incapsula_Resource?x=1"></script></head>'
+            '<body><div class="event-card">League Cup<br>Access denied to players without a Play! ID.'
+            '<br>Security deposit required</div></body></html>')
+    assert not is_challenge_page(page)
+
+
+def test_probe_titles_match_source_signatures():
+    for title in CHALLENGE_TITLES:
+        assert is_challenge_page(f'<title>{title.title()}</title>')
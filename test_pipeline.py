@@ -0,0 +1,77 @@
+"""
+Pokemon Events Scraper - Pipeline Tests
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from backends import Backend
+from pipeline import run_scrape
+from scrape_state import ScrapeState, location_key
+
+AUSTIN = {'city': 'Austin', 'lat': 30.27, 'lon': -97.74}
+ROUND_ROCK = {'city': 'Round Rock', 'lat': 30.51, 'lon': -97.68}
+DALLAS = {'city': 'Dallas', 'lat': 32.78, 'lon': -96.80}
+
+
+def fields(title, location='GameStop', description='', address='100 Main St, Austin, TX 78701'):
+    return {'title': title, 'date': 'Sat, Nov 7, 2026 1:00 PM', 'location': location, 'address': address,
+            'description': description}
+
+
+class FakeBackend(Backend):
+    """Answers each city with fixed event fields; cities missing from results fail"""
+
+    name = 'fake'
+
+    def __init__(self, results):
+        self.results = results
+        self.scraped = []
+
+    def run(self, locations, handle):
+        from event_model import build_event
+        for location in locations:
+            self.scraped.append(location['city'])
+            found = self.results.get(location['city'], [])
+            handle(location, [build_event(f, location['city'], location['lat'], location['lon']) for f in found])
+
+
+def scrape(tmp_path, backend, locations):
+    return run_scrape(backend, locations, output=str(tmp_path / 'events.json'),
+                      state_path=str(tmp_path / 'scrape_state.json'), history='',
+                      feed=str(tmp_path / 'changes.json'))
+
+
+def make_due(tmp_path, location):
+    state = ScrapeState(str(tmp_path / 'scrape_state.json'))
+    state.locations[location_key(location)]['last_scraped'] = (datetime.now() - timedelta(days=30)).isoformat()
+    state.save()
+
+
+def test_fresh_location_keeps_event_merged_under_another_id(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Two neighbouring searches return the same prerelease, written differently;
+    # Round Rock's copy is richer, so its id survives the merge
+    first = FakeBackend({
+        'Austin': [fields('Prerelease Tournament')],
+        'Round Rock': [fields('Prerelease Tournament!', location='GameStop #1234', description='Bring a deck')],
+        'Dallas': [fields('League Cup', location='Card Shop', address='9 Elm St, Dallas, TX 75201')],
+    })
+    result = scrape(tmp_path, first, [AUSTIN, ROUND_ROCK, DALLAS])
+    assert result['total_events'] == 2
+
+    # Next run: Austin is still fresh, Round Rock is due but its page fails
+    make_due(tmp_path, ROUND_ROCK)
+    make_due(tmp_path, DALLAS)
+    second = FakeBackend({'Dallas': [fields('League Cup', location='Card Shop', address='9 Elm St, Dallas, TX 75201')]})
+    result = scrape(tmp_path, second, [AUSTIN, ROUND_ROCK, DALLAS])
+    assert sorted(second.scraped) == ['Dallas', 'Round Rock']
+    assert sorted(event['title'] for event in result['events']) == ['League Cup', 'Prerelease Tournament!']
+    published = json.loads((tmp_path / 'events.json').read_text())
+    assert published['total_events'] == 2
+
+
+def test_nothing_scraped_keeps_previous_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert scrape(tmp_path, FakeBackend({}), [AUSTIN]) is None
+    assert not (tmp_path / 'events.json').exists()
@@ -0,0 +1,29 @@
+"""
+Pokemon Events Scraper - Replay Tests
+"""
+
+from types import SimpleNamespace
+
+from card_templates import DEFAULT_TEMPLATES_FILE
+from replay import load_fixtures, save_fixture, stand_in_options
+
+SERVER = SimpleNamespace(base_url='http://127.0.0.1:8765/EventLocator/Home',
+                         api_endpoint='http://127.0.0.1:8765/api?lat={lat}&lon={lon}')
+
+
+def test_fixtures_round_trip(tmp_path):
+    location = {'city': 'Austin', 'lat': 30.27, 'lon': -97.74}
+    save_fixture(str(tmp_path), location, 'https://example.test', '<html>page</html>', None, '.event-card',
+                 [{'text': 'League Cup\nSat, Nov 7, 2026', 'attrs': {}, 'links': []}])
+    [fixture] = load_fixtures(str(tmp_path))
+    assert fixture['location'] == location
+    assert fixture['page'] == '<html>page</html>'
+    assert fixture['cards'][0]['text'].startswith('League Cup')
+
+
+def test_benchmarks_keep_learned_state_out_of_the_real_files(tmp_path):
+    options = stand_in_options('selenium-headless', SERVER, scratch=str(tmp_path))
+    assert options['rate_state'] is None
+    assert options['templates'].startswith(str(tmp_path))
+    assert stand_in_options('selenium-headless', SERVER)['templates'] == ''
+    assert options['templates'] != DEFAULT_TEMPLATES_FILE
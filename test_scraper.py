@@ -4,14 +4,12 @@ Test script for Pokemon Events Scraper
 Tests a single location to verify the scraper is working
 """
 
-import json
-import time
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from page_cache import PageCache
+from page_ready import READY_TIMEOUT, wait_for_page
 
 def create_driver():
     """Create and configure Chrome driver"""
@@ -52,7 +50,11 @@ def test_scrape():
         print("\nLoading page...")
         
         driver.get(url)
-        time.sleep(5)
+        ready = wait_for_page(driver)
+        if ready == READY_TIMEOUT:
+            print("⚠ Page did not show events or a no-events message within 15s")
+        else:
+            print(f"Page ready: {ready}")
         
         # Save screenshot for debugging
         try:
@@ -61,10 +63,14 @@ def test_scrape():
         except:
             pass
         
-        # Save page source for inspection
+        # Save page source for inspection; the cache also keeps each day's copy
+        page_source = driver.page_source
         with open('test_page_source.html', 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
-        print("Page source saved as test_page_source.html")
+            f.write(page_source)
+        cache = PageCache()
+        cache.put(url, 'page', page_source)
+        cache.close()
+        print("Page source saved as test_page_source.html (and in the page cache)")
         
         # Try to find events
         print("\nSearching for events...")
@@ -0,0 +1,74 @@
+"""
+Pokemon Events Scraper - Worker Pool Tests
+"""
+
+import pytest
+
+from selenium_backend import SeleniumBackend
+from worker_pool import RateBudget, run_pool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("session died")
+        return 1
+
+    def quit(self):
+        pass
+
+
+def driver_factory(browsers):
+    """Factory that can start ``browsers`` browsers and then fails"""
+    started = []
+
+    def factory():
+        if len(started) >= browsers:
+            raise RuntimeError("chrome failed to start")
+        started.append(FakeDriver())
+        return started[-1]
+    return factory
+
+
+def scrape(driver, location):
+    if location['city'].startswith('crash'):
+        driver.alive = False
+        return []
+    return [{'id': location['city']}]
+
+
+def locations(*cities):
+    return [{'city': city, 'lat': 30.0 + i, 'lon': -97.0} for i, city in enumerate(cities)]
+
+
+def test_pool_scrapes_every_location():
+    handled = {}
+    run_pool(locations('a', 'b', 'c'), scrape, driver_factory(2),
+             lambda loc, events: handled.update({loc['city']: events}), workers=2, budget=RateBudget(0, 0))
+    assert handled == {'a': [{'id': 'a'}], 'b': [{'id': 'b'}], 'c': [{'id': 'c'}]}
+
+
+def test_pool_hands_back_queued_locations_when_every_worker_stops():
+    handled = []
+    run_pool(locations('crash1', 'crash2', 'a', 'b', 'c'), scrape, driver_factory(2),
+             lambda loc, events: handled.append((loc['city'], events)), workers=2, budget=RateBudget(0, 0))
+    assert sorted(handled) == [('a', []), ('b', []), ('c', []), ('crash1', []), ('crash2', [])]
+
+
+def test_pool_without_any_browser_raises():
+    with pytest.raises(RuntimeError):
+        run_pool(locations('a'), scrape, driver_factory(0), lambda loc, events: None, workers=2,
+                 budget=RateBudget(0, 0))
+
+
+def test_single_browser_stops_cleanly_when_restart_fails():
+    backend = SeleniumBackend(workers=1, min_interval=0, jitter=0, rate_state='', templates='')
+    backend.driver_factory = driver_factory(1)
+    backend.scrape = scrape
+    handled = []
+    backend.run(locations('a', 'crash', 'b', 'c'), lambda loc, events: handled.append((loc['city'], events)))
+    backend.close()
+    assert handled == [('a', [{'id': 'a'}]), ('crash', []), ('b', []), ('c', [])]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pokemon Events Scraper - Validation
+Checks a published events.json, and optionally its tiles, for problems
+before they are committed
+"""
+
+import argparse
+import json
+import os
+import re
+from datetime import date, datetime
+
+from publish import DEFAULT_OUTPUT_DIR, EVENT_FIELDS, FORMAT_VERSION
+
+REQUIRED_FIELDS = ('id', 'title', 'date', 'last_seen')
+
+_EVENT_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _parse_iso(value):
+    """date or datetime from an ISO string, or None if it isn't one"""
+    try:
+        return (datetime if 'T' in value else date).fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _in_range(lat, lon):
+    return isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def validate_events(dataset):
+    """Problems found in an events.json dataset, as readable strings"""
+    events = dataset.get('events')
+    if not isinstance(events, list):
+        return ["'events' is missing or not a list"]
+
+    problems = []
+    if dataset.get('total_events') != len(events):
+        problems.append(f"total_events is {dataset.get('total_events')} but there are {len(events)} events")
+
+    seen = set()
+    for i, event in enumerate(events):
+        where = f"event {i} ({event.get('id', '?')})" if isinstance(event, dict) else f"event {i}"
+        if not isinstance(event, dict):
+            problems.append(f"{where}: not an object")
+            continue
+        for field in REQUIRED_FIELDS:
+            if not isinstance(event.get(field), str) or not event[field].strip():
+                problems.append(f"{where}: missing {field}")
+        event_id = event.get('id')
+        if isinstance(event_id, str):
+            if not _EVENT_ID.match(event_id):
+                problems.append(f"{where}: id is not an md5 hex digest")
+            if event_id in seen:
+                problems.append(f"{where}: duplicate id")
+            seen.add(event_id)
+
+        start = _parse_iso(event['start']) if event.get('start') else None
+        if event.get('start') and start is None:
+            problems.append(f"{where}: start {event['start']!r} is not ISO 8601")
+        end = _parse_iso(event['end']) if event.get('end') else None
+        if event.get('end') and end is None:
+            problems.append(f"{where}: end {event['end']!r} is not ISO 8601")
+        # ISO strings sort chronologically; an end date alone only compares to the start's date
+        if start and end and event['end'] < event['start'][:len(event['end'])]:
+            problems.append(f"{where}: ends before it starts")
+
+        if 'venue_lat' in event or 'venue_lon' in event:
+            if not _in_range(event.get('venue_lat'), event.get('venue_lon')):
+                problems.append(f"{where}: venue coordinates out of range")
+        if event.get('search_lat') is not None and not _in_range(event.get('search_lat'), event.get('search_lon')):
+            problems.append(f"{where}: search coordinates out of range")
+    return problems
+
+
+def validate_tiles(output_dir=DEFAULT_OUTPUT_DIR):
+    """Problems found in a published manifest and its tiles"""
+    path = os.path.join(output_dir, 'manifest.json')
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"{path}: {e}"]
+
+    problems = []
+    if manifest.get('version') != FORMAT_VERSION:
+        problems.append(f"{path}: version {manifest.get('version')}, expected {FORMAT_VERSION}")
+    if manifest.get('fields') != EVENT_FIELDS:
+        problems.append(f"{path}: fields don't match this version's tile layout")
+
+    total = 0
+    for geohash, info in manifest.get('tiles', {}).items():
+        tile_path = os.path.join(output_dir, 'tiles', f"{geohash}.json")
+        try:
+            with open(tile_path) as f:
+                tile = json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"{tile_path}: {e}")
+            continue
+        rows = tile.get('events', [])
+        total += len(rows)
+        if len(rows) != info.get('count'):
+            problems.append(f"{tile_path}: {len(rows)} events, manifest says {info.get('count')}")
+        if any(len(row) != len(EVENT_FIELDS) for row in rows):
+            problems.append(f"{tile_path}: rows don't have {len(EVENT_FIELDS)} fields")
+    if total != manifest.get('total_events'):
+        problems.append(f"{path}: total_events is {manifest.get('total_events')} but tiles hold {total}")
+    return problems
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Check events.json and published tiles for problems")
+    parser.add_argument('input', nargs='?', default='events.json', help="dataset to check (default: events.json)")
+    parser.add_argument('--tiles', metavar='DIR', nargs='?', const=DEFAULT_OUTPUT_DIR,
+                        help=f"also check the manifest and tiles in DIR (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--max-problems', type=int, default=20, help="problems to list (default: 20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Validate; exit status 1 if anything is wrong"""
+    args = parse_args(argv)
+    try:
+        with open(args.input) as f:
+            dataset = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"✗ {args.input}: {e}")
+
+    problems = validate_events(dataset)
+    if args.tiles:
+        problems += validate_tiles(args.tiles)
+
+    if not problems:
+        checked = f"{args.input} and {args.tiles}/" if args.tiles else args.input
+        print(f"✓ {checked}: {len(dataset['events'])} events, no problems")
+        return
+    print(f"✗ {len(problems)} problems:")
+    for problem in problems[:args.max_problems]:
+        print(f"  {problem}")
+    if len(problems) > args.max_problems:
+        print(f"  ... and {len(problems) - args.max_problems} more")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
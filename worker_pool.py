@@ -0,0 +1,198 @@
+"""
+Pokemon Events Scraper - Worker Pool
+Runs several browser instances against a shared queue of locations
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+import metrics
+from driver_manager import DriverManager
+from event_sink import write_json_atomic
+
+EVENT_LOCATOR_ORIGIN = "events.pokemon.com"
+DEFAULT_RATE_STATE_FILE = 'rate_state.json'
+
+
+class RateBudget:
+    """Per-origin request spacing shared by every worker
+
+    Each origin hands out one request slot every ``min_interval`` seconds
+    (plus up to ``jitter`` seconds of randomization), no matter how many
+    workers are asking for it.
+    """
+
+    def __init__(self, min_interval=2.0, jitter=1.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def interval(self, origin):
+        """Current spacing between requests to origin"""
+        return self.min_interval
+
+    def acquire(self, origin):
+        """Block until the next request slot for origin is free"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(origin, now))
+            self._next_slot[origin] = slot + self.interval(origin) + random.uniform(0, self.jitter)
+        delay = slot - now
+        if delay > 0:
+            with metrics.span('rate_limit'):
+                time.sleep(delay)
+
+    def success(self, origin):
+        """Report a page that loaded normally"""
+
+    def challenge(self, origin):
+        """Report a bot challenge; returns the backoff before the next request"""
+        return 0.0
+
+
+class AdaptiveRateBudget(RateBudget):
+    """RateBudget whose spacing adapts to how the site responds (AIMD)
+
+    Every normal page adds ``increase`` requests/second to an origin's rate,
+    down to ``min_interval`` between requests. A challenge page halves the
+    rate, up to ``max_interval``, and holds the origin back for an
+    exponential backoff with jitter that grows with consecutive challenges.
+    Intervals are saved to ``path`` so the next run starts where this one
+    left off.
+    """
+
+    def __init__(self, min_interval=2.0, jitter=1.0, max_interval=60.0, start_interval=None,
+                 increase=0.02, backoff=10.0, max_backoff=300.0, path=DEFAULT_RATE_STATE_FILE):
+        super().__init__(min_interval, jitter)
+        self.max_interval = max_interval
+        self.start_interval = start_interval or min_interval * 2
+        self.increase = increase
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.path = path
+        self.origins = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.origins = json.load(f).get('origins', {})
+
+    def _record(self, origin):
+        return self.origins.setdefault(origin, {'interval': self.start_interval, 'challenges': 0})
+
+    def interval(self, origin):
+        interval = self._record(origin)['interval']
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def success(self, origin):
+        with self._lock:
+            record = self._record(origin)
+            interval = self.interval(origin)
+            # An unpaced budget (min_interval 0) has nothing to speed up
+            if interval > 0:
+                record['interval'] = max(self.min_interval, 1 / (1 / interval + self.increase))
+            record['challenges'] = 0
+
+    def challenge(self, origin):
+        with self._lock:
+            record = self._record(origin)
+            record['interval'] = min(self.max_interval, self.interval(origin) * 2)
+            record['challenges'] += 1
+            ceiling = min(self.max_backoff, self.backoff * 2 ** (record['challenges'] - 1))
+            delay = random.uniform(ceiling / 2, ceiling)
+            # Nobody gets a slot for this origin until the backoff is over
+            now = time.monotonic()
+            self._next_slot[origin] = max(self._next_slot.get(origin, now), now + delay)
+        metrics.count('rate_backoffs')
+        return delay
+
+    def save(self):
+        """Write the learned intervals atomically"""
+        if not self.path:
+            return
+        with self._lock:
+            origins = {
+                origin: dict(record, interval=round(record['interval'], 3), updated_at=datetime.now().isoformat())
+                for origin, record in self.origins.items()
+            }
+        write_json_atomic(self.path, {'origins': origins}, indent=2, sort_keys=True)
+
+
+def run_pool(locations, scrape, driver_factory, handle, workers=2, budget=None,
+             origin=EVENT_LOCATOR_ORIGIN, max_pages=25):
+    """Scrape locations with several drivers pulling from one queue
+
+    ``scrape(driver, location)`` returns a list of events and
+    ``handle(location, events)`` is called with each result under a lock,
+    so it can merge into a shared dedupe map without extra locking. Each
+    worker's browser is restarted if it crashes and recycled after
+    ``max_pages`` pages. Every location reaches ``handle`` exactly once,
+    with [] if no worker was left to scrape it.
+    """
+    budget = budget or RateBudget()
+    total = len(locations)
+    tasks = queue.Queue()
+    for i, location in enumerate(locations):
+        tasks.put((i, location))
+
+    lock = threading.Lock()
+    started = []
+
+    def worker(n):
+        manager = DriverManager(driver_factory, max_pages)
+        try:
+            manager.start()
+        except Exception as e:
+            print(f"✗ Worker {n} could not start a browser: {str(e)[:100]}", flush=True)
+            return
+
+        with lock:
+            started.append(n)
+
+        try:
+            while True:
+                try:
+                    i, location = tasks.get_nowait()
+                except queue.Empty:
+                    return
+
+                budget.acquire(origin)
+                print(f"\n[{i+1}/{total}] (worker {n}) ", end='', flush=True)
+                try:
+                    events = manager.scrape(scrape, location)
+                except Exception as e:
+                    # The browser could not be restarted - leave the rest to other workers
+                    print(f"✗ Worker {n} stopped: {str(e)[:100]}", flush=True)
+                    with lock:
+                        handle(location, [])
+                    return
+
+                with lock:
+                    handle(location, events)
+        finally:
+            manager.quit()
+
+    threads = [
+        threading.Thread(target=worker, args=(n + 1,), name=f"scraper-worker-{n + 1}", daemon=True)
+        for n in range(min(workers, total))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if total and not started:
+        raise RuntimeError("No worker could start a browser")
+
+    # Every worker stopped early: what is still queued was never scraped
+    left = []
+    while not tasks.empty():
+        left.append(tasks.get_nowait()[1])
+    if left:
+        print(f"⚠ All workers stopped - {len(left)} locations were not scraped", flush=True)
+        for location in left:
+            handle(location, [])